@@ -2,6 +2,8 @@
 Scans the 'configs/' directory to automatically generate:
 - supported_models.json: A JSON list of all model configurations.
 - supported_models.yaml: A YAML list of all model configurations.
+- supported_models.snapshot: A compiled copy of supported_models.yaml that
+  ModelConfigManager loads at startup instead of parsing the YAML.
 - MODELS.md: Human-readable documentation for all supported models.
 
 This script should be run every time a model configuration is added,
@@ -13,6 +15,9 @@ import yaml
 from pathlib import Path
 from collections import defaultdict
 
+from src.llminventory.config_snapshot import read_snapshot, snapshot_path
+from src.llminventory.model_config_manager import ModelConfigManager, SNAPSHOT_VERSION
+
 def generate_model_lists():
     """
     Scans model configs and generates JSON, YAML, and Markdown documentation.
@@ -49,6 +54,15 @@ def generate_model_lists():
         yaml.dump(all_models, f, sort_keys=False, default_flow_style=False)
     print(f"Successfully generated {yaml_output_path}")
 
+    # --- Generate supported_models.snapshot ---
+    # Parsing the new YAML refreshes the snapshot; an unchanged one would have been reused
+    ModelConfigManager(configs_dir)
+    snapshot_output_path = snapshot_path(yaml_output_path)
+    if read_snapshot(yaml_output_path, SNAPSHOT_VERSION) is not None:
+        print(f"Successfully generated {snapshot_output_path}")
+    else:
+        print(f"Warning: Could not write {snapshot_output_path}; processes will parse the YAML at startup")
+
     # --- Generate MODELS.md ---
     md_output_path = project_root / "MODELS.md"
     generate_markdown_docs(all_models, md_output_path)
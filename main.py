@@ -7,15 +7,23 @@ To run this application:
 3. Run the server: uvicorn main:app --reload
 """
 
+import json
+import math
+import time
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from pathlib import Path
 
 # Import the main inventory class
-from src.llminventory import LLMInventory
+from src.llminventory import LLMInventory, RateLimitExceeded, CircuitOpenError, RouteConstraints, RequestScheduler, AdmissionRejected
+from src.llminventory.config_watcher import ConfigWatcher, TARGETS
+from src.llminventory.model_registry import mutable_config
 
 # --- Application Setup ---
 
@@ -24,10 +32,24 @@ PROJECT_ROOT = Path(__file__).parent
 CONFIGS_DIR = PROJECT_ROOT / "configs"
 SECRETS_FILE = PROJECT_ROOT / "secrets.yaml"
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Watches config and secrets files while serving, and closes the pooled provider connections of this worker on shutdown."""
+    if watcher:
+        watcher.start()
+    yield
+    if watcher:
+        watcher.stop()
+    # Imported here: the adapters load requests and httpx, which startup does not need
+    from src.llminventory.adapters import BaseAdapter
+    await BaseAdapter.aclose_sessions()
+    BaseAdapter.close_sessions()
+
 app = FastAPI(
     title="LLMInventory API",
     description="A unified API to interact with various Large Language Models.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware to allow the web UI to call the API
@@ -51,14 +73,49 @@ except Exception as e:
     print(f"An unexpected error occurred during initialization: {e}")
     inventory = None
 
+# Reloads supported_models.yaml, configs/ and secrets.yaml in place when they change
+watcher = ConfigWatcher(inventory) if inventory else None
+
+# Requests beyond max_concurrency wait by priority and tenant; full queues are rejected with Retry-After
+scheduler = RequestScheduler(max_concurrency=64, max_queue=256, max_queue_per_tenant=64)
+
+def _tenant(http_request: Request) -> str:
+    """Returns the tenant a request is accounted to: its X-Tenant header, else the client address."""
+    tenant = http_request.headers.get("X-Tenant")
+    if tenant:
+        return tenant
+    return http_request.client.host if http_request.client else "default"
+
+def _deadline(deadline_ms: Optional[float]) -> Optional[float]:
+    return deadline_ms / 1000 if deadline_ms is not None else None
+
 
 # --- Pydantic Models for Request/Response ---
 
 class ChatRequest(BaseModel):
-    provider: str = Field(..., description="The name of the provider, e.g., 'openai' or 'anthropic'.")
-    model: str = Field(..., description="The specific model name, e.g., 'gpt-4-turbo'.")
+    provider: Optional[str] = Field(None, description="The name of the provider, e.g., 'openai' or 'anthropic'. Omit it to use a model alias from routing.yaml or 'auto'.")
+    model: str = Field(..., description="The specific model name, e.g., 'gpt-4-turbo', a model alias with fallbacks, e.g., 'fast-chat', or 'auto' to let the router pick a model.")
     payload: Dict[str, Any] = Field(..., description="The main request payload, containing required fields like 'messages'.")
     parameters: Optional[Dict[str, Any]] = Field(None, description="Optional model parameters to override defaults, e.g., {'temperature': 0.7}.")
+    stream: bool = Field(False, description="If true, the response is streamed as server-sent events of normalized delta chunks.")
+    hedge: bool = Field(False, description="If true, a second request is sent when the first is slower than the model's usual latency.")
+    constraints: Optional[Dict[str, Any]] = Field(None, description="Requirements for model 'auto', e.g., {'capabilities': ['vision'], 'max_cost': 0.01, 'prefer': 'latency'}.")
+    coalesce: Optional[bool] = Field(None, description="Whether identical requests in flight at the same time share one provider call. Defaults to true for cacheable or deterministic (temperature 0 or seeded) requests.")
+    priority: str = Field("standard", description="'interactive', 'standard' or 'batch'; decides the order of queued requests when the server is busy.")
+    deadline_ms: Optional[float] = Field(None, description="The maximum time to wait in the queue; requests that cannot start in time are rejected with 503.")
+
+class EmbeddingsRequest(BaseModel):
+    provider: str = Field(..., description="The name of the provider, e.g., 'google' or 'openai'.")
+    model: str = Field(..., description="An embedding model, e.g., 'text-embedding-004'.")
+    input: List[str] = Field(..., description="The texts to embed.")
+    parameters: Optional[Dict[str, Any]] = Field(None, description="Optional model parameters, e.g., {'dimensions': 768}.")
+    priority: str = Field("standard", description="'interactive', 'standard' or 'batch'; decides the order of queued requests when the server is busy.")
+    deadline_ms: Optional[float] = Field(None, description="The maximum time to wait in the queue; requests that cannot start in time are rejected with 503.")
+
+class EmbeddingsResponse(BaseModel):
+    provider: str
+    model: str
+    embeddings: List[List[float]]
 
 class ModelInfo(BaseModel):
     provider: str
@@ -73,29 +130,107 @@ class ModelsResponse(BaseModel):
 # --- API Endpoints ---
 
 @app.get("/v1/models", response_model=ModelsResponse, tags=["Models"])
-async def get_supported_models():
-    """Returns a list of all supported models and their configurations."""
+async def get_supported_models(
+    capability: Optional[List[str]] = Query(None, description="Capabilities the models must all have, e.g. 'vision'."),
+    provider: Optional[List[str]] = Query(None, description="Providers to list models of."),
+    max_input_cost: Optional[float] = Query(None, description="Maximum USD per million input tokens."),
+    min_context: Optional[int] = Query(None, description="Minimum context window in tokens."),
+    sort_by: str = Query("name", description="'name', 'price' or 'context'.")
+):
+    """Returns the supported models and their configurations, optionally filtered."""
     if not inventory:
         raise HTTPException(status_code=503, detail="Inventory not available due to initialization error.")
-    
-    model_configs = inventory.get_supported_models()
-    model_details = [ModelInfo(**config) for config in model_configs]
+
+    try:
+        model_configs = inventory.model_config_manager.registry.find_models(
+            capabilities=capability, providers=provider, max_input_cost=max_input_cost, min_context=min_context, sort_by=sort_by
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    model_details = [ModelInfo(**mutable_config(config)) for config in model_configs]
     return {"models": model_details}
 
+@app.get("/v1/health", tags=["Health"])
+async def health():
+    """Returns the circuit breaker state of each model used so far, the retry counters per provider and the request queue."""
+    if not inventory:
+        raise HTTPException(status_code=503, detail="Inventory not available due to initialization error.")
+
+    report = inventory.health()
+    open_circuits = [name for name, circuit in report['circuits'].items() if circuit['state'] != 'closed']
+    return {
+        "status": "degraded" if open_circuits else "ok",
+        "open_circuits": open_circuits,
+        **report,
+        "scheduler": scheduler.stats(),
+        "reload": watcher.stats()
+    }
+
+@app.post("/v1/admin/reload", tags=["Admin"])
+async def reload_configs(target: Optional[str] = Query(None, description="'models' or 'secrets'; omit to reload both.")):
+    """Reloads model configs and/or secrets from disk without a restart and returns the reload metrics."""
+    if not inventory:
+        raise HTTPException(status_code=503, detail="Inventory not available due to initialization error.")
+    if target is not None and target not in TARGETS:
+        raise HTTPException(status_code=400, detail=f"Unknown reload target '{target}'; expected one of {list(TARGETS)}")
+
+    results = {}
+    for name in [target] if target else TARGETS:
+        try:
+            # Parsing runs in a worker thread so that the event loop keeps serving requests
+            results[name] = await run_in_threadpool(watcher.reload, name)
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Could not reload {name}; the current version stays in use. {e}")
+    return results
+
 @app.post("/v1/chat", tags=["Chat"])
-async def chat_with_model(request: ChatRequest):
+async def chat_with_model(request: ChatRequest, http_request: Request):
     """Sends a chat request to a specified model and returns the provider's response."""
     if not inventory:
         raise HTTPException(status_code=503, detail="Inventory not available due to initialization error.")
 
+    admitted_at = None
     try:
-        response = inventory.invoke(
+        await scheduler.aacquire(request.priority, _tenant(http_request), _deadline(request.deadline_ms))
+        admitted_at = time.perf_counter()
+        if request.stream:
+            chunks = inventory.ainvoke_stream(
+                provider=request.provider,
+                model=request.model,
+                payload=request.payload,
+                parameters=request.parameters,
+                constraints=RouteConstraints.from_dict(request.constraints) if request.constraints else None
+            )
+            # Wait for the first chunk so that provider errors still map to an HTTP status
+            first_chunk = await chunks.__anext__()
+            response = _SSEResponse(
+                _relay_sse(first_chunk, chunks),
+                chunks,
+                admitted_at,
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+            # The response holds the scheduler slot until it is done
+            admitted_at = None
+            return response
+
+        response = await inventory.ainvoke(
             provider=request.provider,
             model=request.model,
             payload=request.payload,
-            parameters=request.parameters
+            parameters=request.parameters,
+            hedge=request.hedge,
+            constraints=RouteConstraints.from_dict(request.constraints) if request.constraints else None,
+            coalesce=request.coalesce
         )
         return response
+    except StopAsyncIteration:
+        return StreamingResponse(_relay_sse(None, None), media_type="text/event-stream")
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except RateLimitExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
     except KeyError as e:
         # For missing model or missing API key
         raise HTTPException(status_code=404, detail=str(e))
@@ -107,6 +242,81 @@ async def chat_with_model(request: ChatRequest):
     except Exception as e:
         # Catch-all for other unexpected errors
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+    finally:
+        if admitted_at is not None:
+            scheduler.release(time.perf_counter() - admitted_at)
+
+@app.post("/v1/embeddings", response_model=EmbeddingsResponse, tags=["Embeddings"])
+async def create_embeddings(request: EmbeddingsRequest, http_request: Request):
+    """Embeds a list of texts, one vector per text in input order, using the provider's batch API."""
+    if not inventory:
+        raise HTTPException(status_code=503, detail="Inventory not available due to initialization error.")
+
+    try:
+        async with scheduler.aslot(request.priority, _tenant(http_request), _deadline(request.deadline_ms)):
+            vectors = await inventory.aembed(
+                provider=request.provider,
+                model=request.model,
+                texts=request.input,
+                parameters=request.parameters
+            )
+        return {"provider": request.provider, "model": request.model, "embeddings": vectors.tolist()}
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except RateLimitExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ConnectionError as e:
+        raise HTTPException(status_code=503, detail=f"Service Unavailable: Could not connect to provider API. {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+async def _relay_sse(
+    first_chunk: Optional[Dict[str, Any]],
+    chunks: Optional[AsyncIterator[Dict[str, Any]]]
+) -> AsyncIterator[str]:
+    """Relays delta chunks to the client as server-sent events, without buffering."""
+    try:
+        if first_chunk is not None:
+            yield f"data: {json.dumps(first_chunk)}\n\n"
+        if chunks is not None:
+            async for chunk in chunks:
+                yield f"data: {json.dumps(chunk)}\n\n"
+    except Exception as e:
+        # Headers are already sent, so errors mid-stream are reported in-band
+        yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+    yield "data: [DONE]\n\n"
+
+class _SSEResponse(StreamingResponse):
+    """
+    Streams server-sent events and, however the response ends, closes the
+    provider stream and frees the scheduler slot.
+
+    This runs when the client disconnects mid-stream or before the body
+    starts, where a BackgroundTask would be skipped and the generators would
+    only be closed when garbage-collected.
+    """
+
+    def __init__(self, relay: AsyncIterator[str], chunks: AsyncIterator[Dict[str, Any]], admitted_at: float, **kwargs: Any):
+        super().__init__(relay, media_type="text/event-stream", **kwargs)
+        self._relay = relay
+        self._chunks = chunks
+        self._admitted_at = admitted_at
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                await self._relay.aclose()
+                await self._chunks.aclose()
+            finally:
+                scheduler.release(time.perf_counter() - self._admitted_at)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Connection Pool Benchmark
+Measures per-request overhead of pooled adapter sessions against a fresh
+connection per request, using a local stub server that mimics a chat endpoint.
+
+Usage: python scripts/bench_connection_pool.py [--requests N]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from llminventory.adapters import OpenAIAdapter
+
+STUB_RESPONSE = json.dumps({
+    "choices": [{"message": {"role": "assistant", "content": "pong"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+}).encode('utf-8')
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a canned chat completion, keeping the connection alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(STUB_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(STUB_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server():
+    """Starts the stub server on a free local port and returns it."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def time_calls(call, count):
+    """Runs call() count times and returns the per-call latencies in milliseconds."""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def report(label, latencies):
+    """Prints a one-line latency summary."""
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:<28} p50={p50:7.3f} ms  p99={p99:7.3f} ms  mean={statistics.mean(latencies):7.3f} ms")
+    return p50
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500, help='Requests per scenario')
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    model_config = {'model': 'stub-model', 'endpoint': endpoint, 'capabilities': ['text']}
+    payload = {"messages": [{"role": "user", "content": "ping"}]}
+    body = {"model": "stub-model", **payload}
+
+    def unpooled():
+        requests.post(endpoint, json=body, timeout=10).json()
+
+    def pooled():
+        # A new adapter per call, as LLMInventory.invoke builds them, still reuses the pool.
+        OpenAIAdapter(api_key="stub").invoke(model_config, payload)
+
+    # Warm up both paths
+    time_calls(unpooled, 10)
+    time_calls(pooled, 10)
+
+    print(f"🏁 {args.requests} sequential requests against {endpoint}")
+    unpooled_p50 = report("fresh connection (requests.post)", time_calls(unpooled, args.requests))
+    pooled_p50 = report("pooled session (BaseAdapter)", time_calls(pooled, args.requests))
+    print(f"📉 p50 overhead reduction: {(1 - pooled_p50 / unpooled_p50) * 100:.1f}%")
+
+    OpenAIAdapter.close_sessions()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
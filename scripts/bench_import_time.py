@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Cold Start Benchmark
+Measures, in fresh interpreters, how long importing the llminventory package
+and constructing an LLMInventory take, and fails when either exceeds its
+budget or when importing the package loads a dependency that should only be
+imported on first use (requests, httpx, numpy, yaml).
+
+Usage: python scripts/bench_import_time.py [--runs N] [--import-budget-ms MS] [--startup-budget-ms MS]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Dependencies that importing the package must not load
+DEFERRED_MODULES = ('requests', 'httpx', 'numpy', 'yaml')
+
+# Runs in a fresh interpreter from the project root and prints its timings as JSON
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import src.llminventory
+imported = time.perf_counter()
+eager = [name for name in {DEFERRED_MODULES!r} if name in sys.modules]
+from pathlib import Path
+inventory = src.llminventory.LLMInventory(Path('configs'), Path(sys.argv[1]))
+constructed = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'startup_ms': (constructed - start) * 1000,
+    'eager': eager
+}}))
+"""
+
+def probe(project_root: Path, secrets_file: Path) -> dict:
+    """Runs the probe once and returns its timings."""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, str(secrets_file)],
+        cwd=project_root, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters to measure')
+    parser.add_argument('--import-budget-ms', type=float, default=50.0, help='Budget for importing the package (median)')
+    parser.add_argument('--startup-budget-ms', type=float, default=200.0, help='Budget for import plus LLMInventory() (median)')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    secrets_file = project_root / "secrets.yaml"
+    if not secrets_file.is_file():
+        secrets_file = project_root / "secrets.example.yaml"
+
+    # The first run compiles bytecode and snapshots, which later processes reuse
+    probe(project_root, secrets_file)
+    samples = [probe(project_root, secrets_file) for _ in range(args.runs)]
+    import_ms = statistics.median(sample['import_ms'] for sample in samples)
+    startup_ms = statistics.median(sample['startup_ms'] for sample in samples)
+    eager = sorted({name for sample in samples for name in sample['eager']})
+
+    print(f"🏁 Cold start over {args.runs} fresh interpreters (median)")
+    print(f"{'import src.llminventory':<28} {import_ms:8.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    print(f"{'import + LLMInventory()':<28} {startup_ms:8.1f} ms (budget {args.startup_budget_ms:.0f} ms)")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import took {import_ms:.1f} ms, over the {args.import_budget_ms:.0f} ms budget")
+    if startup_ms > args.startup_budget_ms:
+        failures.append(f"startup took {startup_ms:.1f} ms, over the {args.startup_budget_ms:.0f} ms budget")
+    if eager:
+        failures.append(f"importing the package loaded {', '.join(eager)}")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Parameter Validation Benchmark
+Measures merging and validating request parameters with the compiled
+ParameterValidator against the previous per-request walk of the model's
+parameter schema, for every model in supported_models.yaml.
+
+Usage: python scripts/bench_param_validation.py [--iterations N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from llminventory.model_config_manager import ModelConfigManager
+
+USER_PARAMS = {"temperature": 0.2, "max_tokens": 512, "top_p": 0.9, "maxOutputTokens": 512, "topP": 0.9}
+
+def schema_walk(model_config, user_params):
+    """The validation merge_and_validate_params did before validators were compiled."""
+    merged_params = {}
+    if 'parameters' in model_config and model_config['parameters'] is not None:
+        for param_name, param_info in model_config['parameters'].items():
+            if 'default' in param_info:
+                merged_params[param_name] = param_info['default']
+
+    if user_params:
+        for param_name, user_value in user_params.items():
+            if param_name in model_config.get('parameters', {}):
+                param_info = model_config['parameters'][param_name]
+                expected_type_str = param_info.get('type')
+                type_map = {
+                    "float": (float, int),
+                    "integer": int,
+                    "string": str,
+                    "boolean": bool
+                }
+                expected_type = type_map.get(expected_type_str)
+                if expected_type and not isinstance(user_value, expected_type):
+                    raise ValueError(f"Parameter '{param_name}' expected type '{expected_type_str}'")
+                if expected_type_str == "float" and isinstance(user_value, int):
+                    merged_params[param_name] = float(user_value)
+                elif expected_type_str == "integer" and isinstance(user_value, float) and user_value.is_integer():
+                    merged_params[param_name] = int(user_value)
+                else:
+                    merged_params[param_name] = user_value
+    return merged_params
+
+def per_call_us(call, iterations):
+    """Returns the best per-call time in microseconds over five runs."""
+    return min(timeit.repeat(call, number=iterations, repeat=5)) / iterations * 1e6
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000, help='Validations per model and run')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    manager = ModelConfigManager(project_root / "configs")
+    names = sorted(manager.get_all_model_names())
+    pairs = [name.split('/', 1) for name in names]
+    configs = [manager.get_model_config(provider, model) for provider, model in pairs]
+
+    def walk_all():
+        for config in configs:
+            schema_walk(config, USER_PARAMS)
+
+    def compiled_all():
+        for provider, model in pairs:
+            manager.merge_and_validate_params(provider, model, USER_PARAMS)
+
+    iterations = max(1, args.iterations // len(configs))
+    print(f"🏁 Validating {len(USER_PARAMS)} user parameters for each of {len(configs)} models")
+    walk_us = per_call_us(walk_all, iterations) / len(configs)
+    compiled_us = per_call_us(compiled_all, iterations) / len(configs)
+    print(f"{'schema walk (previous)':<28} {walk_us:7.3f} µs per request")
+    print(f"{'compiled ParameterValidator':<28} {compiled_us:7.3f} µs per request")
+    print(f"📉 speedup: {walk_us / compiled_us:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,46 @@
 # This file makes the src/llminventory directory a Python package.
-from .secret_manager import SecretManager
-from .model_config_manager import ModelConfigManager
-from .adapters import get_adapter
-from .inventory import LLMInventory
\ No newline at end of file
+# The public names are imported on first use (PEP 562), so that importing the
+# package does not load requests, httpx, numpy or yaml before they are needed.
+from typing import TYPE_CHECKING, Dict
+
+from .lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .secret_manager import SecretManager
+    from .model_config_manager import ModelConfigManager
+    from .adapters import get_adapter
+    from .inventory import LLMInventory
+    from .batch import InvocationResult
+    from .cache import InMemoryResponseCache, SQLiteResponseCache
+    from .semantic_cache import SemanticCache
+    from .embedding_cache import EmbeddingCache
+    from .rate_limiter import RateLimiter, RateLimitExceeded
+    from .circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+    from .router import RouteConstraints
+    from .scheduler import RequestScheduler, AdmissionRejected
+    from .model_registry import ModelRegistry
+
+# Module of each public name
+_EXPORTS: Dict[str, str] = {
+    'SecretManager': 'secret_manager',
+    'ModelConfigManager': 'model_config_manager',
+    'get_adapter': 'adapters',
+    'LLMInventory': 'inventory',
+    'InvocationResult': 'batch',
+    'InMemoryResponseCache': 'cache',
+    'SQLiteResponseCache': 'cache',
+    'SemanticCache': 'semantic_cache',
+    'EmbeddingCache': 'embedding_cache',
+    'RateLimiter': 'rate_limiter',
+    'RateLimitExceeded': 'rate_limiter',
+    'CircuitBreakerRegistry': 'circuit_breaker',
+    'CircuitOpenError': 'circuit_breaker',
+    'RouteConstraints': 'router',
+    'RequestScheduler': 'scheduler',
+    'AdmissionRejected': 'scheduler',
+    'ModelRegistry': 'model_registry',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
@@ -1,18 +1,44 @@
 """
 This package contains the provider-specific adapters for the LLMInventory.
 It exposes a factory function to retrieve the correct adapter class.
+
+Adapter modules import requests and httpx, so they are only imported when an
+adapter is first requested, either through get_adapter() or as an attribute
+of this package (PEP 562).
 """
 
-from .base_adapter import BaseAdapter
-from .anthropic_adapter import AnthropicAdapter
-from .google_adapter import GoogleAdapter
-from .openai_adapter import OpenAIAdapter
-from .xai_adapter import XaiAdapter
-from .mistral_adapter import MistralAdapter
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from ..lazy_imports import lazy_exports
+from .retry import ProviderHTTPError, RetryPolicy
+
+if TYPE_CHECKING:
+    from .base_adapter import BaseAdapter
+    from .anthropic_adapter import AnthropicAdapter
+    from .google_adapter import GoogleAdapter
+    from .openai_adapter import OpenAIAdapter
+    from .xai_adapter import XaiAdapter
+    from .mistral_adapter import MistralAdapter
+
+# Adapter class per provider, as (module, class name) within this package
+_ADAPTERS: Dict[str, Tuple[str, str]] = {
+    "openai": ("openai_adapter", "OpenAIAdapter"),
+    "anthropic": ("anthropic_adapter", "AnthropicAdapter"),
+    "google": ("google_adapter", "GoogleAdapter"),
+    "xai": ("xai_adapter", "XaiAdapter"),
+    "mistral": ("mistral_adapter", "MistralAdapter"),
+}
+
+# Module of each class importable from this package on first use
+_LAZY_CLASSES: Dict[str, str] = {"BaseAdapter": "base_adapter", **{name: module for module, name in _ADAPTERS.values()}}
+
+__all__ = ["get_adapter", "ProviderHTTPError", "RetryPolicy", *_LAZY_CLASSES]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_CLASSES, globals())
 
-def get_adapter(provider_name: str) -> type[BaseAdapter]:
+def get_adapter(provider_name: str) -> "type[BaseAdapter]":
     """
-    Returns the adapter class for a given provider.
+    Returns the adapter class for a given provider, importing its module on first use.
 
     Args:
         provider_name: The name of the provider (e.g., 'openai').
@@ -23,14 +49,7 @@ def get_adapter(provider_name: str) -> type[BaseAdapter]:
     Raises:
         ValueError: If no adapter is found for the provider.
     """
-    adapters = {
-        "openai": OpenAIAdapter,
-        "anthropic": AnthropicAdapter,
-        "google": GoogleAdapter,
-        "xai": XaiAdapter,
-        "mistral": MistralAdapter,
-    }
-    adapter_class = adapters.get(provider_name.lower())
-    if not adapter_class:
+    entry = _ADAPTERS.get(provider_name.lower())
+    if not entry:
         raise ValueError(f"No adapter found for provider: {provider_name}")
-    return adapter_class
\ No newline at end of file
+    return __getattr__(entry[1])
@@ -1,15 +1,21 @@
 """Adapter for interacting with Anthropic's API."""
 
-import requests
-from typing import Dict, Any, List
+import json
+from typing import Dict, Any, List, Tuple, Optional
 from .base_adapter import BaseAdapter
+from .retry import RETRYABLE_STATUSES, RetryPolicy
 
 class AnthropicAdapter(BaseAdapter):
     """Adapter for making requests to the Anthropic API."""
 
-    def invoke(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+    provider_name = "Anthropic"
+
+    # Anthropic answers 529 when its API is temporarily overloaded
+    retry_policy = RetryPolicy(retry_statuses=RETRYABLE_STATUSES | {529})
+
+    def _prepare_request(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Sends a request to the Anthropic API messages endpoint.
+        Builds a request to the Anthropic API messages endpoint.
 
         Args:
             model_config: The configuration for the Anthropic model.
@@ -17,10 +23,7 @@ class AnthropicAdapter(BaseAdapter):
             parameters: Optional parameters for the request (temperature, max_tokens, etc.).
 
         Returns:
-            The JSON response from the API.
-
-        Raises:
-            ConnectionError: If the request to the API fails.
+            The endpoint URL and the request keyword arguments.
         """
         endpoint = model_config['endpoint']
         headers = {
@@ -51,9 +54,26 @@ class AnthropicAdapter(BaseAdapter):
         if parameters:
             request_body.update(parameters)
 
-        try:
-            response = requests.post(endpoint, headers=headers, json=request_body, timeout=60)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"Failed to connect to Anthropic API at {endpoint}: {e}") from e
\ No newline at end of file
+        return endpoint, {"headers": headers, "json": request_body}
+
+    def _parse_stream_event(self, event: str, data: str) -> Optional[Dict[str, Any]]:
+        """
+        Converts one Anthropic streaming event into a normalized delta chunk.
+
+        Text arrives in 'content_block_delta' events and the stop reason in
+        'message_delta'; all other events carry no output.
+
+        Raises:
+            ConnectionError: If the stream reports an error event.
+        """
+        if event == 'content_block_delta':
+            delta = json.loads(data).get('delta', {})
+            if delta.get('type') == 'text_delta':
+                return {'delta': delta.get('text', ''), 'finish_reason': None}
+        elif event == 'message_delta':
+            stop_reason = json.loads(data).get('delta', {}).get('stop_reason')
+            if stop_reason:
+                return {'delta': '', 'finish_reason': stop_reason}
+        elif event == 'error':
+            raise ConnectionError(f"Anthropic API stream failed: {data}")
+        return None
@@ -1,16 +1,349 @@
 """Defines the abstract base class for all provider adapters."""
 
+import asyncio
+import dataclasses
+import json
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Iterator, AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from .retry import ProviderHTTPError, RetryCounters, RetryPolicy, rate_limit_state, retry_after_hint
+from .sse import iter_sse_events, aiter_sse_events, iter_sse_lines, aiter_sse_lines
 
 class BaseAdapter(ABC):
     """Abstract base class for all provider adapters."""
 
+    # Human-readable provider name used in error messages.
+    provider_name: str = "Provider"
+
+    # Default request timeout in seconds, overridable per model via 'timeout' in its config.
+    default_timeout: float = 60
+
+    # Connection pool settings shared by every adapter. Use configure_pool() to change them.
+    pool_connections: int = 10
+    pool_maxsize: int = 20
+    pool_block: bool = False
+    # Concurrent connections per host for async requests. pool_maxsize only bounds
+    # the idle keep-alive connections, so that many concurrent ainvoke calls do
+    # not queue behind the keep-alive pool and time out waiting for a connection.
+    async_max_connections: int = 1000
+
+    # Maximum number of texts in one embedding request; callers chunk larger inputs.
+    max_embedding_batch: int = 2048
+
+    # How transient failures are retried. Override per provider class, with
+    # configure_retry(), or per model with a 'retry' mapping in its config.
+    retry_policy: RetryPolicy = RetryPolicy()
+    _retry_counters = RetryCounters()
+
+    # Keep-alive sessions keyed by (scheme, host), shared across adapter instances
+    # so that connections survive between LLMInventory.invoke calls.
+    _sessions: Dict[Tuple[str, str], requests.Session] = {}
+    _sessions_lock = threading.Lock()
+
+    # Async clients are bound to the event loop that created them, so they are
+    # kept per loop and then per (scheme, host).
+    _async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    # Optional account scoping sent along with the API key, where the provider supports it
+    organization: Optional[str] = None
+    project: Optional[str] = None
+
     def __init__(self, api_key: str):
         """Initializes the adapter with the necessary API key."""
         self.api_key = api_key
+        # Request rate-limit state of this key, from the headers of its latest response
+        self.rate_limit_state: Dict[str, float] = {}
+
+    @classmethod
+    def configure_pool(
+        cls,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: Optional[bool] = None,
+        async_max_connections: Optional[int] = None
+    ) -> None:
+        """
+        Changes the connection pool limits used by all adapters.
+
+        Existing sessions are closed so that the new limits apply to the next request.
+
+        Args:
+            pool_connections: The number of per-host connection pools to cache.
+            pool_maxsize: The maximum number of connections kept alive per host.
+            pool_block: Whether to block when the pool is exhausted instead of
+                opening an extra, non-pooled connection.
+            async_max_connections: The maximum number of concurrent async
+                connections per host; async clients created afterwards use it.
+        """
+        if pool_connections is not None:
+            BaseAdapter.pool_connections = pool_connections
+        if pool_maxsize is not None:
+            BaseAdapter.pool_maxsize = pool_maxsize
+        if pool_block is not None:
+            BaseAdapter.pool_block = pool_block
+        if async_max_connections is not None:
+            BaseAdapter.async_max_connections = async_max_connections
+        cls.close_sessions()
+
+    @classmethod
+    def configure_retry(cls, **changes: Any) -> None:
+        """
+        Changes the retry policy of this adapter class.
+
+        Calling it on BaseAdapter changes the policy of every provider that does
+        not define its own.
+
+        Args:
+            **changes: RetryPolicy fields to replace, e.g. max_attempts=5.
+        """
+        cls.retry_policy = dataclasses.replace(cls.retry_policy, **changes)
+
+    @classmethod
+    def retry_stats(cls) -> Dict[str, Dict[str, Any]]:
+        """Returns retry counters per provider: retries, exhausted and retries by reason."""
+        return BaseAdapter._retry_counters.snapshot()
+
+    @classmethod
+    def close_sessions(cls) -> None:
+        """Closes all pooled sessions and their keep-alive connections."""
+        with BaseAdapter._sessions_lock:
+            sessions = list(BaseAdapter._sessions.values())
+            BaseAdapter._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    @classmethod
+    async def aclose_sessions(cls) -> None:
+        """Closes the async clients bound to the running event loop."""
+        clients = BaseAdapter._async_clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.aclose()
+
+    @staticmethod
+    def _host_key(url: str) -> Tuple[str, str]:
+        """Returns the (scheme, host) pair that identifies a connection pool."""
+        parts = urlsplit(url)
+        return (parts.scheme, parts.netloc)
+
+    @classmethod
+    def _get_session(cls, url: str) -> requests.Session:
+        """Returns the pooled keep-alive session for the host of the given URL."""
+        key = cls._host_key(url)
+        session = BaseAdapter._sessions.get(key)
+        if session is not None:
+            return session
+
+        with BaseAdapter._sessions_lock:
+            session = BaseAdapter._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                http_adapter = HTTPAdapter(
+                    pool_connections=BaseAdapter.pool_connections,
+                    pool_maxsize=BaseAdapter.pool_maxsize,
+                    pool_block=BaseAdapter.pool_block
+                )
+                session.mount("https://", http_adapter)
+                session.mount("http://", http_adapter)
+                BaseAdapter._sessions[key] = session
+            return session
+
+    @classmethod
+    def _get_async_client(cls, url: str) -> httpx.AsyncClient:
+        """Returns the pooled async client for the host of the given URL on the running loop."""
+        loop = asyncio.get_running_loop()
+        clients = BaseAdapter._async_clients.setdefault(loop, {})
+        key = cls._host_key(url)
+        client = clients.get(key)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=BaseAdapter.async_max_connections,
+                max_keepalive_connections=BaseAdapter.pool_maxsize
+            )
+            client = httpx.AsyncClient(limits=limits)
+            clients[key] = client
+        return client
+
+    def _get_timeout(self, model_config: Dict[str, Any]) -> float:
+        """Returns the request timeout for a model, falling back to the adapter default."""
+        return model_config.get('timeout') or self.default_timeout
+
+    def _post(self, url: str, model_config: Dict[str, Any], **kwargs: Any) -> requests.Response:
+        """
+        Sends a POST request through the pooled session for the URL's host.
+
+        Args:
+            url: The URL to post to.
+            model_config: The configuration of the model, used to resolve the timeout.
+            **kwargs: Additional arguments passed to requests.Session.post.
+
+        Returns:
+            The HTTP response.
+        """
+        kwargs.setdefault('timeout', self._get_timeout(model_config))
+        return self._get_session(url).post(url, **kwargs)
+
+    async def _apost(self, url: str, model_config: Dict[str, Any], **kwargs: Any) -> httpx.Response:
+        """
+        Sends a POST request through the pooled async client for the URL's host.
+
+        Args:
+            url: The URL to post to.
+            model_config: The configuration of the model, used to resolve the timeout.
+            **kwargs: Additional arguments passed to httpx.AsyncClient.post.
+
+        Returns:
+            The HTTP response.
+        """
+        kwargs.setdefault('timeout', self._get_timeout(model_config))
+        return await self._get_async_client(url).post(url, **kwargs)
+
+    def _request_error(self, url: str, error: Exception) -> ConnectionError:
+        """Builds the ConnectionError raised when a request to the provider fails."""
+        return ConnectionError(f"Failed to connect to {self.provider_name} API at {url}: {error}")
+
+    def _status_error(self, url: str, status_code: int, reason: str, headers: Any, body: Any) -> ProviderHTTPError:
+        """Builds the error raised when the provider answers with an error status."""
+        detail = body.get('error', body) if isinstance(body, dict) else reason
+        return ProviderHTTPError(
+            f"Failed to connect to {self.provider_name} API at {url}: HTTP {status_code} {detail}",
+            status_code,
+            retry_after_hint(headers, body, status_code)
+        )
+
+    def _get_retry_policy(self, model_config: Dict[str, Any]) -> RetryPolicy:
+        """Returns the retry policy for a model, applying its 'retry' overrides."""
+        overrides = model_config.get('retry')
+        return dataclasses.replace(self.retry_policy, **overrides) if overrides else self.retry_policy
+
+    def _attempt_timeout(self, model_config: Dict[str, Any], policy: RetryPolicy, started: float) -> float:
+        """Returns the timeout of one attempt, bounded by what is left of the retry deadline."""
+        timeout = self._get_timeout(model_config)
+        remaining = policy.remaining(started)
+        return timeout if remaining is None else max(min(timeout, remaining), 0.001)
+
+    def _retry_delay(self, policy: RetryPolicy, attempt: int, started: float, reason: str, retry_after: Optional[float] = None) -> Optional[float]:
+        """Returns the delay before the next attempt and counts it, or None when giving up."""
+        delay = policy.next_delay(attempt, started, retry_after)
+        BaseAdapter._retry_counters.record(self.provider_name, reason, 'exhausted' if delay is None else 'retries')
+        return delay
+
+    @staticmethod
+    def _json_body(response: Any) -> Any:
+        """Returns the decoded JSON body of a response, or None if it is not JSON."""
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def _send(self, url: str, model_config: Dict[str, Any], request: Dict[str, Any], stream: bool = False) -> requests.Response:
+        """
+        Posts a request, retrying connection errors, timeouts and transient statuses.
+
+        Args:
+            url: The URL to post to.
+            model_config: The configuration of the model.
+            request: The request keyword arguments from _prepare_request().
+            stream: Whether to stream the response body.
+
+        Returns:
+            A successful response.
+
+        Raises:
+            ProviderHTTPError: If the provider answers with a fatal status or retries run out.
+            requests.exceptions.RequestException: If the request fails and retries run out.
+        """
+        policy = self._get_retry_policy(model_config)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            timeout = self._attempt_timeout(model_config, policy, started)
+            try:
+                response = self._post(url, model_config, stream=stream, timeout=timeout, **request)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                delay = self._retry_delay(policy, attempt, started, type(e).__name__)
+                if delay is None:
+                    raise
+            else:
+                self.rate_limit_state = rate_limit_state(response.headers)
+                if response.ok:
+                    return response
+                error = self._status_error(url, response.status_code, response.reason, response.headers, self._json_body(response))
+                response.close()
+                if not policy.is_retryable_status(error.status_code):
+                    raise error
+                delay = self._retry_delay(policy, attempt, started, str(error.status_code), error.retry_after)
+                if delay is None:
+                    raise error
+            time.sleep(delay)
+
+    async def _asend(self, url: str, model_config: Dict[str, Any], request: Dict[str, Any], stream: bool = False) -> httpx.Response:
+        """
+        Async counterpart of _send().
+
+        Returns:
+            A successful response; a streamed response must be closed by the caller.
+        """
+        policy = self._get_retry_policy(model_config)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            timeout = self._attempt_timeout(model_config, policy, started)
+            try:
+                if stream:
+                    client = self._get_async_client(url)
+                    response = await client.send(client.build_request("POST", url, timeout=timeout, **request), stream=True)
+                else:
+                    response = await self._apost(url, model_config, timeout=timeout, **request)
+            except httpx.TransportError as e:
+                delay = self._retry_delay(policy, attempt, started, type(e).__name__)
+                if delay is None:
+                    raise
+            else:
+                self.rate_limit_state = rate_limit_state(response.headers)
+                if response.is_success:
+                    return response
+                if stream:
+                    await response.aread()
+                    await response.aclose()
+                error = self._status_error(url, response.status_code, response.reason_phrase, response.headers, self._json_body(response))
+                if not policy.is_retryable_status(error.status_code):
+                    raise error
+                delay = self._retry_delay(policy, attempt, started, str(error.status_code), error.retry_after)
+                if delay is None:
+                    raise error
+            await asyncio.sleep(delay)
 
     @abstractmethod
+    def _prepare_request(
+        self,
+        model_config: Dict[str, Any],
+        payload: Dict[str, Any],
+        parameters: Dict[str, Any] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Builds the provider request for a model invocation.
+
+        Args:
+            model_config: The configuration for the specific model being invoked.
+            payload: The user-provided data, including required fields.
+            parameters: Optional parameters for the request (temperature, max_tokens, etc.).
+
+        Returns:
+            A tuple of the URL to post to and the keyword arguments for the request
+            ('headers', 'json' and optionally 'params').
+        """
+        pass
+
     def invoke(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Sends a request to the provider's API and returns the response.
@@ -22,5 +355,223 @@ class BaseAdapter(ABC):
 
         Returns:
             The JSON response from the provider's API as a dictionary.
+
+        Raises:
+            ConnectionError: If the request to the API fails after any retries. Error
+                statuses raise ProviderHTTPError, which carries the status code.
+        """
+        url, request = self._prepare_request(model_config, payload, parameters)
+        try:
+            return self._send(url, model_config, request).json()
+        except requests.exceptions.RequestException as e:
+            raise self._request_error(url, e) from e
+
+    async def ainvoke(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Asynchronously sends a request to the provider's API and returns the response.
+
+        Args:
+            model_config: The configuration for the specific model being invoked.
+            payload: The user-provided data, including required fields.
+            parameters: Optional parameters for the request (temperature, max_tokens, etc.).
+
+        Returns:
+            The JSON response from the provider's API as a dictionary.
+
+        Raises:
+            ConnectionError: If the request to the API fails after any retries. Error
+                statuses raise ProviderHTTPError, which carries the status code.
+        """
+        url, request = self._prepare_request(model_config, payload, parameters)
+        try:
+            return (await self._asend(url, model_config, request)).json()
+        except httpx.HTTPError as e:
+            raise self._request_error(url, e) from e
+
+    def _prepare_embedding_batch_request(
+        self,
+        model_config: Dict[str, Any],
+        texts: Sequence[str],
+        parameters: Dict[str, Any] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Builds the provider request that embeds several texts at once.
+
+        The default sends an 'input' array, as OpenAI-compatible /embeddings APIs expect.
+        """
+        return self._prepare_request(model_config, {'input': list(texts)}, parameters)
+
+    def _parse_embedding_batch(self, response: Dict[str, Any]) -> List[List[float]]:
+        """
+        Extracts the vectors from a batch embedding response, in input order.
+
+        The default reads an OpenAI-compatible 'data' list.
+        """
+        data = sorted(response['data'], key=lambda item: item.get('index', 0))
+        return [item['embedding'] for item in data]
+
+    def _check_embedding_batch(self, model_config: Dict[str, Any], texts: Sequence[str]) -> None:
+        """Rejects batches the provider would not accept."""
+        if 'embeddings' not in model_config.get('capabilities', []):
+            raise ValueError(f"Model '{model_config['model']}' is not an embedding model")
+        if len(texts) > self.max_embedding_batch:
+            raise ValueError(
+                f"{self.provider_name} accepts at most {self.max_embedding_batch} texts per embedding request, got {len(texts)}"
+            )
+
+    def embed_batch(self, model_config: Dict[str, Any], texts: Sequence[str], parameters: Dict[str, Any] = None) -> List[List[float]]:
+        """
+        Embeds up to max_embedding_batch texts in a single request.
+
+        Args:
+            model_config: The configuration of an embedding model.
+            texts: The texts to embed.
+            parameters: Optional parameters for the request (dimensions, etc.).
+
+        Returns:
+            One embedding vector per text, in input order.
+
+        Raises:
+            ValueError: If the model is not an embedding model or the batch is too large.
+            ConnectionError: If the request to the API fails after any retries. Error
+                statuses raise ProviderHTTPError, which carries the status code.
+        """
+        self._check_embedding_batch(model_config, texts)
+        url, request = self._prepare_embedding_batch_request(model_config, texts, parameters)
+        try:
+            return self._parse_embedding_batch(self._send(url, model_config, request).json())
+        except requests.exceptions.RequestException as e:
+            raise self._request_error(url, e) from e
+
+    async def aembed_batch(self, model_config: Dict[str, Any], texts: Sequence[str], parameters: Dict[str, Any] = None) -> List[List[float]]:
+        """
+        Asynchronously embeds up to max_embedding_batch texts in a single request.
+
+        Returns:
+            One embedding vector per text, in input order.
+
+        Raises:
+            ValueError: If the model is not an embedding model or the batch is too large.
+            ConnectionError: If the request to the API fails after any retries. Error
+                statuses raise ProviderHTTPError, which carries the status code.
+        """
+        self._check_embedding_batch(model_config, texts)
+        url, request = self._prepare_embedding_batch_request(model_config, texts, parameters)
+        try:
+            return self._parse_embedding_batch((await self._asend(url, model_config, request)).json())
+        except httpx.HTTPError as e:
+            raise self._request_error(url, e) from e
+
+    def _prepare_stream_request(
+        self,
+        model_config: Dict[str, Any],
+        payload: Dict[str, Any],
+        parameters: Dict[str, Any] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Builds the provider request for a streaming invocation.
+
+        The default asks for an SSE stream with the 'stream' body flag, as
+        OpenAI-compatible APIs and Anthropic expect.
+
+        Raises:
+            ValueError: If the model does not produce streamable text.
+        """
+        capabilities = model_config.get('capabilities', [])
+        if 'embeddings' in capabilities or 'image_generation' in capabilities:
+            raise ValueError(f"Streaming is not supported for model '{model_config['model']}'")
+        url, request = self._prepare_request(model_config, payload, parameters)
+        request['json'] = {**request['json'], 'stream': True}
+        return url, request
+
+    def _parse_stream_event(self, event: str, data: str) -> Optional[Dict[str, Any]]:
+        """
+        Converts one SSE event into a normalized delta chunk.
+
+        The default understands OpenAI-compatible chat completion chunks.
+
+        Args:
+            event: The SSE event name.
+            data: The SSE event data.
+
+        Returns:
+            A chunk of the form {'delta': str, 'finish_reason': Optional[str]},
+            or None if the event carries no output.
+        """
+        if not data or data == '[DONE]':
+            return None
+        chunk = json.loads(data)
+        choices = chunk.get('choices') or [{}]
+        delta = choices[0].get('delta') or {}
+        finish_reason = choices[0].get('finish_reason')
+        text = delta.get('content') or ''
+        if not text and not finish_reason:
+            return None
+        return {'delta': text, 'finish_reason': finish_reason}
+
+    def invoke_stream(
+        self,
+        model_config: Dict[str, Any],
+        payload: Dict[str, Any],
+        parameters: Dict[str, Any] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Sends a streaming request and yields normalized delta chunks as they arrive.
+
+        Args:
+            model_config: The configuration for the specific model being invoked.
+            payload: The user-provided data, including required fields.
+            parameters: Optional parameters for the request (temperature, max_tokens, etc.).
+
+        Yields:
+            Chunks of the form {'delta': str, 'finish_reason': Optional[str]}.
+
+        Raises:
+            ConnectionError: If the request to the API fails after any retries. Error
+                statuses raise ProviderHTTPError, which carries the status code.
+        """
+        url, request = self._prepare_stream_request(model_config, payload, parameters)
+        try:
+            with self._send(url, model_config, request, stream=True) as response:
+                # Raw bytes: requests would decode a text/event-stream without charset as ISO-8859-1
+                lines = iter_sse_lines(response.iter_content(chunk_size=None))
+                for event, data in iter_sse_events(lines):
+                    chunk = self._parse_stream_event(event, data)
+                    if chunk is not None:
+                        yield chunk
+        except requests.exceptions.RequestException as e:
+            raise self._request_error(url, e) from e
+
+    async def ainvoke_stream(
+        self,
+        model_config: Dict[str, Any],
+        payload: Dict[str, Any],
+        parameters: Dict[str, Any] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Asynchronously sends a streaming request and yields normalized delta chunks.
+
+        Args:
+            model_config: The configuration for the specific model being invoked.
+            payload: The user-provided data, including required fields.
+            parameters: Optional parameters for the request (temperature, max_tokens, etc.).
+
+        Yields:
+            Chunks of the form {'delta': str, 'finish_reason': Optional[str]}.
+
+        Raises:
+            ConnectionError: If the request to the API fails after any retries. Error
+                statuses raise ProviderHTTPError, which carries the status code.
         """
-        pass
\ No newline at end of file
+        url, request = self._prepare_stream_request(model_config, payload, parameters)
+        try:
+            response = await self._asend(url, model_config, request, stream=True)
+            try:
+                async for event, data in aiter_sse_events(aiter_sse_lines(response.aiter_bytes())):
+                    chunk = self._parse_stream_event(event, data)
+                    if chunk is not None:
+                        yield chunk
+            finally:
+                await response.aclose()
+        except httpx.HTTPError as e:
+            raise self._request_error(url, e) from e
@@ -3,13 +3,19 @@ Google Gemini API adapter for LLMInventory.
 """
 
 import json
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from .base_adapter import BaseAdapter
 
 class GoogleAdapter(BaseAdapter):
     """Adapter for Google Gemini API."""
 
+    provider_name = "Google"
+
+    default_timeout = 30
+
+    # batchEmbedContents accepts at most 100 requests per call
+    max_embedding_batch = 100
+
     def __init__(self, api_key: str):
         """
         Initialize the Google adapter.
@@ -20,9 +26,9 @@ class GoogleAdapter(BaseAdapter):
         super().__init__(api_key)
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
 
-    def invoke(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _prepare_request(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Send a request to Google Gemini API.
+        Build a request to Google Gemini API.
         
         Args:
             model_config: Configuration for the model.
@@ -30,74 +36,152 @@ class GoogleAdapter(BaseAdapter):
             parameters: Optional parameters for the request.
             
         Returns:
-            Response from Google API.
+            The request URL and the request keyword arguments.
         """
-        model_id = model_config['model']
-        
         # Check if this is an embedding model
         capabilities = model_config.get('capabilities', [])
         is_embedding_model = 'embeddings' in capabilities
         
         if is_embedding_model:
-            return self._invoke_embedding(model_id, payload, parameters or {})
+            return self._prepare_embedding_request(model_config, payload, parameters or {})
         else:
-            return self._invoke_generation(model_id, payload, parameters or {})
+            return self._prepare_generation_request(model_config, payload, parameters or {})
 
-    def _invoke_generation(self, model_id: str, payload: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_generation_request(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """
-        Send a request to Google Gemini text generation API.
+        Build a request to Google Gemini text generation API.
         
         Args:
-            model_id: The model identifier.
+            model_config: Configuration for the model.
             payload: Request payload.
             parameters: Optional parameters for the request.
             
         Returns:
-            Response from Google API.
+            The request URL and the request keyword arguments.
         """
+        model_id = model_config['model']
         url = f"{self.base_url}/{model_id}:generateContent"
         
         # Convert messages format to Google's format
         google_payload = self._convert_payload(payload, parameters)
         
-        headers = {
-            "Content-Type": "application/json",
-        }
+        return url, self._request_kwargs(google_payload)
+
+    def _prepare_stream_request(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build a request to Google Gemini streaming API.
         
-        params = {
-            "key": self.api_key
-        }
+        Gemini streams through a separate streamGenerateContent method, which
+        emits SSE events when called with alt=sse.
         
-        try:
-            response = requests.post(
-                url,
-                headers=headers,
-                params=params,
-                data=json.dumps(google_payload),
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"Google API request failed: {str(e)}")
+        Args:
+            model_config: Configuration for the model.
+            payload: Request payload.
+            parameters: Optional parameters for the request.
+            
+        Returns:
+            The request URL and the request keyword arguments.
+        """
+        if 'embeddings' in model_config.get('capabilities', []):
+            raise ValueError(f"Streaming is not supported for model '{model_config['model']}'")
+        
+        model_id = model_config['model']
+        url = f"{self.base_url}/{model_id}:streamGenerateContent"
+        
+        request = self._request_kwargs(self._convert_payload(payload, parameters or {}))
+        request['params']['alt'] = 'sse'
+        return url, request
 
-    def _invoke_embedding(self, model_id: str, payload: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_stream_event(self, event: str, data: str) -> Optional[Dict[str, Any]]:
         """
-        Send a request to Google embedding API.
+        Convert one Gemini streaming event into a normalized delta chunk.
+        
+        Args:
+            event: The SSE event name.
+            data: The SSE event data, a partial GenerateContentResponse.
+            
+        Returns:
+            The delta chunk, or None if the event carries no output.
+        """
+        candidates = json.loads(data).get('candidates') or [{}]
+        parts = candidates[0].get('content', {}).get('parts', [])
+        text = ''.join(part.get('text', '') for part in parts)
+        finish_reason = candidates[0].get('finishReason')
+        if not text and not finish_reason:
+            return None
+        return {'delta': text, 'finish_reason': finish_reason}
+
+    def _prepare_embedding_request(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build a request to Google embedding API.
+        
+        A list 'input' is sent to batchEmbedContents, which returns one embedding
+        per text; embedContent would merge the texts into a single embedding.
         
         Args:
-            model_id: The model identifier.
+            model_config: Configuration for the model.
             payload: Request payload with 'input' field.
             parameters: Optional parameters for the request.
             
         Returns:
-            Response from Google API.
+            The request URL and the request keyword arguments.
         """
+        if isinstance(payload.get('input'), list):
+            return self._prepare_embedding_batch_request(model_config, payload['input'], parameters)
+        
+        model_id = model_config['model']
         url = f"{self.base_url}/{model_id}:embedContent"
         
         # Convert payload to Google's embedding format
         google_payload = self._convert_embedding_payload(payload, parameters)
         
+        return url, self._request_kwargs(google_payload)
+
+    def _prepare_embedding_batch_request(self, model_config: Dict[str, Any], texts: Sequence[str], parameters: Dict[str, Any] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build a request to Google batch embedding API.
+        
+        Args:
+            model_config: Configuration for the model.
+            texts: The texts to embed.
+            parameters: Optional parameters for the request.
+            
+        Returns:
+            The request URL and the request keyword arguments.
+        """
+        model_id = model_config['model']
+        url = f"{self.base_url}/{model_id}:batchEmbedContents"
+        
+        embed_requests = []
+        for text in texts:
+            request = self._convert_embedding_payload({'input': text}, parameters)
+            request['model'] = f"models/{model_id}"
+            embed_requests.append(request)
+        
+        return url, self._request_kwargs({"requests": embed_requests})
+
+    def _parse_embedding_batch(self, response: Dict[str, Any]) -> List[List[float]]:
+        """
+        Extract the vectors from a batchEmbedContents response.
+        
+        Args:
+            response: The response, with one entry in 'embeddings' per request.
+            
+        Returns:
+            The embedding vectors, in input order.
+        """
+        return [embedding['values'] for embedding in response['embeddings']]
+
+    def _request_kwargs(self, google_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the headers, query parameters and body shared by all Google requests.
+        
+        Args:
+            google_payload: Google-formatted request body.
+            
+        Returns:
+            The request keyword arguments.
+        """
         headers = {
             "Content-Type": "application/json",
         }
@@ -106,20 +190,10 @@ class GoogleAdapter(BaseAdapter):
             "key": self.api_key
         }
         
-        try:
-            response = requests.post(
-                url,
-                headers=headers,
-                params=params,
-                data=json.dumps(google_payload),
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"Google API request failed: {str(e)}")
-
-    def _convert_payload(self, payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+        return {"headers": headers, "params": params, "json": google_payload}
+
+    @staticmethod
+    def _convert_payload(payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Convert standard payload format to Google's expected format.
         
@@ -206,11 +280,6 @@ class GoogleAdapter(BaseAdapter):
                 google_payload['content'] = {
                     "parts": [{"text": input_text}]
                 }
-            elif isinstance(input_text, list):
-                # Handle multiple inputs
-                google_payload['content'] = {
-                    "parts": [{"text": text} for text in input_text]
-                }
         
         # Handle optional parameters
         if 'dimensions' in parameters:
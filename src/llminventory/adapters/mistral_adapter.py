@@ -2,14 +2,16 @@
 Mistral AI API adapter for LLMInventory.
 """
 
-import json
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from .base_adapter import BaseAdapter
 
 class MistralAdapter(BaseAdapter):
     """Adapter for Mistral AI API."""
 
+    provider_name = "Mistral"
+    default_timeout = 30
+    max_embedding_batch = 128
+
     def __init__(self, api_key: str):
         """
         Initialize the Mistral adapter.
@@ -20,9 +22,9 @@ class MistralAdapter(BaseAdapter):
         super().__init__(api_key)
         self.base_url = "https://api.mistral.ai/v1"
 
-    def invoke(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _prepare_request(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Send a request to Mistral AI API.
+        Build a request to Mistral AI API.
         
         Args:
             model_config: Configuration for the model.
@@ -30,9 +32,13 @@ class MistralAdapter(BaseAdapter):
             parameters: Optional parameters for the request (temperature, max_tokens, etc.).
             
         Returns:
-            Response from Mistral API.
+            The request URL and the request keyword arguments.
         """
-        url = f"{self.base_url}/chat/completions"
+        # Embedding models (mistral-embed) use a separate endpoint
+        if 'embeddings' in model_config.get('capabilities', []):
+            url = f"{self.base_url}/embeddings"
+        else:
+            url = f"{self.base_url}/chat/completions"
         
         # Mistral uses OpenAI-compatible format
         mistral_payload = {
@@ -49,14 +55,4 @@ class MistralAdapter(BaseAdapter):
             "Authorization": f"Bearer {self.api_key}"
         }
         
-        try:
-            response = requests.post(
-                url,
-                headers=headers,
-                data=json.dumps(mistral_payload),
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"Mistral API request failed: {str(e)}") 
\ No newline at end of file
+        return url, {"headers": headers, "json": mistral_payload}
@@ -1,15 +1,16 @@
 """Adapter for interacting with OpenAI's API."""
 
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from .base_adapter import BaseAdapter
 
 class OpenAIAdapter(BaseAdapter):
     """Adapter for making requests to the OpenAI API."""
 
-    def invoke(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+    provider_name = "OpenAI"
+
+    def _prepare_request(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Sends a request to the OpenAI API (chat completions or image generation).
+        Builds a request to the OpenAI API (chat completions or image generation).
 
         Args:
             model_config: The configuration for the OpenAI model.
@@ -17,10 +18,7 @@ class OpenAIAdapter(BaseAdapter):
             parameters: Optional parameters for the request.
 
         Returns:
-            The JSON response from the API.
-
-        Raises:
-            ConnectionError: If the request to the API fails.
+            The endpoint URL and the request keyword arguments.
         """
         endpoint = model_config['endpoint']
         model_name = model_config['model']
@@ -30,6 +28,10 @@ class OpenAIAdapter(BaseAdapter):
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        if self.organization:
+            headers["OpenAI-Organization"] = self.organization
+        if self.project:
+            headers["OpenAI-Project"] = self.project
 
         # Handle different model types
         if 'image_generation' in capabilities:
@@ -39,12 +41,7 @@ class OpenAIAdapter(BaseAdapter):
             # Chat completion models
             request_body = self._prepare_chat_request(model_name, payload, parameters)
 
-        try:
-            response = requests.post(endpoint, headers=headers, json=request_body, timeout=60)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"Failed to connect to OpenAI API at {endpoint}: {e}") from e
+        return endpoint, {"headers": headers, "json": request_body}
     
     def _prepare_chat_request(self, model: str, payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
         """Prepare request body for chat completion models."""
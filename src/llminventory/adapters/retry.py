@@ -0,0 +1,211 @@
+"""Retry policy for provider requests: error classification, backoff and retry hints."""
+
+import copy
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, FrozenSet, Mapping, Optional
+
+# Status codes that indicate a transient condition worth retrying
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+# Headers carrying the time until a rate limit resets, in order of preference
+_RESET_HEADERS = (
+    'x-ratelimit-reset-requests',
+    'x-ratelimit-reset-tokens',
+    'anthropic-ratelimit-requests-reset',
+    'anthropic-ratelimit-tokens-reset',
+)
+
+# Headers carrying the requests left in the current rate-limit window, and its reset
+_REMAINING_HEADERS = ('x-ratelimit-remaining-requests', 'anthropic-ratelimit-requests-remaining')
+_REQUESTS_RESET_HEADERS = ('x-ratelimit-reset-requests', 'anthropic-ratelimit-requests-reset')
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+class ProviderHTTPError(ConnectionError):
+    """Raised when a provider answers with an error status."""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parses a duration such as '1.5', '20ms', '6m0s' or an HTTP/ISO date into seconds from now.
+
+    Returns:
+        The number of seconds, or None if the value cannot be parsed.
+    """
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and ''.join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        # An HTTP-date (Retry-After) or an RFC 3339 timestamp (Anthropic reset headers)
+        if ',' in value:
+            when = parsedate_to_datetime(value)
+        else:
+            when = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+def retry_after_hint(headers: Mapping[str, str], body: Any = None, status_code: Optional[int] = None) -> Optional[float]:
+    """
+    Returns the delay a provider asked for before retrying, if any.
+
+    Reads Retry-After and retry-after-ms, then, for a 429 only, the OpenAI and
+    Anthropic rate-limit reset headers, then the RetryInfo detail of a Gemini
+    error body. Providers send the reset headers on every response, so on
+    other statuses they say nothing about when to retry.
+
+    Args:
+        headers: The response headers (case-insensitive mapping).
+        body: The decoded JSON error body, if any.
+        status_code: The response status.
+
+    Returns:
+        The delay in seconds, or None if the response gives no hint.
+    """
+    if headers.get('retry-after-ms'):
+        try:
+            return float(headers['retry-after-ms']) / 1000.0
+        except ValueError:
+            pass
+    names = ('retry-after',) + _RESET_HEADERS if status_code == 429 else ('retry-after',)
+    for name in names:
+        if headers.get(name):
+            delay = parse_duration(headers[name])
+            if delay is not None:
+                return delay
+    if isinstance(body, dict) and isinstance(body.get('error'), dict):
+        for detail in body['error'].get('details') or []:
+            if isinstance(detail, dict) and isinstance(detail.get('retryDelay'), str):
+                return parse_duration(detail['retryDelay'])
+    return None
+
+def rate_limit_state(headers: Mapping[str, str]) -> Dict[str, float]:
+    """
+    Returns the request rate-limit state reported in response headers.
+
+    Returns:
+        A dict with 'remaining_requests' and 'reset_requests' (seconds until the
+        window resets) when the provider reports them, else an empty dict.
+    """
+    state: Dict[str, float] = {}
+    for name in _REMAINING_HEADERS:
+        if headers.get(name):
+            try:
+                state['remaining_requests'] = float(headers[name])
+            except ValueError:
+                continue
+            break
+    for name in _REQUESTS_RESET_HEADERS:
+        if headers.get(name):
+            reset = parse_duration(headers[name])
+            if reset is not None:
+                state['reset_requests'] = reset
+                break
+    return state
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How a provider request is retried.
+
+    Delays grow exponentially from base_delay with full jitter, capped at
+    max_delay; a delay requested by the provider takes precedence, plus up to
+    hint_jitter seconds (or a tenth of the delay, if larger) so that clients
+    told the same delay do not all retry at the same moment. No attempt
+    starts once the deadline (seconds since the first attempt) would be passed.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    deadline: Optional[float] = 120.0
+    hint_jitter: float = 0.1
+    retry_statuses: FrozenSet[int] = field(default=RETRYABLE_STATUSES)
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """Returns whether a response status is transient."""
+        return status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns the delay before the next attempt.
+
+        Args:
+            attempt: The number of the attempt that just failed, starting at 1.
+            retry_after: The delay requested by the provider, if any.
+        """
+        if retry_after is not None:
+            delay = min(retry_after, self.max_delay)
+            return delay + random.uniform(0, max(self.hint_jitter, delay * 0.1))
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def next_delay(self, attempt: int, started: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Returns the delay before retrying, or None if no attempts or time budget remain.
+
+        Args:
+            attempt: The number of the attempt that just failed, starting at 1.
+            started: The monotonic time of the first attempt.
+            retry_after: The delay requested by the provider, if any.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt, retry_after)
+        if self.deadline is not None and time.monotonic() - started + delay >= self.deadline:
+            return None
+        return delay
+
+    def remaining(self, started: float) -> Optional[float]:
+        """Returns the seconds left in the deadline budget, or None without a deadline."""
+        if self.deadline is None:
+            return None
+        return self.deadline - (time.monotonic() - started)
+
+class RetryCounters:
+    """Thread-safe retry counters per provider, exported through BaseAdapter.retry_stats()."""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, reason: str, event: str) -> None:
+        """
+        Records a retry event.
+
+        Args:
+            provider: The provider name.
+            reason: The status code or exception class that triggered it.
+            event: 'retries' when the request is retried, 'exhausted' when it gives up.
+        """
+        with self._lock:
+            stats = self._counters.setdefault(provider, {'retries': 0, 'exhausted': 0, 'reasons': {}})
+            stats[event] += 1
+            if event == 'retries':
+                stats['reasons'][reason] = stats['reasons'].get(reason, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns a copy of the counters, keyed by provider."""
+        with self._lock:
+            return copy.deepcopy(self._counters)
+
+    def reset(self) -> None:
+        """Clears all counters."""
+        with self._lock:
+            self._counters.clear()
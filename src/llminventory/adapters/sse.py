@@ -0,0 +1,174 @@
+"""Incremental parsing of server-sent event (SSE) streams returned by provider APIs."""
+
+import re
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+# An SSE event as (event name, data). The name defaults to 'message' when the
+# stream does not send an 'event:' field.
+SSEEvent = Tuple[str, str]
+
+# SSE lines end in CRLF, LF or CR, and nothing else: str.splitlines() would also
+# split at characters such as U+0085 and U+2028, which may appear inside JSON data
+_LINE_END = re.compile(rb'\r\n|\r|\n')
+
+class SSELineDecoder:
+    """
+    Splits a byte stream into lines and decodes them as UTF-8.
+
+    Event streams are always UTF-8, whatever the Content-Type says, so the
+    bytes are split at the SSE line terminators first and each line is
+    decoded on its own; a line terminator byte never occurs inside a
+    multi-byte UTF-8 sequence.
+    """
+
+    def __init__(self):
+        self._buffer = b''
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """
+        Processes the next chunk of the stream.
+
+        Args:
+            chunk: Bytes as they were received.
+
+        Returns:
+            The lines completed by the chunk, without their terminators.
+        """
+        data = self._buffer + chunk
+        lines = []
+        start = 0
+        for match in _LINE_END.finditer(data):
+            if match.group() == b'\r' and match.end() == len(data):
+                # May be the first half of a CRLF split across chunks
+                break
+            lines.append(data[start:match.start()].decode('utf-8', errors='replace'))
+            start = match.end()
+        self._buffer = data[start:]
+        return lines
+
+    def flush(self) -> List[str]:
+        """Returns the last line if the stream did not end with a line terminator."""
+        data, self._buffer = self._buffer, b''
+        if data.endswith(b'\r'):
+            data = data[:-1]
+        return [data.decode('utf-8', errors='replace')] if data else []
+
+def iter_sse_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Yields the decoded lines of an event stream.
+
+    Args:
+        chunks: The response body as bytes, e.g. from iter_content().
+
+    Yields:
+        Each line without its terminator.
+    """
+    decoder = SSELineDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.flush()
+
+async def aiter_sse_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Yields the decoded lines of an event stream.
+
+    Args:
+        chunks: The response body as bytes, e.g. from aiter_bytes().
+
+    Yields:
+        Each line without its terminator.
+    """
+    decoder = SSELineDecoder()
+    async for chunk in chunks:
+        for line in decoder.feed(chunk):
+            yield line
+    for line in decoder.flush():
+        yield line
+
+class SSEParser:
+    """
+    Accumulates SSE lines and emits complete events.
+
+    Feed it one line at a time (without the trailing newline); an event is
+    returned when the blank line terminating it is seen.
+    """
+
+    def __init__(self):
+        self._event: Optional[str] = None
+        self._data: List[str] = []
+
+    def feed(self, line: str) -> Optional[SSEEvent]:
+        """
+        Processes one line of the stream.
+
+        Args:
+            line: A line of the stream without its line terminator.
+
+        Returns:
+            The completed (event, data) pair, or None if the event is not complete yet.
+        """
+        if not line:
+            return self.flush()
+        if line.startswith(':'):
+            # Comment / keep-alive line
+            return None
+
+        field, _, value = line.partition(':')
+        if value.startswith(' '):
+            value = value[1:]
+        if field == 'event':
+            self._event = value
+        elif field == 'data':
+            self._data.append(value)
+        return None
+
+    def flush(self) -> Optional[SSEEvent]:
+        """
+        Returns the pending event, if any, and resets the parser.
+
+        As in the SSE specification, an event without data (e.g. a bare
+        'event: ping') is discarded rather than dispatched.
+        """
+        data = '\n'.join(self._data)
+        event = (self._event or 'message', data) if data else None
+        self._event = None
+        self._data = []
+        return event
+
+def iter_sse_events(lines: Iterable[str]) -> Iterator[SSEEvent]:
+    """
+    Yields SSE events from an iterable of decoded lines.
+
+    Args:
+        lines: The lines of the response body, as produced by iter_sse_lines().
+
+    Yields:
+        (event, data) pairs as soon as each event is complete.
+    """
+    parser = SSEParser()
+    for line in lines:
+        event = parser.feed(line.rstrip('\r'))
+        if event is not None:
+            yield event
+    event = parser.flush()
+    if event is not None:
+        yield event
+
+async def aiter_sse_events(lines: AsyncIterator[str]) -> AsyncIterator[SSEEvent]:
+    """
+    Yields SSE events from an async iterator of decoded lines.
+
+    Args:
+        lines: The lines of the response body, as produced by aiter_sse_lines().
+
+    Yields:
+        (event, data) pairs as soon as each event is complete.
+    """
+    parser = SSEParser()
+    async for line in lines:
+        event = parser.feed(line.rstrip('\r'))
+        if event is not None:
+            yield event
+    event = parser.flush()
+    if event is not None:
+        yield event
@@ -2,14 +2,15 @@
 xAI Grok API adapter for LLMInventory.
 """
 
-import json
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from .base_adapter import BaseAdapter
 
 class XaiAdapter(BaseAdapter):
     """Adapter for xAI Grok API."""
 
+    provider_name = "xAI"
+    default_timeout = 30
+
     def __init__(self, api_key: str):
         """
         Initialize the xAI adapter.
@@ -20,9 +21,9 @@ class XaiAdapter(BaseAdapter):
         super().__init__(api_key)
         self.base_url = "https://api.x.ai/v1"
 
-    def invoke(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _prepare_request(self, model_config: Dict[str, Any], payload: Dict[str, Any], parameters: Dict[str, Any] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Send a request to xAI Grok API.
+        Build a request to xAI Grok API.
         
         Args:
             model_config: Configuration for the model.
@@ -30,7 +31,7 @@ class XaiAdapter(BaseAdapter):
             parameters: Optional parameters for the request (temperature, max_tokens, etc.).
             
         Returns:
-            Response from xAI API.
+            The request URL and the request keyword arguments.
         """
         url = f"{self.base_url}/chat/completions"
         
@@ -49,14 +50,4 @@ class XaiAdapter(BaseAdapter):
             "Authorization": f"Bearer {self.api_key}"
         }
         
-        try:
-            response = requests.post(
-                url,
-                headers=headers,
-                data=json.dumps(xai_payload),
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"xAI API request failed: {str(e)}") 
\ No newline at end of file
+        return url, {"headers": headers, "json": xai_payload}
@@ -0,0 +1,58 @@
+"""Defines the job and result types used by LLMInventory.invoke_many."""
+
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Sequence, Union
+
+# A bulk job is either a (provider, model, payload[, parameters]) tuple or a dict
+# with the same keys as the invoke() arguments.
+InvocationJob = Union[Sequence[Any], Dict[str, Any]]
+
+@dataclass
+class InvocationRequest:
+    """A single normalized invocation within a bulk run."""
+
+    index: int
+    provider: str
+    model: str
+    payload: Dict[str, Any]
+    parameters: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_job(cls, index: int, job: InvocationJob) -> "InvocationRequest":
+        """
+        Builds a request from a tuple or dict job description.
+
+        Args:
+            index: The position of the job in the submitted list.
+            job: A (provider, model, payload[, parameters]) tuple or a dict with
+                'provider', 'model', 'payload' and optional 'parameters' keys.
+
+        Raises:
+            ValueError: If the job is malformed.
+        """
+        if isinstance(job, dict):
+            try:
+                return cls(index, job['provider'], job['model'], job['payload'], job.get('parameters'))
+            except KeyError as e:
+                raise ValueError(f"Job {index} is missing required key {e}") from e
+        if len(job) not in (3, 4):
+            raise ValueError(
+                f"Job {index} must be (provider, model, payload[, parameters]), got {len(job)} items"
+            )
+        return cls(index, *job)
+
+@dataclass
+class InvocationResult:
+    """The outcome of one job from LLMInventory.invoke_many."""
+
+    index: int
+    provider: str
+    model: str
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the invocation succeeded."""
+        return self.error is None
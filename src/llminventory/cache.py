@@ -0,0 +1,285 @@
+"""Response caches used by LLMInventory to answer repeated identical requests."""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    payload: Dict[str, Any],
+    parameters: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Builds a canonical cache key for an invocation.
+
+    The payload and the merged parameters are serialized with sorted keys, so
+    requests that differ only in dict ordering share a key.
+
+    Args:
+        provider: The name of the provider.
+        model: The specific model name.
+        payload: The request payload.
+        parameters: The merged, validated parameters.
+
+    Returns:
+        A hex SHA-256 digest identifying the request.
+    """
+    canonical = json.dumps(
+        [provider, model, payload, parameters or {}],
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class ResponseCache(ABC):
+    """Abstract base class for response cache backends."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached response for a key, or None on a miss."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Stores a response.
+
+        Args:
+            key: The cache key from make_cache_key().
+            response: The provider response to cache.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes all entries."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a response and records a hit or a miss.
+
+        Args:
+            key: The cache key from make_cache_key().
+
+        Returns:
+            The cached response, or None if it is absent or expired.
+        """
+        response = self._get(key)
+        with self._stats_lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and the current number of entries."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self)
+        }
+
+class InMemoryResponseCache(ResponseCache):
+    """A thread-safe in-process LRU cache with an optional time-to-live."""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries: The maximum number of responses kept; the least recently
+                used entry is evicted beyond it.
+            ttl: Seconds a response stays valid, or None to keep it until evicted.
+        """
+        super().__init__()
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers own the returned dict, so hand out a copy
+        return copy.deepcopy(response)
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        response = copy.deepcopy(response)
+        with self._lock:
+            self._entries[key] = (expires_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats['evictions'] = self.evictions
+        return stats
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    A persistent response cache stored in a SQLite database file.
+
+    The file can be shared by several processes (e.g. uvicorn workers or batch
+    jobs): SQLite's locking serializes writers, and WAL mode lets readers proceed
+    while a write is in progress. Cache errors such as a lock timeout are logged
+    and treated as misses so they never fail a request.
+    """
+
+    # How often (in writes) the size bound is enforced, to keep COUNT(*) off the hot path.
+    EVICTION_INTERVAL = 64
+    # Minimum seconds between recorded accesses of an entry, to avoid a write on every hit.
+    ACCESS_RESOLUTION = 60.0
+
+    def __init__(self, db_path: Path, max_entries: int = 100_000, ttl: Optional[float] = None, busy_timeout: float = 5.0):
+        """
+        Initializes the cache, creating the database file if needed.
+
+        Args:
+            db_path: The path to the SQLite database file.
+            max_entries: The approximate maximum number of responses kept; the
+                least recently used entries are evicted beyond it.
+            ttl: Seconds a response stays valid, or None to keep it until evicted.
+            busy_timeout: Seconds to wait for another process's lock before giving up.
+        """
+        super().__init__()
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.busy_timeout = busy_timeout
+        self.evictions = 0
+        self._local = threading.local()
+        self._writes = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._evict()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT response, expires_at, last_access FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, expires_at, last_access = row
+            if expires_at and expires_at < now:
+                with conn:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            if now - last_access > self.ACCESS_RESOLUTION:
+                with conn:
+                    conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            return json.loads(response)
+        except sqlite3.Error as e:
+            print(f"Warning: Response cache lookup failed: {e}")
+            return None
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else 0.0
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(response, separators=(',', ':')), expires_at, now)
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: Response cache store failed: {e}")
+            return
+
+        with self._stats_lock:
+            self._writes += 1
+            evict = self._writes % self.EVICTION_INTERVAL == 0
+        if evict:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drops expired entries, then the least recently used ones beyond max_entries."""
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM responses WHERE expires_at > 0 AND expires_at < ?", (time.time(),))
+                excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                        (excess,)
+                    )
+                    self.evictions += excess
+        except sqlite3.Error as e:
+            print(f"Warning: Response cache eviction failed: {e}")
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats['evictions'] = self.evictions
+        return stats
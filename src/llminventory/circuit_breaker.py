@@ -0,0 +1,188 @@
+"""Circuit breakers that stop sending requests to a degraded provider model."""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+from .adapters.retry import ProviderHTTPError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a provider model whose circuit is open."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def is_provider_failure(error: BaseException) -> bool:
+    """
+    Returns whether an error says the provider is unhealthy.
+
+    Connection errors, timeouts, 5xx, 408 and 429 count; client errors such as
+    400/401/404, invalid parameters or missing keys do not.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, ProviderHTTPError):
+        return error.status_code >= 500 or error.status_code in (408, 429)
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+class CircuitBreaker:
+    """
+    Tracks the outcomes of calls to one provider model.
+
+    The circuit opens when, over the last `window` seconds and at least
+    `min_calls` calls, the share of failed calls reaches `failure_rate`.
+    Calls slower than `slow_call_seconds` count as failures. While open,
+    calls fail fast with CircuitOpenError; after `open_seconds` the circuit
+    is half-open and lets `half_open_probes` calls through, closing again if
+    they succeed and reopening if one fails.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        slow_call_seconds: Optional[float] = None
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.slow_call_seconds = slow_call_seconds
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._calls: deque = deque()  # (time, failed, latency)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self._calls.clear()
+
+    def before_call(self) -> None:
+        """
+        Admits a call, or fails fast while the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all probes in flight.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_probes - self._probe_successes:
+                self._probes_in_flight += 1
+                return
+            self.rejected += 1
+            retry_after = max(0.0, self.opened_at + self.open_seconds - now)
+        raise CircuitOpenError(f"Circuit for {self.name} is open; failing fast", retry_after=retry_after)
+
+    def record(self, error: Optional[BaseException] = None, latency: Optional[float] = None) -> None:
+        """
+        Records the outcome of an admitted call.
+
+        Args:
+            error: The error the call raised, or None if it succeeded.
+            latency: The call duration in seconds, if known.
+        """
+        failed = (error is not None and is_provider_failure(error)) or (
+            error is None and latency is not None and self.slow_call_seconds is not None and latency > self.slow_call_seconds
+        )
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed:
+                    self._open(now)
+                elif error is None:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_probes:
+                        self.state = CLOSED
+                return
+            if self.state == OPEN:
+                return
+            self._calls.append((now, failed, latency))
+            self._prune(now)
+            failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+            if len(self._calls) >= self.min_calls and failures / len(self._calls) >= self.failure_rate:
+                self._open(now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the state, recent failure rate and latency, and time until the next probe."""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            calls = len(self._calls)
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            latencies = [latency for _, _, latency in self._calls if latency is not None]
+            state = self.state
+            if state == OPEN and now - self.opened_at >= self.open_seconds:
+                state = HALF_OPEN
+            return {
+                'state': state,
+                'calls': calls,
+                'failure_rate': failures / calls if calls else 0.0,
+                'avg_latency_ms': sum(latencies) / len(latencies) * 1000 if latencies else None,
+                'rejected': self.rejected,
+                'retry_after': max(0.0, self.opened_at + self.open_seconds - now) if state == OPEN else 0.0
+            }
+
+class CircuitBreakerRegistry:
+    """Holds one CircuitBreaker per provider model, created on first use with shared settings."""
+
+    def __init__(self, **settings: Any):
+        """
+        Initializes the registry.
+
+        Args:
+            **settings: CircuitBreaker settings applied to every breaker
+                (failure_rate, min_calls, window, open_seconds, ...).
+        """
+        self.settings = settings
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: str) -> CircuitBreaker:
+        """Returns the breaker of a provider model."""
+        key = (provider, model)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = self._breakers[key] = CircuitBreaker(f"{provider}/{model}", **self.settings)
+        return breaker
+
+    def is_open(self, provider: str, model: str) -> bool:
+        """Returns whether a model's circuit is open and still rejecting calls."""
+        breaker = self._breakers.get((provider, model))
+        return breaker is not None and breaker.state == OPEN and time.monotonic() - breaker.opened_at < breaker.open_seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the snapshot of every breaker, keyed by 'provider/model'."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
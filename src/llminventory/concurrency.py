@@ -0,0 +1,248 @@
+"""Adaptive (AIMD) limits on the requests in flight to each provider."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+from .adapters.retry import ProviderHTTPError
+from .rate_limiter import RateLimitExceeded
+
+# Statuses that say the provider is overloaded: rate limited, unavailable, Anthropic 'overloaded'
+OVERLOAD_STATUSES = frozenset({429, 503, 529})
+
+def is_overload(error: BaseException) -> bool:
+    """Returns whether an error says the provider is overloaded, as opposed to rejecting the request."""
+    if isinstance(error, ProviderHTTPError):
+        return error.status_code in OVERLOAD_STATUSES
+    # Imported here so that importing the package does not load the HTTP clients (adapters import them anyway)
+    import httpx
+    import requests
+    return isinstance(error, (TimeoutError, requests.exceptions.Timeout, httpx.TimeoutException))
+
+class Waiter:
+    """A caller queued for a slot, woken through a threading.Event or an asyncio future."""
+    __slots__ = ('granted', 'event', 'loop', 'future')
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.granted = False
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def grant(self) -> None:
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_wake, self.future)
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+class AdaptiveLimit:
+    """
+    The in-flight limit of one provider, adjusted like TCP congestion control.
+
+    Each successful call while the limit is in use adds 1/limit, so the limit
+    grows by about one per round of calls. An overload signal (429, 503, 529
+    or a timeout) multiplies it by `backoff`, and a call slower than
+    `latency_tolerance` times the baseline latency multiplies it by
+    `latency_backoff`; decreases happen at most once per smoothed round-trip
+    time, so one burst of errors counts once. Callers over the limit wait in
+    FIFO order, whether they are threads or asyncio tasks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float = 20,
+        min_limit: float = 1,
+        max_limit: float = 500,
+        backoff: float = 0.5,
+        latency_backoff: float = 0.9,
+        latency_tolerance: float = 2.0
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.latency_tolerance = latency_tolerance
+
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.rejected = 0
+        self.baseline_latency: Optional[float] = None
+        self.smoothed_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._waiters: Deque[Waiter] = deque()
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> bool:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        return False
+
+    def _reject(self, max_wait: float) -> RateLimitExceeded:
+        with self._lock:
+            self.rejected += 1
+        return RateLimitExceeded(
+            f"Concurrency limit of {int(self.limit)} for {self.name} reached; no slot within {max_wait:.2f}s",
+            retry_after=self.smoothed_latency or 1.0
+        )
+
+    def acquire(self, max_wait: Optional[float] = None) -> None:
+        """
+        Blocks until a slot is free and takes it.
+
+        Raises:
+            RateLimitExceeded: If no slot frees up within max_wait seconds.
+        """
+        with self._lock:
+            if self._try_take():
+                return
+            waiter = Waiter()
+            self._waiters.append(waiter)
+        if waiter.event.wait(max_wait):
+            return
+        with self._lock:
+            if waiter.granted:
+                return
+            self._waiters.remove(waiter)
+        raise self._reject(max_wait)
+
+    async def aacquire(self, max_wait: Optional[float] = None) -> None:
+        """Async counterpart of acquire() that waits without blocking the event loop."""
+        with self._lock:
+            if self._try_take():
+                return
+            waiter = Waiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), max_wait)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if waiter.granted:
+                    return
+                self._waiters.remove(waiter)
+            raise self._reject(max_wait)
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release_slot()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+
+    def _release_slot(self) -> None:
+        """Frees a slot and hands free slots to waiters; call with the lock held."""
+        self.in_flight = max(0, self.in_flight - 1)
+        while self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            self._waiters.popleft().grant()
+
+    def release(self, error: Optional[BaseException] = None, latency: Optional[float] = None) -> None:
+        """
+        Frees a slot and adjusts the limit from the outcome of the call.
+
+        Args:
+            error: The error the call raised, or None if it succeeded.
+            latency: The call duration in seconds, if it should steer the limit.
+        """
+        with self._lock:
+            now = time.monotonic()
+            was_saturated = self.in_flight >= self.limit / 2
+            if latency is not None:
+                self.smoothed_latency = latency if self.smoothed_latency is None else 0.9 * self.smoothed_latency + 0.1 * latency
+                if self.baseline_latency is None or latency < self.baseline_latency:
+                    self.baseline_latency = latency
+                else:
+                    # Drift up slowly so the baseline follows lasting changes such as longer prompts
+                    self.baseline_latency += 0.01 * (latency - self.baseline_latency)
+
+            if error is not None and is_overload(error):
+                self._decrease(now, self.backoff)
+            elif error is None and latency is not None and latency > self.latency_tolerance * self.baseline_latency:
+                self._decrease(now, self.latency_backoff)
+            elif error is None and was_saturated and self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.increases += 1
+            self._release_slot()
+
+    def _decrease(self, now: float, factor: float) -> None:
+        if now - self._last_decrease < (self.smoothed_latency or 0.0):
+            return
+        self.limit = max(self.min_limit, self.limit * factor)
+        self.decreases += 1
+        self._last_decrease = now
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the current limit, load and adjustment counters."""
+        with self._lock:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'waiting': len(self._waiters),
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'rejected': self.rejected,
+                'baseline_latency_ms': self.baseline_latency * 1000 if self.baseline_latency is not None else None,
+                'smoothed_latency_ms': self.smoothed_latency * 1000 if self.smoothed_latency is not None else None
+            }
+
+class ConcurrencyLimiter:
+    """Holds one AdaptiveLimit per provider, created on first use with shared settings."""
+
+    def __init__(self, max_wait: Optional[float] = 60.0, **settings: Any):
+        """
+        Initializes the limiter.
+
+        Args:
+            max_wait: The maximum seconds a call waits for a slot before
+                RateLimitExceeded is raised; None waits indefinitely.
+            **settings: AdaptiveLimit settings applied to every provider
+                (initial_limit, min_limit, max_limit, backoff, ...).
+        """
+        self.max_wait = max_wait
+        self.settings = settings
+        self._limits: Dict[str, AdaptiveLimit] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> AdaptiveLimit:
+        """Returns the limit of a provider."""
+        limit = self._limits.get(provider)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.get(provider)
+                if limit is None:
+                    limit = self._limits[provider] = AdaptiveLimit(provider, **self.settings)
+        return limit
+
+    def acquire(self, provider: str) -> AdaptiveLimit:
+        """
+        Takes a slot of a provider, waiting up to max_wait, and returns its limit for release().
+
+        Raises:
+            RateLimitExceeded: If no slot frees up in time.
+        """
+        limit = self.get(provider)
+        limit.acquire(self.max_wait)
+        return limit
+
+    async def aacquire(self, provider: str) -> AdaptiveLimit:
+        """Async counterpart of acquire()."""
+        limit = self.get(provider)
+        await limit.aacquire(self.max_wait)
+        return limit
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the snapshot of every provider's limit."""
+        with self._lock:
+            limits = dict(self._limits)
+        return {provider: limit.snapshot() for provider, limit in limits.items()}
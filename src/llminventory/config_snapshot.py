@@ -0,0 +1,83 @@
+"""Compiled snapshots of parsed config files, so processes can skip YAML parsing at startup."""
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+_MAGIC = 'llminventory-snapshot'
+
+def snapshot_path(source: Path) -> Path:
+    """Returns the snapshot file of a config file, e.g. supported_models.snapshot for supported_models.yaml."""
+    return source.with_suffix('.snapshot')
+
+def _header(version: int, mtime_ns: int, content: bytes) -> tuple:
+    # marshal's format may change between Python versions, so the version is part of the key
+    return (_MAGIC, version, sys.version_info[:2], mtime_ns, len(content), hashlib.sha256(content).hexdigest())
+
+def read_snapshot(source: Path, version: int) -> Optional[Any]:
+    """
+    Loads the snapshot of a config file if it is still current.
+
+    A snapshot is current when it was written with the same version by this
+    Python version, and the config file has the same modification time and
+    size, or failing that the same content hash (e.g. after a checkout that
+    touched the file without changing it).
+
+    Args:
+        source: The config file the snapshot was compiled from.
+        version: The version of the snapshot payload the caller expects.
+
+    Returns:
+        The snapshot payload, or None if there is no current snapshot.
+    """
+    try:
+        stat = source.stat()
+        # One read and marshal.loads() on slices; marshal.load() on a file reads it piecemeal and is far slower
+        data = memoryview(snapshot_path(source).read_bytes())
+        header_size = int.from_bytes(data[:4], 'little')
+        header = marshal.loads(data[4:4 + header_size])
+        if not isinstance(header, tuple) or len(header) != 6:
+            return None
+        magic, snapshot_version, python_version, mtime_ns, size, digest = header
+        if (magic, snapshot_version, python_version) != (_MAGIC, version, sys.version_info[:2]) or size != stat.st_size:
+            return None
+        if mtime_ns != stat.st_mtime_ns and digest != hashlib.sha256(source.read_bytes()).hexdigest():
+            return None
+        return marshal.loads(data[4 + header_size:])
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+def write_snapshot(source: Path, version: int, payload: Any, content: bytes, mtime_ns: int) -> Optional[Path]:
+    """
+    Writes the snapshot of a config file atomically.
+
+    Args:
+        source: The config file.
+        version: The version of the snapshot payload.
+        payload: The parsed content; only builtin types (dict, list, str, numbers, ...) are supported.
+        content: The bytes of the config file the payload was parsed from.
+        mtime_ns: The modification time of the config file before it was read.
+
+    Returns:
+        The path of the snapshot, or None if it could not be written (e.g. a read-only directory).
+    """
+    path = snapshot_path(source)
+    try:
+        header = marshal.dumps(_header(version, mtime_ns, content))
+        data = len(header).to_bytes(4, 'little') + header + marshal.dumps(payload)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except (OSError, ValueError):
+        return None
+    return path
@@ -0,0 +1,166 @@
+"""Watches the model config and secrets files and hot-reloads an inventory when they change."""
+
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, Callable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .inventory import LLMInventory
+
+TARGETS = ('models', 'secrets')
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+class ConfigWatcher:
+    """
+    Reloads model configs and secrets when their files change, without a restart.
+
+    Files are polled every `interval` seconds by their modification time and
+    size (portable, and cheap at this file count; inotify would need a
+    platform-specific dependency). A change triggers a reload on the watcher
+    thread: the new version is parsed and validated there and then swapped
+    into the inventory, so request handling never waits for it. A reload that
+    fails validation keeps the current version and is retried only after the
+    files change again. Reloads can also be requested explicitly, e.g. from
+    an admin endpoint, and their latency and outcome are recorded per target.
+    """
+
+    def __init__(self, inventory: "LLMInventory", interval: float = 2.0):
+        """
+        Initializes the watcher.
+
+        Args:
+            inventory: The inventory to reload.
+            interval: The seconds between polls of the watched files.
+        """
+        self.inventory = inventory
+        self.interval = interval
+        self._reloaders: Dict[str, Callable[[], int]] = {
+            'models': inventory.reload_models,
+            'secrets': inventory.reload_secrets
+        }
+        self._stats: Dict[str, Dict[str, Any]] = {
+            target: {
+                'reloads': 0,
+                'failures': 0,
+                'items': None,
+                'last_reload_at': None,
+                'last_reload_ms': None,
+                'max_reload_ms': None,
+                'last_error': None
+            }
+            for target in TARGETS
+        }
+        self._fingerprints = {target: self._fingerprint(target) for target in TARGETS}
+        self._reload_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watched_files(self, target: str) -> List[Path]:
+        """Returns the files whose changes trigger a reload of a target."""
+        if target == 'secrets':
+            return [self.inventory.secrets_file] if self.inventory.secrets_file else []
+        configs_dir = self.inventory.configs_dir
+        files = [configs_dir.parent / name for name in ("supported_models.yaml", "rate_limits.yaml", "routing.yaml")]
+        if configs_dir.is_dir():
+            files.extend(sorted(configs_dir.glob("*.yaml")))
+        return files
+
+    def _fingerprint(self, target: str) -> Fingerprint:
+        fingerprint = []
+        for path in self.watched_files(target):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    def reload(self, target: str) -> Dict[str, Any]:
+        """
+        Reloads a target now and records how long it took.
+
+        Args:
+            target: 'models' or 'secrets'.
+
+        Returns:
+            The reload statistics of the target.
+
+        Raises:
+            ValueError: If the target is unknown.
+            Exception: Whatever made the new version invalid; the current one stays in place.
+        """
+        if target not in self._reloaders:
+            raise ValueError(f"Unknown reload target '{target}'; expected one of {TARGETS}")
+        with self._reload_lock:
+            fingerprint = self._fingerprint(target)
+            start_time = time.perf_counter()
+            try:
+                items = self._reloaders[target]()
+            except Exception as e:
+                self._record(target, start_time, error=e)
+                raise
+            finally:
+                self._fingerprints[target] = fingerprint
+            self._record(target, start_time, items=items)
+            return self.stats()[target]
+
+    def _record(self, target: str, start_time: float, items: Optional[int] = None, error: Optional[Exception] = None) -> None:
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        with self._stats_lock:
+            stats = self._stats[target]
+            stats['last_reload_at'] = time.time()
+            stats['last_reload_ms'] = elapsed_ms
+            stats['max_reload_ms'] = max(stats['max_reload_ms'] or 0.0, elapsed_ms)
+            if error is None:
+                stats['reloads'] += 1
+                stats['items'] = items
+                stats['last_error'] = None
+            else:
+                stats['failures'] += 1
+                stats['last_error'] = f"{type(error).__name__}: {error}"
+
+    def check(self) -> List[str]:
+        """
+        Reloads the targets whose files changed since they were last loaded.
+
+        Returns:
+            The targets that were reloaded successfully.
+        """
+        reloaded = []
+        for target in TARGETS:
+            if self._fingerprint(target) == self._fingerprints[target]:
+                continue
+            try:
+                self.reload(target)
+            except Exception as e:
+                print(f"Warning: Could not reload {target}; keeping the current version. {e}")
+                continue
+            reloaded.append(target)
+        return reloaded
+
+    def start(self) -> None:
+        """Starts polling on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="llminventory-config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops polling and waits for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the reload count, failures, latency and last error of each target."""
+        with self._stats_lock:
+            return {target: dict(stats) for target, stats in self._stats.items()}
@@ -0,0 +1,165 @@
+"""A per-text embedding cache stored as memory-mapped float32 arrays on disk."""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .lazy_imports import LazyModule, ensure_imported
+
+# Imported by the first EmbeddingCache: numpy is only required when one is used
+np = LazyModule('numpy', "EmbeddingCache requires numpy. Install it with: pip install numpy")
+
+# Size of the per-text digest stored in the keys file
+_DIGEST_SIZE = 16
+
+class _Namespace:
+    """The on-disk store of one namespace: a keys file and a vectors file with aligned rows."""
+
+    def __init__(self, directory: Path, name: str):
+        self.keys_path = directory / f"{name}.keys"
+        self.vectors_path = directory / f"{name}.f32"
+        self.meta_path = directory / f"{name}.json"
+        self.dim: Optional[int] = None
+        self.rows: Dict[bytes, int] = {}
+        self._keys_size = 0
+        self._vectors = None
+        if self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text(encoding='utf-8'))['dim']
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Picks up rows appended since the last refresh, including by other processes."""
+        if self.dim is None or not self.keys_path.exists():
+            return
+        keys_size = self.keys_path.stat().st_size
+        if keys_size == self._keys_size:
+            return
+        # Only trust rows whose vector has been fully written
+        vector_rows = self.vectors_path.stat().st_size // (4 * self.dim)
+        with open(self.keys_path, 'rb') as f:
+            f.seek(self._keys_size)
+            data = f.read(keys_size - self._keys_size)
+        row = self._keys_size // _DIGEST_SIZE
+        for offset in range(0, len(data) - _DIGEST_SIZE + 1, _DIGEST_SIZE):
+            if row >= vector_rows:
+                break
+            self.rows.setdefault(data[offset:offset + _DIGEST_SIZE], row)
+            row += 1
+        self._keys_size = row * _DIGEST_SIZE
+        self._vectors = None
+
+    def vectors(self) -> "np.ndarray":
+        """Returns a read-only memory map over the stored vectors."""
+        if self._vectors is None:
+            rows = self._keys_size // _DIGEST_SIZE
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+        return self._vectors
+
+    def append(self, digests: List[bytes], vectors: "np.ndarray") -> None:
+        """Appends rows, writing vectors before keys so keys never point past the data."""
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            self.meta_path.write_text(json.dumps({'dim': self.dim}), encoding='utf-8')
+        with open(self.vectors_path, 'ab') as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self.keys_path, 'ab') as f:
+            f.write(b''.join(digests))
+        self.refresh()
+
+class EmbeddingCache:
+    """
+    Caches embeddings per input text, so re-indexing only embeds new or changed texts.
+
+    Each namespace (an embedding model and its parameters) is stored as two
+    append-only files: 16-byte text digests and the matching float32 vectors,
+    which are memory-mapped for lookups. Rows appended by other processes are
+    picked up on the next lookup; concurrent writers should use separate
+    directories, as appends are only serialized within a process.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initializes the cache.
+
+        Args:
+            cache_dir: The directory holding the cache files; created if missing.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        ensure_imported(np)
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=_DIGEST_SIZE).digest()
+
+    def _namespace(self, namespace: str) -> _Namespace:
+        store = self._namespaces.get(namespace)
+        if store is None:
+            name = hashlib.sha256(namespace.encode('utf-8')).hexdigest()[:32]
+            store = self._namespaces[namespace] = _Namespace(self.cache_dir, name)
+        return store
+
+    def lookup(self, namespace: str, texts: Sequence[str]) -> Tuple[List[Optional["np.ndarray"]], List[int]]:
+        """
+        Looks up the embedding of each text.
+
+        Args:
+            namespace: The namespace of the embedding model and its parameters.
+            texts: The input texts.
+
+        Returns:
+            A list with the cached vector or None for each text, and the indices of
+            the texts that were not cached.
+        """
+        with self._lock:
+            store = self._namespace(namespace)
+            store.refresh()
+            rows = [store.rows.get(self._digest(text)) for text in texts]
+            vectors = store.vectors() if any(row is not None for row in rows) else None
+            found = [np.array(vectors[row]) if row is not None else None for row in rows]
+            missing = [index for index, row in enumerate(rows) if row is None]
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        return found, missing
+
+    def store(self, namespace: str, texts: Sequence[str], vectors: "np.ndarray") -> None:
+        """
+        Stores the embeddings of texts.
+
+        Args:
+            namespace: The namespace of the embedding model and its parameters.
+            texts: The input texts.
+            vectors: A (len(texts), dim) array of their embeddings.
+        """
+        with self._lock:
+            store = self._namespace(namespace)
+            store.refresh()
+            digests: List[bytes] = []
+            new_rows: List[int] = []
+            batch = set()
+            for index, text in enumerate(texts):
+                digest = self._digest(text)
+                if digest not in store.rows and digest not in batch:
+                    batch.add(digest)
+                    digests.append(digest)
+                    new_rows.append(index)
+            if digests:
+                store.append(digests, np.asarray(vectors, dtype=np.float32)[new_rows])
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters over individual texts."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,54 @@
+"""Fallback across functionally equivalent models of different providers."""
+
+from typing import Dict, Any, List
+
+from .circuit_breaker import CircuitOpenError, is_provider_failure
+from .rate_limiter import RateLimitExceeded
+
+def should_fall_back(error: BaseException) -> bool:
+    """
+    Returns whether a failed call should move on to the next model of a chain.
+
+    Timeouts, connection errors, 429 and 5xx responses, open circuits and
+    exhausted rate limits fall back; client errors such as invalid parameters
+    are raised, as every model of the chain would reject them too.
+    """
+    return isinstance(error, (CircuitOpenError, RateLimitExceeded)) or is_provider_failure(error)
+
+def contents_to_messages(contents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Converts Gemini 'contents' into OpenAI-style 'messages'.
+
+    Only text parts are carried over; Gemini's 'model' role becomes 'assistant'.
+    """
+    messages = []
+    for content in contents:
+        role = content.get('role', 'user')
+        text = ''.join(part.get('text', '') for part in content.get('parts', []))
+        messages.append({'role': 'assistant' if role == 'model' else role, 'content': text})
+    return messages
+
+def translate_payload(payload: Dict[str, Any], model_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rewrites a payload into the conversation format a model requires.
+
+    Args:
+        payload: The request payload, with 'messages' or 'contents'.
+        model_config: The configuration of the target model.
+
+    Returns:
+        The payload with 'messages' converted to 'contents' or the reverse, or the
+        payload unchanged if it already has the required fields.
+    """
+    required_fields = model_config.get('required_fields', [])
+    if 'contents' in required_fields and 'contents' not in payload and 'messages' in payload:
+        # Imported here: the adapter module loads requests and httpx, which most processes never need for this
+        from .adapters.google_adapter import GoogleAdapter
+        translated = {key: value for key, value in payload.items() if key != 'messages'}
+        translated['contents'] = GoogleAdapter._convert_payload({'messages': payload['messages']})['contents']
+        return translated
+    if 'messages' in required_fields and 'messages' not in payload and 'contents' in payload:
+        translated = {key: value for key, value in payload.items() if key != 'contents'}
+        translated['messages'] = contents_to_messages(payload['contents'])
+        return translated
+    return payload
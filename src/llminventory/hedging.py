@@ -0,0 +1,161 @@
+"""Hedged requests: a duplicate request when the first one is slower than usual."""
+
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from .latency import LatencyTracker
+
+T = TypeVar('T')
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    When a hedge is sent.
+
+    The hedge fires once the primary call has run longer than the given
+    percentile of the model's recent latency. Each hedgeable request earns
+    max_hedge_rate of a hedge credit (up to max_burst credits), and each hedge
+    spends one, so at most that share of requests is duplicated.
+    """
+    percentile: float = 0.95
+    min_delay: float = 0.05
+    fallback_delay: Optional[float] = None
+    max_hedge_rate: float = 0.1
+    max_burst: float = 10.0
+
+class Hedger:
+    """Runs calls with a hedge and keeps the hedge budget and win counters."""
+
+    def __init__(self, latency: LatencyTracker, policy: Optional[HedgePolicy] = None, max_workers: int = 32):
+        """
+        Initializes the hedger.
+
+        Args:
+            latency: The tracker the hedge delay is derived from.
+            policy: The hedge policy; defaults to HedgePolicy().
+            max_workers: The size of the thread pool running synchronous hedged calls.
+        """
+        self.latency = latency
+        self.policy = policy or HedgePolicy()
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+        self._credits = 1.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def delay(self, provider: str, model: str) -> Optional[float]:
+        """Returns how long to wait for the primary call before hedging, or None to not hedge."""
+        delay = self.latency.percentile(provider, model, self.policy.percentile)
+        if delay is None:
+            delay = self.policy.fallback_delay
+        return None if delay is None else max(delay, self.policy.min_delay)
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._credits = min(self.policy.max_burst, self._credits + self.policy.max_hedge_rate)
+
+    def _take_budget(self) -> bool:
+        """Spends a hedge credit, if one is available."""
+        with self._lock:
+            if self._credits < 1.0:
+                self.budget_denied += 1
+                return False
+            self._credits -= 1.0
+            self.hedges += 1
+            return True
+
+    def _record_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llminventory-hedge")
+            return self._executor
+
+    def call(self, provider: str, model: str, primary: Callable[[], T], hedge: Callable[[], T]) -> T:
+        """
+        Runs primary, and hedge as well if primary is slower than the hedge delay.
+
+        The first successful result is returned. A synchronous loser cannot be
+        interrupted mid-request; it is left to finish in the background and its
+        result is discarded.
+
+        Raises:
+            Exception: The primary's error if both calls fail.
+        """
+        self._count_request()
+        delay = self.delay(provider, model)
+        if delay is None:
+            return primary()
+
+        executor = self._get_executor()
+        first = executor.submit(primary)
+        try:
+            return first.result(timeout=delay)
+        except FuturesTimeoutError:
+            pass
+        if not self._take_budget():
+            return first.result()
+
+        second = executor.submit(hedge)
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (first, second):
+                if future in done and future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is second:
+                        self._record_win()
+                    return future.result()
+        raise first.exception()
+
+    async def acall(self, provider: str, model: str, primary: Callable[[], Awaitable[T]], hedge: Callable[[], Awaitable[T]]) -> T:
+        """Async counterpart of call(); the losing request is cancelled."""
+        self._count_request()
+        delay = self.delay(provider, model)
+        if delay is None:
+            return await primary()
+
+        first = asyncio.ensure_future(primary())
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._take_budget():
+                return await first
+
+            second = asyncio.ensure_future(hedge())
+            tasks.add(second)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (first, second):
+                    if task in done and task.exception() is None:
+                        if task is second:
+                            self._record_win()
+                        return task.result()
+            raise first.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns how many requests were hedged, how often the hedge won, and budget denials."""
+        return {
+            'requests': self.requests,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'hedge_rate': self.hedges / self.requests if self.requests else 0.0,
+            'win_rate': self.hedge_wins / self.hedges if self.hedges else 0.0,
+            'budget_denied': self.budget_denied
+        }
@@ -2,12 +2,37 @@
 Provides a high-level programmatic interface for the LLMInventory.
 """
 
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Union, Iterable, Iterator, AsyncIterator, Awaitable, Callable, TypeVar
 
 from .secret_manager import SecretManager
 from .model_config_manager import ModelConfigManager
+from .model_registry import mutable_config
 from .adapters import get_adapter
+from .batch import InvocationJob, InvocationRequest, InvocationResult
+from .cache import ResponseCache, make_cache_key
+from .semantic_cache import SemanticCache, prompt_text
+from .embedding_cache import EmbeddingCache
+from .rate_limiter import RateLimiter, estimate_tokens
+from .circuit_breaker import CircuitBreakerRegistry
+from .fallback import should_fall_back, translate_payload
+from .latency import LatencyTracker
+from .hedging import Hedger, HedgePolicy
+from .router import AUTO_MODEL, ModelRouter, RouteConstraints
+from .key_pool import KeyPool, PooledKey
+from .concurrency import AdaptiveLimit, ConcurrencyLimiter
+from .singleflight import SingleFlight, is_deterministic
+
+if TYPE_CHECKING:
+    # Imported on first use by get_adapter(); it loads requests and httpx
+    from .adapters import BaseAdapter
+
+T = TypeVar('T')
 
 class LLMInventory:
     """A class providing a direct, function-call interface to the LLM inventory."""
@@ -15,7 +40,15 @@ class LLMInventory:
     def __init__(
         self,
         configs_dir: Path,
-        secrets_file: Optional[Path] = None
+        secrets_file: Optional[Path] = None,
+        response_cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        lazy_configs: bool = True
     ):
         """
         Initializes the LLMInventory.
@@ -23,9 +56,48 @@ class LLMInventory:
         Args:
             configs_dir: The path to the directory containing model YAML configs.
             secrets_file: The path to the YAML file containing API secrets.
+            response_cache: Optional cache for responses to identical requests. Caching
+                is opt-in per call (use_cache) or per model ('cache: true' in its config).
+            semantic_cache: Optional cache that reuses responses to near-duplicate prompts.
+                It is opt-in per call (use_semantic_cache) or per model ('semantic_cache: true').
+            embedding_cache: Optional per-text cache used by embed() and aembed().
+            rate_limiter: Optional limiter for requests sent to providers. Defaults to one
+                built from the 'rate_limits' in the model configs.
+            circuit_breakers: Optional circuit breakers per model, which fail fast while a
+                model is unhealthy. Defaults to breakers with default settings.
+            hedge_policy: Optional policy for hedged requests (invoke with hedge=...).
+                Defaults to HedgePolicy().
+            concurrency_limiter: Optional adaptive limits on the requests in flight to
+                each provider. Defaults to limits with default settings.
+            lazy_configs: Whether per-model parameter validators are compiled on the
+                first request to each model instead of at startup. Adapters and
+                their HTTP clients are always imported on first use.
         """
-        self.model_config_manager = ModelConfigManager(configs_dir)
+        self.configs_dir = configs_dir
+        self.secrets_file = secrets_file
+        self.model_config_manager = ModelConfigManager(configs_dir, lazy=lazy_configs)
         self.secret_manager = SecretManager()
+        self.response_cache = response_cache
+        self.semantic_cache = semantic_cache
+        self.embedding_cache = embedding_cache
+        # A limiter built here follows the provider rate limits of reloaded configs
+        self._rate_limits_from_configs = rate_limiter is None
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(self.model_config_manager.provider_rate_limits)
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers if circuit_breakers is not None else CircuitBreakerRegistry()
+        self.concurrency_limiter = concurrency_limiter if concurrency_limiter is not None else ConcurrencyLimiter()
+        self.latency = LatencyTracker()
+        self.hedger = Hedger(self.latency, hedge_policy)
+        self.single_flight = SingleFlight()
+        self.router = ModelRouter(self.model_config_manager.registry, self.latency, self.circuit_breakers)
+
+        # Adapter instances keyed by (provider, api_key) and key pools per provider,
+        # valid for one secrets version
+        self._adapters: Dict[Tuple[str, str, Optional[str], Optional[str]], "BaseAdapter"] = {}
+        self._key_pools: Dict[str, KeyPool] = {}
+        self._adapters_lock = threading.Lock()
+        self._adapters_secrets_version = -1
         if secrets_file and secrets_file.is_file():
             self.secret_manager.load_secrets(secrets_file)
         elif secrets_file:
@@ -33,40 +105,728 @@ class LLMInventory:
 
     def get_supported_models(self) -> List[Dict[str, Any]]:
         """
-        Returns a list of all supported models and their configurations.
+        Returns a list of all supported models and their configurations, ordered by 'provider/model'.
+
+        Use model_config_manager.registry.find_models() to query models by
+        capability, provider, price or context window. The returned dicts are
+        copies, which the caller may modify.
         """
-        all_model_names = self.model_config_manager.get_all_model_names()
-        model_details = []
-        for name in sorted(all_model_names):
-            provider, model_name = name.split('/', 1)
-            config = self.model_config_manager.get_model_config(provider, model_name)
-            if config:
-                model_details.append(config)
-        return model_details
+        return [mutable_config(config) for config in self.model_config_manager.registry.all()]
+
+    def reload_models(self) -> int:
+        """
+        Loads the model configs again and swaps them in.
+
+        The new configs are parsed and validated (including their parameter
+        validators and registry) before anything changes; then the config
+        manager, the router and the provider rate limits are replaced by
+        single assignments. Requests never wait for a reload: those already
+        running finish with the configs they started with.
+
+        Returns:
+            The number of models loaded.
+
+        Raises:
+            ValueError: If supported_models.yaml cannot be parsed or no model is defined;
+                the current configs stay in place.
+        """
+        # Compiled eagerly, so that a config the validators reject fails the reload rather than a request
+        manager = ModelConfigManager(self.configs_dir, strict=True, lazy=False)
+        if not manager.get_all_model_names():
+            raise ValueError("The reloaded configs define no models")
+        router = ModelRouter(manager.registry, self.latency, self.circuit_breakers)
+        if self._rate_limits_from_configs:
+            self.rate_limiter.provider_limits = dict(manager.provider_rate_limits)
+        self.model_config_manager = manager
+        self.router = router
+        return len(manager.get_all_model_names())
+
+    def reload_secrets(self) -> int:
+        """
+        Loads the secrets file again and swaps the secrets in.
+
+        Adapters and key pools are rebuilt from the new secrets on their next
+        use; adapters share the pooled connections of their provider, so the
+        pools stay warm.
+
+        Returns:
+            The number of providers with secrets.
+
+        Raises:
+            FileNotFoundError: If there is no secrets file.
+            yaml.YAMLError, ValueError: If the file is invalid; the current secrets stay in place.
+        """
+        if self.secrets_file is None:
+            raise FileNotFoundError("The inventory was created without a secrets file")
+        self.secret_manager.load_secrets(self.secrets_file)
+        return len(self.secret_manager.providers())
 
     def invoke(
         self,
-        provider: str,
+        provider: Optional[str],
         model: str,
         payload: Dict[str, Any],
-        parameters: Optional[Dict[str, Any]] = None
+        parameters: Optional[Dict[str, Any]] = None,
+        use_cache: Optional[bool] = None,
+        use_semantic_cache: Optional[bool] = None,
+        hedge: Union[bool, Tuple[str, str]] = False,
+        constraints: Optional[RouteConstraints] = None,
+        coalesce: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Sends a request to a specified model and returns the provider's response.
 
         Args:
-            provider: The name of the provider (e.g., 'openai').
-            model: The specific model name (e.g., 'gpt-4-turbo').
+            provider: The name of the provider (e.g., 'openai'), or None to invoke a
+                model alias from routing.yaml, falling back along its chain, or
+                model 'auto' to let the router pick models.
+            model: The specific model name (e.g., 'gpt-4-turbo'), an alias, or 'auto'.
+            payload: The main request payload, containing required fields like 'messages'.
+            parameters: Optional model parameters to override defaults.
+            use_cache: Whether to serve and store the response through the response
+                cache. Defaults to the model's 'cache' setting.
+            use_semantic_cache: Whether to reuse responses to near-duplicate prompts through
+                the semantic cache. Defaults to the model's 'semantic_cache' setting.
+            hedge: Whether to send a second request if the first one is slower than
+                the model's usual latency, returning whichever answers first: True to
+                repeat it to the same model, or a (provider, model) tuple for an
+                alternate model. See HedgePolicy for the delay and budget.
+            constraints: The requirements a model picked for 'auto' must meet; defaults
+                to RouteConstraints().
+            coalesce: Whether concurrent identical requests share one provider call.
+                Defaults to sharing when the response may be cached or the sampling
+                is deterministic (temperature 0 or a seed).
+
+        Returns:
+            The JSON response from the provider's API as a dictionary. Responses to an
+            alias or 'auto', or from an alternate hedge model, carry the model that
+            answered under '_route'.
+
+        Raises:
+            KeyError: If the model is not found or the API key is missing.
+            ValueError: If required fields are missing, parameters are invalid or no
+                model satisfies the routing constraints.
+            ConnectionError: If the request to the provider API fails, or CircuitOpenError
+                while the model's circuit is open.
+            RateLimitExceeded: If rate limits do not admit the request within the limiter's max_wait.
+        """
+        if provider is None:
+            chain = self._route_chain(model, payload, parameters, constraints)
+            return self._invoke_chain(chain, payload, parameters, use_cache, use_semantic_cache, hedge, coalesce)
+        model_config, final_params = self._prepare_invocation(provider, model, payload, parameters)
+        cache_key = self._get_cache_key(provider, model, model_config, payload, final_params, use_cache)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        semantic_namespace = self._get_semantic_namespace(provider, model, model_config, final_params, use_semantic_cache)
+        prompt_vector = None
+        if semantic_namespace is not None:
+            prompt_vector = self._embed_prompt(payload)
+            if prompt_vector is not None:
+                cached = self.semantic_cache.lookup(semantic_namespace, prompt_vector)
+                if cached is not None:
+                    return cached
+
+        tokens = estimate_tokens(payload, final_params)
+
+        def send() -> Dict[str, Any]:
+            return self._call_provider(model_config, tokens, lambda adapter: adapter.invoke(model_config, payload, final_params))
+
+        def call() -> Dict[str, Any]:
+            if hedge:
+                response = self.hedger.call(provider, model, send, self._hedge_call(hedge, send, payload, parameters))
+            else:
+                response = send()
+            self.rate_limiter.record_usage(provider, model_config, tokens, response)
+            return response
+
+        flight_key = self._get_flight_key(provider, model, payload, final_params, cache_key, coalesce)
+        response = self.single_flight.do(flight_key, call) if flight_key is not None else call()
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+        if prompt_vector is not None:
+            self.semantic_cache.add(semantic_namespace, prompt_vector, response)
+        return response
+
+    async def ainvoke(
+        self,
+        provider: Optional[str],
+        model: str,
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]] = None,
+        use_cache: Optional[bool] = None,
+        use_semantic_cache: Optional[bool] = None,
+        hedge: Union[bool, Tuple[str, str]] = False,
+        constraints: Optional[RouteConstraints] = None,
+        coalesce: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously sends a request to a specified model and returns the provider's response.
+
+        This is the non-blocking counterpart of invoke() for use inside an event loop.
+
+        Args:
+            provider: The name of the provider (e.g., 'openai'), or None to invoke a
+                model alias from routing.yaml, falling back along its chain, or
+                model 'auto' to let the router pick models.
+            model: The specific model name (e.g., 'gpt-4-turbo'), an alias, or 'auto'.
             payload: The main request payload, containing required fields like 'messages'.
             parameters: Optional model parameters to override defaults.
+            use_cache: Whether to serve and store the response through the response
+                cache. Defaults to the model's 'cache' setting.
+            use_semantic_cache: Whether to reuse responses to near-duplicate prompts through
+                the semantic cache. Defaults to the model's 'semantic_cache' setting.
+            hedge: Whether to send a second request if the first one is slower than
+                the model's usual latency, returning whichever answers first: True to
+                repeat it to the same model, or a (provider, model) tuple for an
+                alternate model. See HedgePolicy for the delay and budget.
+            constraints: The requirements a model picked for 'auto' must meet; defaults
+                to RouteConstraints().
+            coalesce: Whether concurrent identical requests share one provider call.
+                Defaults to sharing when the response may be cached or the sampling
+                is deterministic (temperature 0 or a seed).
+
+        Returns:
+            The JSON response from the provider's API as a dictionary. Responses to an
+            alias or 'auto', or from an alternate hedge model, carry the model that
+            answered under '_route'.
+
+        Raises:
+            KeyError: If the model is not found or the API key is missing.
+            ValueError: If required fields are missing, parameters are invalid or no
+                model satisfies the routing constraints.
+            ConnectionError: If the request to the provider API fails, or CircuitOpenError
+                while the model's circuit is open.
+            RateLimitExceeded: If rate limits do not admit the request within the limiter's max_wait.
+        """
+        if provider is None:
+            chain = self._route_chain(model, payload, parameters, constraints)
+            return await self._ainvoke_chain(chain, payload, parameters, use_cache, use_semantic_cache, hedge, coalesce)
+        model_config, final_params = self._prepare_invocation(provider, model, payload, parameters)
+        cache_key = self._get_cache_key(provider, model, model_config, payload, final_params, use_cache)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        semantic_namespace = self._get_semantic_namespace(provider, model, model_config, final_params, use_semantic_cache)
+        prompt_vector = None
+        if semantic_namespace is not None:
+            prompt_vector = await self._aembed_prompt(payload)
+            if prompt_vector is not None:
+                cached = self.semantic_cache.lookup(semantic_namespace, prompt_vector)
+                if cached is not None:
+                    return cached
+
+        tokens = estimate_tokens(payload, final_params)
+
+        async def send() -> Dict[str, Any]:
+            return await self._acall_provider(model_config, tokens, lambda adapter: adapter.ainvoke(model_config, payload, final_params))
+
+        async def call() -> Dict[str, Any]:
+            if hedge:
+                response = await self.hedger.acall(provider, model, send, self._ahedge_call(hedge, send, payload, parameters))
+            else:
+                response = await send()
+            self.rate_limiter.record_usage(provider, model_config, tokens, response)
+            return response
+
+        flight_key = self._get_flight_key(provider, model, payload, final_params, cache_key, coalesce)
+        response = await self.single_flight.ado(flight_key, call) if flight_key is not None else await call()
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+        if prompt_vector is not None:
+            self.semantic_cache.add(semantic_namespace, prompt_vector, response)
+        return response
+
+    def _route_chain(
+        self,
+        model: str,
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]],
+        constraints: Optional[RouteConstraints]
+    ) -> List[Tuple[str, str]]:
+        """
+        Returns the models to try for an alias or 'auto', in order.
+
+        Raises:
+            KeyError: If the alias is not defined.
+            ValueError: If no model satisfies the routing constraints.
+        """
+        if model == AUTO_MODEL:
+            return self.router.route(payload, parameters, constraints)
+        chain = self.model_config_manager.get_alias_chain(model)
+        if not chain:
+            raise KeyError(f"Model alias not found: {model}")
+        return chain
+
+    def _fall_back(self, chain: List[Tuple[str, str]], index: int, error: Exception) -> None:
+        """Re-raises an error unless the next model of the chain should be tried."""
+        if index == len(chain) - 1 or not should_fall_back(error):
+            raise error
+        provider, model = chain[index]
+        next_provider, next_model = chain[index + 1]
+        print(f"Warning: {provider}/{model} failed ({error}); falling back to {next_provider}/{next_model}")
+
+    @staticmethod
+    def _routed(response: Dict[str, Any], provider: str, model: str, **details: Any) -> Dict[str, Any]:
+        """Adds the model that answered a routed request to a copy of its response."""
+        return {**response, '_route': {'provider': provider, 'model': model, **details}}
+
+    def _invoke_chain(
+        self,
+        chain: List[Tuple[str, str]],
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]],
+        use_cache: Optional[bool],
+        use_semantic_cache: Optional[bool],
+        hedge: Union[bool, Tuple[str, str]],
+        coalesce: Optional[bool]
+    ) -> Dict[str, Any]:
+        """Invokes the models of a chain in order until one answers."""
+        for index, (provider, model) in enumerate(chain):
+            model_config = self.model_config_manager.get_model_config(provider, model)
+            try:
+                response = self.invoke(
+                    provider, model, translate_payload(payload, model_config), parameters, use_cache, use_semantic_cache, hedge, coalesce
+                )
+            except Exception as e:
+                self._fall_back(chain, index, e)
+                continue
+            return self._routed(response, provider, model, fallbacks=index)
+
+    async def _ainvoke_chain(
+        self,
+        chain: List[Tuple[str, str]],
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]],
+        use_cache: Optional[bool],
+        use_semantic_cache: Optional[bool],
+        hedge: Union[bool, Tuple[str, str]],
+        coalesce: Optional[bool]
+    ) -> Dict[str, Any]:
+        """Async counterpart of _invoke_chain()."""
+        for index, (provider, model) in enumerate(chain):
+            model_config = self.model_config_manager.get_model_config(provider, model)
+            try:
+                response = await self.ainvoke(
+                    provider, model, translate_payload(payload, model_config), parameters, use_cache, use_semantic_cache, hedge, coalesce
+                )
+            except Exception as e:
+                self._fall_back(chain, index, e)
+                continue
+            return self._routed(response, provider, model, fallbacks=index)
+
+    def _stream_chain(
+        self,
+        chain: List[Tuple[str, str]],
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Streams from the models of a chain in order, falling back until one yields its first chunk."""
+        for index, (provider, model) in enumerate(chain):
+            model_config = self.model_config_manager.get_model_config(provider, model)
+            started = False
+            chunks = None
+            try:
+                chunks = self.invoke_stream(provider, model, translate_payload(payload, model_config), parameters)
+                for chunk in chunks:
+                    if not started:
+                        started = True
+                        chunk = self._routed(chunk, provider, model, fallbacks=index)
+                    yield chunk
+            except Exception as e:
+                # Output already sent cannot be taken back, so only a stream that has not started falls back
+                if started:
+                    raise
+                self._fall_back(chain, index, e)
+                continue
+            finally:
+                if chunks is not None:
+                    chunks.close()
+            return
+
+    async def _astream_chain(
+        self,
+        chain: List[Tuple[str, str]],
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async counterpart of _stream_chain()."""
+        for index, (provider, model) in enumerate(chain):
+            model_config = self.model_config_manager.get_model_config(provider, model)
+            started = False
+            chunks = None
+            try:
+                chunks = self.ainvoke_stream(provider, model, translate_payload(payload, model_config), parameters)
+                async for chunk in chunks:
+                    if not started:
+                        started = True
+                        chunk = self._routed(chunk, provider, model, fallbacks=index)
+                    yield chunk
+            except Exception as e:
+                if started:
+                    raise
+                self._fall_back(chain, index, e)
+                continue
+            finally:
+                if chunks is not None:
+                    await chunks.aclose()
+            return
+
+    def _hedge_alternate(
+        self,
+        hedge: Union[bool, Tuple[str, str]],
+        payload: Dict[str, Any]
+    ) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Returns the alternate model of a hedge and the payload translated for it, or None to repeat the request.
+
+        Raises:
+            KeyError: If the alternate model is not found.
+        """
+        if hedge is True:
+            return None
+        provider, model = hedge
+        model_config = self.model_config_manager.get_model_config(provider, model)
+        if not model_config:
+            raise KeyError(f"Model not found: {provider}/{model}")
+        return provider, model, translate_payload(payload, model_config)
+
+    def _hedge_call(
+        self,
+        hedge: Union[bool, Tuple[str, str]],
+        send: Callable[[], Dict[str, Any]],
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]]
+    ) -> Callable[[], Dict[str, Any]]:
+        """Returns the call a hedge makes: send itself, or the request to the alternate model."""
+        alternate = self._hedge_alternate(hedge, payload)
+        if alternate is None:
+            return send
+        provider, model, alternate_payload = alternate
+        return lambda: self._routed(self.invoke(provider, model, alternate_payload, parameters), provider, model, hedged=True)
+
+    def _ahedge_call(
+        self,
+        hedge: Union[bool, Tuple[str, str]],
+        send: Callable[[], Awaitable[Dict[str, Any]]],
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]]
+    ) -> Callable[[], Awaitable[Dict[str, Any]]]:
+        """Async counterpart of _hedge_call()."""
+        alternate = self._hedge_alternate(hedge, payload)
+        if alternate is None:
+            return send
+        provider, model, alternate_payload = alternate
+
+        async def send_alternate() -> Dict[str, Any]:
+            response = await self.ainvoke(provider, model, alternate_payload, parameters)
+            return self._routed(response, provider, model, hedged=True)
+        return send_alternate
+
+    def embed(
+        self,
+        provider: str,
+        model: str,
+        texts: List[str],
+        parameters: Optional[Dict[str, Any]] = None,
+        max_concurrency: int = 4
+    ) -> Any:
+        """
+        Embeds a list of texts and returns their vectors as one float32 matrix.
+
+        Texts are sent through the provider's batch API (Gemini batchEmbedContents,
+        OpenAI/Mistral /embeddings arrays) in chunks of the provider's batch limit,
+        with several chunks in flight at once. When an embedding cache is
+        configured, each text is looked up individually and only the misses are
+        sent to the provider.
+
+        Args:
+            provider: The name of the provider (e.g., 'google').
+            model: An embedding model (e.g., 'text-embedding-004').
+            texts: The texts to embed.
+            parameters: Optional model parameters to override defaults.
+            max_concurrency: The maximum number of chunk requests in flight.
 
         Returns:
-            The JSON response from the provider's API as a dictionary.
+            A numpy array of shape (len(texts), dimensions), rows in input order.
 
         Raises:
             KeyError: If the model is not found or the API key is missing.
+            ValueError: If the model is not an embedding model or parameters are invalid.
+            ConnectionError: If the request to the provider API fails, or CircuitOpenError
+                while the model's circuit is open.
+            RateLimitExceeded: If rate limits do not admit the request within the limiter's max_wait.
+        """
+        model_config, final_params, namespace = self._prepare_embedding(provider, model, parameters)
+        texts = list(texts)
+        vectors, missing = self._lookup_embeddings(namespace, texts)
+        fetched: List[List[float]] = []
+        if missing:
+            adapter = self._get_adapter(provider)
+            fetched = self._fetch_embeddings(adapter, model_config, [texts[index] for index in missing], final_params, max_concurrency)
+        return self._merge_embeddings(namespace, texts, vectors, missing, fetched)
+
+    async def aembed(
+        self,
+        provider: str,
+        model: str,
+        texts: List[str],
+        parameters: Optional[Dict[str, Any]] = None,
+        max_concurrency: int = 4
+    ) -> Any:
+        """
+        Async counterpart of embed(), for use inside an event loop.
+
+        Returns:
+            A numpy array of shape (len(texts), dimensions), rows in input order.
+        """
+        model_config, final_params, namespace = self._prepare_embedding(provider, model, parameters)
+        texts = list(texts)
+        vectors, missing = self._lookup_embeddings(namespace, texts)
+        fetched: List[List[float]] = []
+        if missing:
+            adapter = self._get_adapter(provider)
+            fetched = await self._afetch_embeddings(adapter, model_config, [texts[index] for index in missing], final_params, max_concurrency)
+        return self._merge_embeddings(namespace, texts, vectors, missing, fetched)
+
+    def invoke_stream(
+        self,
+        provider: Optional[str],
+        model: str,
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]] = None,
+        constraints: Optional[RouteConstraints] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Sends a streaming request to a specified model and yields output as it is generated.
+
+        The request is validated before this method returns, so lookup and
+        validation errors are raised immediately rather than on first iteration.
+        For an alias or 'auto', the models of the chain are tried in order until
+        one produces its first chunk; once output has been yielded the stream
+        stays with that model, and later errors are raised.
+
+        Args:
+            provider: The name of the provider (e.g., 'openai'), or None to stream
+                from a model alias from routing.yaml or from model 'auto'.
+            model: The specific model name (e.g., 'gpt-4-turbo'), an alias, or 'auto'.
+            payload: The main request payload, containing required fields like 'messages'.
+            parameters: Optional model parameters to override defaults.
+            constraints: The requirements a model picked for 'auto' must meet; defaults
+                to RouteConstraints().
+
+        Returns:
+            An iterator of chunks of the form {'delta': str, 'finish_reason': Optional[str]}.
+            The first chunk of a stream from an alias or 'auto' also carries the model
+            that answered under '_route', as invoke() does.
+
+        Raises:
+            KeyError: If the model or alias is not found or the API key is missing.
+            ValueError: If required fields are missing, parameters are invalid or no
+                model satisfies the routing constraints. Models that cannot stream
+                raise it on first iteration.
+            ConnectionError: If the request to the provider API fails or the model's
+                circuit is open (raised while iterating).
+            RateLimitExceeded: If rate limits do not admit the request within the limiter's
+                max_wait (raised on first iteration).
+        """
+        if provider is None:
+            return self._stream_chain(self._route_chain(model, payload, parameters, constraints), payload, parameters)
+        model_config, final_params = self._prepare_invocation(provider, model, payload, parameters)
+        # Raise a missing API key now rather than on first iteration
+        self._get_key_pool(provider)
+        return self._guarded_stream(
+            model_config,
+            estimate_tokens(payload, final_params),
+            lambda adapter: adapter.invoke_stream(model_config, payload, final_params)
+        )
+
+    def ainvoke_stream(
+        self,
+        provider: Optional[str],
+        model: str,
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]] = None,
+        constraints: Optional[RouteConstraints] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async counterpart of invoke_stream(), for use inside an event loop.
+
+        Returns:
+            An async iterator of chunks of the form {'delta': str, 'finish_reason': Optional[str]}.
+
+        Raises:
+            KeyError: If the model or alias is not found or the API key is missing.
+            ValueError: If required fields are missing, parameters are invalid or no
+                model satisfies the routing constraints. Models that cannot stream
+                raise it on first iteration.
+            ConnectionError: If the request to the provider API fails or the model's
+                circuit is open (raised while iterating).
+            RateLimitExceeded: If rate limits do not admit the request within the limiter's
+                max_wait (raised on first iteration).
+        """
+        if provider is None:
+            return self._astream_chain(self._route_chain(model, payload, parameters, constraints), payload, parameters)
+        model_config, final_params = self._prepare_invocation(provider, model, payload, parameters)
+        # Raise a missing API key now rather than on first iteration
+        self._get_key_pool(provider)
+        return self._aguarded_stream(
+            model_config,
+            estimate_tokens(payload, final_params),
+            lambda adapter: adapter.ainvoke_stream(model_config, payload, final_params)
+        )
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Returns the health of the models used so far.
+
+        Returns:
+            A dict with the circuit breaker state of each 'provider/model'
+            (state, recent failure rate and latency, rejected calls), the
+            retry counters of each provider, latency percentiles of each
+            'provider/model', the hedged request counters, the adaptive
+            concurrency limit of each provider and the load and quarantine
+            state of each provider's API keys, and the counters of requests
+            that shared a call with an identical one in flight.
+        """
+        from .adapters import BaseAdapter
+        return {
+            'circuits': self.circuit_breakers.snapshot(),
+            'retries': BaseAdapter.retry_stats(),
+            'latency': self.latency.snapshot(),
+            'hedging': self.hedger.stats(),
+            'concurrency': self.concurrency_limiter.snapshot(),
+            'keys': {provider: pool.snapshot() for provider, pool in list(self._key_pools.items())},
+            'coalescing': self.single_flight.stats()
+        }
+
+    def invoke_many(
+        self,
+        requests: Iterable[InvocationJob],
+        max_concurrency: int = 8,
+        per_provider_limits: Optional[Dict[str, int]] = None,
+        ordered: bool = True
+    ) -> Iterator[InvocationResult]:
+        """
+        Invokes many models concurrently on a thread pool with bounded parallelism.
+
+        Errors are captured per item in the yielded results instead of being raised,
+        so one failing job does not abort the run.
+
+        Args:
+            requests: Jobs as (provider, model, payload[, parameters]) tuples or dicts
+                with the same keys.
+            max_concurrency: The maximum number of requests in flight overall.
+            per_provider_limits: Optional maximum in-flight requests per provider,
+                e.g. {'openai': 4}. Providers without an entry are only bounded
+                by max_concurrency.
+            ordered: If True, results are yielded in submission order; otherwise
+                they are yielded as soon as each job completes.
+
+        Returns:
+            An iterator of InvocationResult objects, one per job.
+
+        Raises:
+            ValueError: If a job is malformed or a concurrency limit is not positive.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        for provider, limit in (per_provider_limits or {}).items():
+            if limit < 1:
+                raise ValueError(f"Limit for provider '{provider}' must be at least 1")
+        jobs = [InvocationRequest.from_job(index, job) for index, job in enumerate(requests)]
+        return self._run_many(jobs, max_concurrency, per_provider_limits or {}, ordered)
+
+    def _run_many(
+        self,
+        jobs: List[InvocationRequest],
+        max_concurrency: int,
+        per_provider_limits: Dict[str, int],
+        ordered: bool
+    ) -> Iterator[InvocationResult]:
+        """
+        Schedules jobs so that neither the global nor a provider limit is exceeded.
+
+        Jobs wait in per-provider queues rather than blocking pool threads, so a
+        saturated provider never holds up work for the others.
+        """
+        pending: Dict[str, deque] = {}
+        for job in jobs:
+            pending.setdefault(job.provider, deque()).append(job)
+        in_flight_per_provider: Dict[str, int] = {provider: 0 for provider in pending}
+        in_flight: Dict[Future, InvocationRequest] = {}
+        completed: Dict[int, InvocationResult] = {}
+        next_index = 0
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llminventory")
+        try:
+            while pending or in_flight:
+                # Fill free slots, round-robin across providers with capacity
+                submitted = True
+                while submitted and len(in_flight) < max_concurrency:
+                    submitted = False
+                    for provider in list(pending):
+                        limit = per_provider_limits.get(provider)
+                        if limit is not None and in_flight_per_provider[provider] >= limit:
+                            continue
+                        job = pending[provider].popleft()
+                        if not pending[provider]:
+                            del pending[provider]
+                        in_flight[executor.submit(self._invoke_job, job)] = job
+                        in_flight_per_provider[provider] += 1
+                        submitted = True
+                        if len(in_flight) >= max_concurrency:
+                            break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    in_flight_per_provider[job.provider] -= 1
+                    result = future.result()
+                    if not ordered:
+                        yield result
+                    else:
+                        completed[result.index] = result
+
+                while next_index in completed:
+                    yield completed.pop(next_index)
+                    next_index += 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _invoke_job(self, job: InvocationRequest) -> InvocationResult:
+        """Runs one bulk job, capturing any error in the result."""
+        start_time = time.perf_counter()
+        result = InvocationResult(job.index, job.provider, job.model)
+        try:
+            result.response = self.invoke(job.provider, job.model, job.payload, job.parameters)
+        except Exception as e:
+            result.error = e
+        result.elapsed = time.perf_counter() - start_time
+        return result
+
+    def _prepare_invocation(
+        self,
+        provider: str,
+        model: str,
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Looks up the model config, validates the payload and merges parameters.
+
+        Returns:
+            A tuple of the model configuration and the final request parameters.
+
+        Raises:
+            KeyError: If the model is not found.
             ValueError: If required fields are missing or parameters are invalid.
-            ConnectionError: If the request to the provider API fails.
         """
         model_config = self.model_config_manager.get_model_config(provider, model)
         if not model_config:
@@ -90,13 +850,413 @@ class LLMInventory:
         final_params = self.model_config_manager.merge_and_validate_params(
             provider, model, parameters
         )
+        return model_config, final_params
+
+    def _get_cache_key(
+        self,
+        provider: str,
+        model: str,
+        model_config: Dict[str, Any],
+        payload: Dict[str, Any],
+        final_params: Dict[str, Any],
+        use_cache: Optional[bool]
+    ) -> Optional[str]:
+        """
+        Returns the response cache key for a request, or None if it should not be cached.
+
+        An explicit use_cache wins; otherwise the model's 'cache' setting decides.
+        """
+        if self.response_cache is None:
+            return None
+        if use_cache is None:
+            use_cache = bool(model_config.get('cache'))
+        if not use_cache:
+            return None
+        return make_cache_key(provider, model, payload, final_params)
+
+    def _get_flight_key(
+        self,
+        provider: str,
+        model: str,
+        payload: Dict[str, Any],
+        final_params: Dict[str, Any],
+        cache_key: Optional[str],
+        coalesce: Optional[bool]
+    ) -> Optional[str]:
+        """
+        Returns the key under which concurrent identical requests share a call, or None if they should not.
+
+        An explicit coalesce wins; otherwise requests share a call when their
+        response may be cached anyway or their sampling is deterministic.
+        """
+        if coalesce is None:
+            coalesce = cache_key is not None or is_deterministic(final_params)
+        if not coalesce:
+            return None
+        return cache_key or make_cache_key(provider, model, payload, final_params)
+
+    def _get_semantic_namespace(
+        self,
+        provider: str,
+        model: str,
+        model_config: Dict[str, Any],
+        final_params: Dict[str, Any],
+        use_semantic_cache: Optional[bool]
+    ) -> Optional[str]:
+        """
+        Returns the semantic cache namespace for a request, or None if it should not use it.
+
+        Responses are only shared between prompts sent to the same model with the
+        same parameters.
+        """
+        if self.semantic_cache is None:
+            return None
+        if use_semantic_cache is None:
+            use_semantic_cache = bool(model_config.get('semantic_cache'))
+        if not use_semantic_cache:
+            return None
+        return make_cache_key(provider, model, {}, final_params)
+
+    def _embed_prompt(self, payload: Dict[str, Any]) -> Optional[Any]:
+        """
+        Embeds the prompt of a payload with the semantic cache's embedding model.
+
+        Embedding failures are logged and disable the semantic cache for the request.
+        """
+        text = prompt_text(payload)
+        if not text:
+            return None
+        start_time = time.perf_counter()
+        try:
+            vectors = self.embed(self.semantic_cache.embedding_provider, self.semantic_cache.embedding_model, [text])
+        except Exception as e:
+            print(f"Warning: Could not embed prompt for the semantic cache: {e}")
+            return None
+        self.semantic_cache.record_embedding_time(time.perf_counter() - start_time)
+        return vectors[0]
+
+    async def _aembed_prompt(self, payload: Dict[str, Any]) -> Optional[Any]:
+        """Async counterpart of _embed_prompt()."""
+        text = prompt_text(payload)
+        if not text:
+            return None
+        start_time = time.perf_counter()
+        try:
+            vectors = await self.aembed(self.semantic_cache.embedding_provider, self.semantic_cache.embedding_model, [text])
+        except Exception as e:
+            print(f"Warning: Could not embed prompt for the semantic cache: {e}")
+            return None
+        self.semantic_cache.record_embedding_time(time.perf_counter() - start_time)
+        return vectors[0]
+
+    def _prepare_embedding(
+        self,
+        provider: str,
+        model: str,
+        parameters: Optional[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], str]:
+        """
+        Looks up an embedding model and merges its parameters.
+
+        Returns:
+            A tuple of the model configuration, the final parameters and the
+            embedding cache namespace of the model and parameters.
+
+        Raises:
+            KeyError: If the model is not found.
+            ValueError: If the model is not an embedding model or parameters are invalid.
+        """
+        model_config = self.model_config_manager.get_model_config(provider, model)
+        if not model_config:
+            raise KeyError(f"Model not found: {provider}/{model}")
+        if 'embeddings' not in model_config.get('capabilities', []):
+            raise ValueError(f"Model '{provider}/{model}' is not an embedding model")
+        final_params = self.model_config_manager.merge_and_validate_params(provider, model, parameters)
+        return model_config, final_params, make_cache_key(provider, model, {}, final_params)
+
+    def _lookup_embeddings(self, namespace: str, texts: List[str]) -> Tuple[List[Optional[Any]], List[int]]:
+        """Returns cached vectors (None where missing) and the indices of uncached texts."""
+        if self.embedding_cache is None:
+            return [None] * len(texts), list(range(len(texts)))
+        return self.embedding_cache.lookup(namespace, texts)
+
+    def _merge_embeddings(
+        self,
+        namespace: str,
+        texts: List[str],
+        vectors: List[Optional[Any]],
+        missing: List[int],
+        fetched: List[List[float]]
+    ) -> Any:
+        """Stores newly fetched vectors in the cache and returns all vectors as one matrix."""
+        import numpy as np
+
+        fetched_matrix = np.asarray(fetched, dtype=np.float32)
+        if self.embedding_cache is not None and missing:
+            self.embedding_cache.store(namespace, [texts[index] for index in missing], fetched_matrix)
+        for row, index in enumerate(missing):
+            vectors[index] = fetched_matrix[row]
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(vectors).astype(np.float32, copy=False)
+
+    @staticmethod
+    def _chunk_texts(adapter: "BaseAdapter", texts: List[str]) -> List[List[str]]:
+        """Splits texts into chunks of the provider's maximum embedding batch size."""
+        size = adapter.max_embedding_batch
+        return [texts[start:start + size] for start in range(0, len(texts), size)]
+
+    def _fetch_embeddings(
+        self,
+        adapter: "BaseAdapter",
+        model_config: Dict[str, Any],
+        texts: List[str],
+        final_params: Dict[str, Any],
+        max_concurrency: int
+    ) -> List[List[float]]:
+        """Embeds texts with the provider's batch API, running up to max_concurrency chunks at once."""
+        def embed_chunk(chunk: List[str]) -> List[List[float]]:
+            return self._call_provider(
+                model_config, estimate_tokens({'input': chunk}), lambda adapter: adapter.embed_batch(model_config, chunk, final_params)
+            )
+
+        chunks = self._chunk_texts(adapter, texts)
+        if len(chunks) == 1 or max_concurrency <= 1:
+            results = [embed_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as executor:
+                results = list(executor.map(embed_chunk, chunks))
+        return [vector for result in results for vector in result]
+
+    async def _afetch_embeddings(
+        self,
+        adapter: "BaseAdapter",
+        model_config: Dict[str, Any],
+        texts: List[str],
+        final_params: Dict[str, Any],
+        max_concurrency: int
+    ) -> List[List[float]]:
+        """Async counterpart of _fetch_embeddings()."""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def embed_chunk(chunk: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._acall_provider(
+                    model_config, estimate_tokens({'input': chunk}), lambda adapter: adapter.aembed_batch(model_config, chunk, final_params)
+                )
 
-        api_key = self.secret_manager.get_secret(provider)
-        if not api_key:
-            raise KeyError(f"API key for provider '{provider}' not found in secrets.")
+        results = await asyncio.gather(*[embed_chunk(chunk) for chunk in self._chunk_texts(adapter, texts)])
+        return [vector for result in results for vector in result]
+
+    def _call_provider(self, model_config: Dict[str, Any], tokens: int, call: Callable[["BaseAdapter"], T]) -> T:
+        """
+        Sends a provider request through the model's circuit breaker and rate limiter, recording its latency.
+
+        The request then waits for a slot under the provider's adaptive concurrency
+        limit and is made with an API key picked from the provider's key pool.
+
+        Args:
+            model_config: The configuration of the model.
+            tokens: The estimated tokens of the request.
+            call: Sends the request with the adapter of the picked key and returns its result.
+
+        Raises:
+            KeyError: If the provider has no API key.
+            CircuitOpenError: If the model's circuit is open.
+            RateLimitExceeded: If rate limits or the concurrency limit do not admit the
+                request in time, or every API key of the provider is quarantined.
+        """
+        provider = model_config['provider']
+        pool = self._get_key_pool(provider)
+        breaker = self.circuit_breakers.get(provider, model_config['model'])
+        breaker.before_call()
+        key = adapter = limit = None
+        try:
+            self.rate_limiter.acquire(provider, model_config, tokens)
+            limit = self.concurrency_limiter.acquire(provider)
+            key = pool.acquire()
+            adapter = self._get_adapter(provider, key)
+            start_time = time.perf_counter()
+            result = call(adapter)
+        except BaseException as e:
+            self._release(pool, key, adapter, limit, e)
+            breaker.record(e)
+            raise
+        latency = time.perf_counter() - start_time
+        self._release(pool, key, adapter, limit, latency=latency)
+        breaker.record(latency=latency)
+        self.latency.record(provider, model_config['model'], latency)
+        return result
+
+    async def _acall_provider(self, model_config: Dict[str, Any], tokens: int, call: Callable[["BaseAdapter"], Awaitable[T]]) -> T:
+        """Async counterpart of _call_provider()."""
+        provider = model_config['provider']
+        pool = self._get_key_pool(provider)
+        breaker = self.circuit_breakers.get(provider, model_config['model'])
+        breaker.before_call()
+        key = adapter = limit = None
+        try:
+            await self.rate_limiter.aacquire(provider, model_config, tokens)
+            limit = await self.concurrency_limiter.aacquire(provider)
+            key = pool.acquire()
+            adapter = self._get_adapter(provider, key)
+            start_time = time.perf_counter()
+            result = await call(adapter)
+        except BaseException as e:
+            self._release(pool, key, adapter, limit, e)
+            breaker.record(e)
+            raise
+        latency = time.perf_counter() - start_time
+        self._release(pool, key, adapter, limit, latency=latency)
+        breaker.record(latency=latency)
+        self.latency.record(provider, model_config['model'], latency)
+        return result
+
+    @staticmethod
+    def _release(
+        pool: KeyPool,
+        key: Optional[PooledKey],
+        adapter: Optional["BaseAdapter"],
+        limit: Optional[AdaptiveLimit],
+        error: Optional[BaseException] = None,
+        latency: Optional[float] = None
+    ) -> None:
+        """Returns what a provider call acquired: its key, with the rate-limit state its adapter last saw, and its concurrency slot."""
+        if key is not None:
+            pool.release(key, error, adapter.rate_limit_state if adapter is not None else None)
+        if limit is not None:
+            limit.release(error, latency)
+
+    def _guarded_stream(
+        self,
+        model_config: Dict[str, Any],
+        tokens: int,
+        open_stream: Callable[["BaseAdapter"], Iterator[Dict[str, Any]]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Relays a provider stream through the model's circuit breaker, rate limiter,
+        concurrency limit and key pool. The stream holds its concurrency slot until it ends.
+
+        All are checked on first iteration. A consumer that stops early counts
+        as a success.
+        """
+        provider = model_config['provider']
+        pool = self._get_key_pool(provider)
+        breaker = self.circuit_breakers.get(provider, model_config['model'])
+        breaker.before_call()
+        key = adapter = limit = error = None
+        try:
+            self.rate_limiter.acquire(provider, model_config, tokens)
+            limit = self.concurrency_limiter.acquire(provider)
+            key = pool.acquire()
+            adapter = self._get_adapter(provider, key)
+            yield from open_stream(adapter)
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._release(pool, key, adapter, limit, error)
+            breaker.record(error)
+
+    async def _aguarded_stream(
+        self,
+        model_config: Dict[str, Any],
+        tokens: int,
+        open_stream: Callable[["BaseAdapter"], AsyncIterator[Dict[str, Any]]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async counterpart of _guarded_stream()."""
+        provider = model_config['provider']
+        pool = self._get_key_pool(provider)
+        breaker = self.circuit_breakers.get(provider, model_config['model'])
+        breaker.before_call()
+        key = adapter = limit = error = None
+        try:
+            await self.rate_limiter.aacquire(provider, model_config, tokens)
+            limit = await self.concurrency_limiter.aacquire(provider)
+            key = pool.acquire()
+            adapter = self._get_adapter(provider, key)
+            async for chunk in open_stream(adapter):
+                yield chunk
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._release(pool, key, adapter, limit, error)
+            breaker.record(error)
+
+    def _get_key_pool(self, provider: str) -> KeyPool:
+        """
+        Returns the pool of API keys of a provider, building it on first use.
+
+        Pools are discarded, like adapters, whenever the secret manager reports
+        that secrets were reloaded.
+
+        Raises:
+            KeyError: If the provider has no API key.
+            ValueError: If the provider's key_selection is unknown.
+        """
+        if self._adapters_secrets_version == self.secret_manager.version:
+            pool = self._key_pools.get(provider)
+            if pool is not None:
+                return pool
+
+        with self._adapters_lock:
+            self._check_secrets_version()
+            pool = self._key_pools.get(provider)
+            if pool is None:
+                pool = KeyPool(
+                    provider,
+                    self.secret_manager.get_credentials(provider),
+                    self.secret_manager.get_key_selection(provider)
+                )
+                self._key_pools[provider] = pool
+            return pool
+
+    def _check_secrets_version(self) -> None:
+        """Discards adapters and key pools built from older secrets; call with the adapters lock held."""
+        if self._adapters_secrets_version != self.secret_manager.version:
+            self._adapters = {}
+            self._key_pools = {}
+            self._adapters_secrets_version = self.secret_manager.version
+
+    def _get_adapter(self, provider: str, key: Optional[PooledKey] = None) -> "BaseAdapter":
+        """
+        Returns a cached adapter for a provider key, building it on first use.
+
+        Adapters are cached per (provider, api_key, organization, project), since
+        keys of a pool may share an api_key but bill different projects. The cache is discarded whenever
+        the secret manager reports that secrets were reloaded.
+
+        Args:
+            provider: The name of the provider.
+            key: A key from the provider's pool; defaults to its first key.
+
+        Raises:
+            KeyError: If the API key is missing.
+            ValueError: If no adapter exists for the provider.
+        """
+        if key is None:
+            key = self._get_key_pool(provider).keys[0]
 
-        adapter_class = get_adapter(provider)
-        adapter = adapter_class(api_key=api_key)
+        organization = key.credentials.get('organization')
+        project = key.credentials.get('project')
+        cache_key = (provider, key.api_key, organization, project)
+        if self._adapters_secrets_version == self.secret_manager.version:
+            adapter = self._adapters.get(cache_key)
+            if adapter is not None:
+                return adapter
 
-        response = adapter.invoke(model_config, payload, final_params)
-        return response
\ No newline at end of file
+        with self._adapters_lock:
+            self._check_secrets_version()
+            adapter = self._adapters.get(cache_key)
+            if adapter is None:
+                adapter_class = get_adapter(provider)
+                adapter = adapter_class(api_key=key.api_key)
+                adapter.organization = organization
+                adapter.project = project
+                self._adapters[cache_key] = adapter
+            return adapter
@@ -0,0 +1,157 @@
+"""Pools of API keys per provider, spreading requests across keys and sidelining failing ones."""
+
+import itertools
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from .adapters.retry import ProviderHTTPError
+from .rate_limiter import RateLimitExceeded
+
+STRATEGIES = ('least_loaded', 'round_robin')
+
+# Statuses that take a key out of rotation: rejected credentials and exhausted key quotas
+_AUTH_STATUSES = (401, 403)
+_RATE_LIMIT_STATUS = 429
+
+class PooledKey:
+    """One API key of a pool, with its load and the rate-limit state its responses reported."""
+
+    def __init__(self, credentials: Dict[str, str]):
+        self.credentials = credentials
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.quarantined_until = 0.0
+        self.quarantine_reason: Optional[str] = None
+        self.remaining_requests: Optional[float] = None
+        self.reset_at = 0.0
+
+    @property
+    def api_key(self) -> str:
+        return self.credentials['api_key']
+
+    def quarantined(self, now: float) -> bool:
+        return now < self.quarantined_until
+
+    def exhausted(self, now: float) -> bool:
+        """Returns whether the provider reported no requests left for this key until its reset."""
+        return self.remaining_requests is not None and self.remaining_requests <= 0 and now < self.reset_at
+
+class KeyPool:
+    """
+    Selects an API key for each request to a provider.
+
+    'least_loaded' picks the key with the fewest requests in flight, preferring
+    keys with more requests left in their rate-limit window; 'round_robin'
+    cycles through the keys. Keys that the provider reported as exhausted are
+    used only when no other key is available. When a pool has more than one
+    key, a key answered with 401/403 is quarantined for auth_quarantine_seconds
+    and a key answered with 429 for its Retry-After (or quarantine_seconds).
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        credentials: List[Dict[str, str]],
+        strategy: str = 'least_loaded',
+        quarantine_seconds: float = 30.0,
+        auth_quarantine_seconds: float = 300.0
+    ):
+        """
+        Initializes the pool.
+
+        Args:
+            provider: The name of the provider.
+            credentials: One dict per key, with 'api_key' and optionally 'organization' and 'project'.
+            strategy: 'least_loaded' or 'round_robin'.
+            quarantine_seconds: How long a rate-limited key is skipped without a Retry-After.
+            auth_quarantine_seconds: How long a key with rejected credentials is skipped.
+
+        Raises:
+            KeyError: If there are no credentials.
+            ValueError: If the strategy is unknown.
+        """
+        if not credentials:
+            raise KeyError(f"API key for provider '{provider}' not found in secrets.")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Key selection for provider '{provider}' must be one of {STRATEGIES}, got '{strategy}'")
+        self.provider = provider
+        self.keys = [PooledKey(entry) for entry in credentials]
+        self.strategy = strategy
+        self.quarantine_seconds = quarantine_seconds
+        self.auth_quarantine_seconds = auth_quarantine_seconds
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> PooledKey:
+        """
+        Picks a key for a request and counts it as in flight until release().
+
+        Raises:
+            RateLimitExceeded: If every key is quarantined.
+        """
+        with self._lock:
+            now = time.monotonic()
+            usable = [key for key in self.keys if not key.quarantined(now)]
+            if not usable:
+                retry_after = min(key.quarantined_until for key in self.keys) - now
+                raise RateLimitExceeded(
+                    f"All API keys for provider '{self.provider}' are quarantined; retry in {retry_after:.2f}s",
+                    retry_after=retry_after
+                )
+            usable = [key for key in usable if not key.exhausted(now)] or usable
+            if self.strategy == 'round_robin':
+                key = usable[next(self._turn) % len(usable)]
+            else:
+                key = min(usable, key=lambda key: (
+                    key.in_flight, -(key.remaining_requests if key.remaining_requests is not None else float('inf')), key.requests
+                ))
+            key.in_flight += 1
+            key.requests += 1
+            return key
+
+    def release(self, key: PooledKey, error: Optional[BaseException] = None, rate_limits: Optional[Dict[str, float]] = None) -> None:
+        """
+        Records the outcome of a request made with a key.
+
+        Args:
+            key: The key returned by acquire().
+            error: The error the request raised, or None if it succeeded.
+            rate_limits: The rate-limit state reported by the provider's last
+                response ('remaining_requests', 'reset_requests' in seconds).
+        """
+        with self._lock:
+            now = time.monotonic()
+            key.in_flight = max(0, key.in_flight - 1)
+            if rate_limits and 'remaining_requests' in rate_limits:
+                key.remaining_requests = rate_limits['remaining_requests']
+                key.reset_at = now + rate_limits.get('reset_requests', 0.0)
+            if not isinstance(error, ProviderHTTPError):
+                return
+            key.failures += 1
+            if len(self.keys) == 1:
+                return
+            if error.status_code in _AUTH_STATUSES:
+                key.quarantined_until = now + self.auth_quarantine_seconds
+                key.quarantine_reason = f"HTTP {error.status_code}"
+            elif error.status_code == _RATE_LIMIT_STATUS:
+                key.quarantined_until = now + (error.retry_after if error.retry_after is not None else self.quarantine_seconds)
+                key.quarantine_reason = f"HTTP {error.status_code}"
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Returns the load and state of each key; keys are shown by their last four characters."""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    'key': f"...{key.api_key[-4:]}",
+                    'in_flight': key.in_flight,
+                    'requests': key.requests,
+                    'failures': key.failures,
+                    'remaining_requests': key.remaining_requests,
+                    'quarantined': key.quarantine_reason if key.quarantined(now) else None,
+                    'quarantine_seconds_left': max(0.0, key.quarantined_until - now)
+                }
+                for key in self.keys
+            ]
@@ -0,0 +1,68 @@
+"""Rolling latency statistics per provider model."""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+class LatencyTracker:
+    """Keeps the most recent call latencies of each provider model and reports percentiles."""
+
+    def __init__(self, window: int = 500, min_samples: int = 20, smoothing: float = 0.1):
+        """
+        Initializes the tracker.
+
+        Args:
+            window: The number of most recent latencies kept per model.
+            min_samples: The number of samples needed before percentiles are reported.
+            smoothing: The weight of the newest sample in the moving average.
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.smoothing = smoothing
+        self._samples: Dict[str, Deque[float]] = {}
+        self._averages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, seconds: float) -> None:
+        """Records the latency of a successful call."""
+        key = f"{provider}/{model}"
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+            average = self._averages.get(key)
+            self._averages[key] = seconds if average is None else average + self.smoothing * (seconds - average)
+
+    def average(self, provider: str, model: str) -> Optional[float]:
+        """Returns the exponentially weighted moving average latency of a model, or None before its first call."""
+        return self._averages.get(f"{provider}/{model}")
+
+    def percentile(self, provider: str, model: str, q: float) -> Optional[float]:
+        """
+        Returns a latency percentile of a model.
+
+        Args:
+            provider: The name of the provider.
+            model: The model name.
+            q: The percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            The latency in seconds, or None with fewer than min_samples samples.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(f"{provider}/{model}", ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the sample count and p50/p95/p99 latency in milliseconds of each model."""
+        with self._lock:
+            samples = {key: sorted(values) for key, values in self._samples.items()}
+        report = {}
+        for key, values in samples.items():
+            def at(q: float) -> float:
+                return values[min(len(values) - 1, int(q * len(values)))] * 1000
+            report[key] = {'count': len(values), 'p50_ms': at(0.5), 'p95_ms': at(0.95), 'p99_ms': at(0.99)}
+        return report
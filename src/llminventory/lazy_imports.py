@@ -0,0 +1,80 @@
+"""Defers imports to first use, so that importing the package stays fast."""
+
+import importlib
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class LazyModule:
+    """
+    Stands in for a module that is imported on first attribute access.
+
+    Looked-up attributes are cached on the instance, so after the first use an
+    access costs the same as on the module itself.
+    """
+
+    def __init__(self, name: str, install_hint: str):
+        """
+        Initializes the stand-in without importing anything.
+
+        Args:
+            name: The module to import, e.g. 'numpy'.
+            install_hint: The message of the ImportError raised if it is not installed.
+        """
+        self._name = name
+        self._install_hint = install_hint
+        self._module: Optional[ModuleType] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(ensure_imported(self), attr)
+        setattr(self, attr, value)
+        return value
+
+def ensure_imported(module: LazyModule) -> ModuleType:
+    """
+    Imports the module behind a LazyModule, if it is not imported yet.
+
+    Call it where the dependency becomes required, e.g. in a constructor, so
+    that a missing package fails there with an install hint.
+
+    Returns:
+        The imported module.
+
+    Raises:
+        ImportError: If the module is not installed.
+    """
+    if module._module is None:
+        try:
+            module._module = importlib.import_module(module._name)
+        except ImportError:
+            raise ImportError(module._install_hint) from None
+    return module._module
+
+def lazy_exports(
+    package: str,
+    exports: Dict[str, str],
+    namespace: Dict[str, Any]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Builds the PEP 562 __getattr__ and __dir__ of a package whose public names are imported on first use.
+
+    Args:
+        package: The package name (its __name__).
+        exports: The submodule, relative to the package, defining each public name.
+        namespace: The package globals, where resolved names are cached so
+            that later lookups do not go through __getattr__ again.
+
+    Returns:
+        The (__getattr__, __dir__) functions to assign in the package.
+    """
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f".{module}", package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,24 +1,60 @@
 """Manages loading, validating, and providing access to LLM model configurations."""
 
-import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+
+from .config_snapshot import read_snapshot, write_snapshot
+from .model_registry import ModelRegistry
+from .param_validator import ParameterValidator
+
+# Bump whenever the conversion of supported_models.yaml or routing.yaml entries changes, to invalidate snapshots
+SNAPSHOT_VERSION = 1
 
 class ModelConfigManager:
     """
     Manages loading, validating, and providing access to LLM model configurations.
     """
 
-    def __init__(self, configs_dir: Path):
+    def __init__(self, configs_dir: Path, use_snapshot: bool = True, strict: bool = False, lazy: bool = True):
         """
         Initializes the ModelConfigManager by loading all model configurations.
 
         Args:
             configs_dir: The path to the directory containing model config files.
+            use_snapshot: Whether to load supported_models.yaml from its compiled
+                snapshot (supported_models.snapshot) when that is current, and to
+                refresh the snapshot after parsing the YAML.
+            strict: Whether an unreadable supported_models.yaml raises instead of
+                falling back to the individual config files, e.g. when reloading.
+            lazy: Whether the parameter validator of a model is compiled on its
+                first request instead of for every model at load, which keeps
+                startup short when a process uses only a few models.
         """
         self.configs_dir = configs_dir
+        self.use_snapshot = use_snapshot
+        self.strict = strict
         self._model_configs: Dict[str, Dict[str, Any]] = {}
+        # Provider-wide rate limits ('rpm'/'tpm'), from rate_limits.yaml or the
+        # 'rate_limits' key of a dict-format supported_models.yaml
+        self.provider_rate_limits: Dict[str, Dict[str, Any]] = {}
+        # Ordered fallback chains of (provider, model) per model alias, from routing.yaml
+        self.aliases: Dict[str, List[Tuple[str, str]]] = {}
         self._load_all_configs()
+        self._load_rate_limits()
+        self._load_aliases()
+        # Indexed queries over the loaded configs; the indexes are built on first use
+        self.registry = ModelRegistry(self._model_configs.values())
+        # Keyed by (provider, model) so that a request needs no key formatting
+        self._validators: Dict[Tuple[str, str], ParameterValidator] = {}
+        if not lazy:
+            for key, config in self._model_configs.items():
+                self._validators[tuple(key.split('/', 1))] = self._compile_validator(config)
+
+    @staticmethod
+    def _compile_validator(config: Dict[str, Any]) -> ParameterValidator:
+        return ParameterValidator(
+            f"{config['provider']}/{config['model']}", config.get('parameters'), config['provider'], config.get('max_output')
+        )
 
     def _load_all_configs(self) -> None:
         """
@@ -30,59 +66,87 @@ class ModelConfigManager:
         supported_models_file = project_root / "supported_models.yaml"
         
         if supported_models_file.exists():
+            if self.use_snapshot:
+                snapshot = read_snapshot(supported_models_file, SNAPSHOT_VERSION)
+                if snapshot is not None:
+                    self._model_configs = snapshot['models']
+                    self.provider_rate_limits = snapshot['rate_limits']
+                    print(f"Loaded {len(self._model_configs)} models from {supported_models_file} (snapshot)")
+                    return
+            # Imported here: with a current snapshot, most processes never parse YAML
+            import yaml
             try:
-                with open(supported_models_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    
-                    # Handle both list format (current) and dict format (future)
-                    models_data = []
-                    if isinstance(data, list):
-                        models_data = data
-                    elif isinstance(data, dict) and 'models' in data:
-                        if isinstance(data['models'], dict):
-                            # New format: dict of models
-                            for model_key, model_config in data['models'].items():
-                                models_data.append(model_config)
-                        elif isinstance(data['models'], list):
-                            # Alternative format: list under 'models' key
-                            models_data = data['models']
+                mtime_ns = supported_models_file.stat().st_mtime_ns
+                content = supported_models_file.read_bytes()
+                data = yaml.safe_load(content)
+
+                # Handle both list format (current) and dict format (future)
+                models_data = []
+                if isinstance(data, list):
+                    models_data = data
+                elif isinstance(data, dict) and 'models' in data:
+                    self.provider_rate_limits = data.get('rate_limits') or {}
+                    if isinstance(data['models'], dict):
+                        # New format: dict of models
+                        for model_key, model_config in data['models'].items():
+                            models_data.append(model_config)
+                    elif isinstance(data['models'], list):
+                        # Alternative format: list under 'models' key
+                        models_data = data['models']
+                
+                # Process models
+                for model_config in models_data:
+                    provider = model_config.get('provider')
+                    model_id = model_config.get('model') or model_config.get('model_id')
                     
-                    # Process models
-                    for model_config in models_data:
-                        provider = model_config.get('provider')
-                        model_id = model_config.get('model') or model_config.get('model_id')
+                    if provider and model_id:
+                        # Use existing config if it has the right structure, or convert if needed
+                        if 'endpoint' in model_config and 'parameters' in model_config:
+                            # Already in the right format (from individual config files)
+                            config = model_config
+                        else:
+                            # Convert from comprehensive format
+                            config = {
+                                'provider': provider,
+                                'model': model_id,
+                                'endpoint': self._get_endpoint_for_provider(provider),
+                                'description': model_config.get('description', ''),
+                                'parameters': self._convert_default_params_to_parameter_schema(
+                                    model_config.get('default_params', {})
+                                ),
+                                'required_fields': self._get_required_fields_for_provider(provider),
+                                'capabilities': model_config.get('capabilities', []),
+                                'context_window': model_config.get('context_window'),
+                                'max_output': model_config.get('max_output'),
+                                'pricing': model_config.get('pricing', {}),
+                                'timeout': model_config.get('timeout'),
+                                'cache': model_config.get('cache', False),
+                                'semantic_cache': model_config.get('semantic_cache', False),
+                                'rate_limits': model_config.get('rate_limits'),
+                                'retry': model_config.get('retry')
+                            }
                         
-                        if provider and model_id:
-                            # Use existing config if it has the right structure, or convert if needed
-                            if 'endpoint' in model_config and 'parameters' in model_config:
-                                # Already in the right format (from individual config files)
-                                config = model_config
-                            else:
-                                # Convert from comprehensive format
-                                config = {
-                                    'provider': provider,
-                                    'model': model_id,
-                                    'endpoint': self._get_endpoint_for_provider(provider),
-                                    'description': model_config.get('description', ''),
-                                    'parameters': self._convert_default_params_to_parameter_schema(
-                                        model_config.get('default_params', {})
-                                    ),
-                                    'required_fields': self._get_required_fields_for_provider(provider),
-                                    'capabilities': model_config.get('capabilities', []),
-                                    'context_window': model_config.get('context_window'),
-                                    'max_output': model_config.get('max_output'),
-                                    'pricing': model_config.get('pricing', {})
-                                }
-                            
-                            key = f"{provider}/{model_id}"
-                            self._model_configs[key] = config
+                        key = f"{provider}/{model_id}"
+                        self._model_configs[key] = config
+                
+                print(f"Loaded {len(self._model_configs)} models from {supported_models_file}")
+                if self.use_snapshot:
+                    write_snapshot(
+                        supported_models_file,
+                        SNAPSHOT_VERSION,
+                        {'models': self._model_configs, 'rate_limits': self.provider_rate_limits},
+                        content,
+                        mtime_ns
+                    )
+                return
                     
-                    print(f"Loaded {len(self._model_configs)} models from {supported_models_file}")
-                    return
-                        
             except yaml.YAMLError as e:
+                if self.strict:
+                    raise ValueError(f"Could not parse supported_models.yaml: {e}") from e
                 print(f"Warning: Could not parse supported_models.yaml: {e}")
             except Exception as e:
+                if self.strict:
+                    raise
                 print(f"Warning: Error loading supported_models.yaml: {e}")
         
         # Fallback: Load individual config files from configs directory
@@ -96,6 +160,7 @@ class ModelConfigManager:
         """
         if not self.configs_dir.is_dir():
             raise NotADirectoryError(f"Configs directory not found: {self.configs_dir}")
+        import yaml
 
         for config_file in self.configs_dir.glob("*.yaml"):
             try:
@@ -118,6 +183,92 @@ class ModelConfigManager:
             except Exception as e:
                 print(f"Warning: An unexpected error occurred loading {config_file.name}: {e}")
 
+    def _read_yaml(self, path: Path) -> Any:
+        """
+        Parses a small YAML config file, through its snapshot when that is current.
+
+        Raises:
+            ValueError: If the file is not valid YAML.
+        """
+        data = read_snapshot(path, SNAPSHOT_VERSION) if self.use_snapshot else None
+        if data is not None:
+            return data
+        import yaml
+        mtime_ns = path.stat().st_mtime_ns
+        content = path.read_bytes()
+        try:
+            data = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Could not parse {path.name}: {e}") from e
+        if self.use_snapshot and data is not None:
+            write_snapshot(path, SNAPSHOT_VERSION, data, content, mtime_ns)
+        return data
+
+    def _load_rate_limits(self) -> None:
+        """
+        Loads provider-wide rate limits from rate_limits.yaml in the project root, if present.
+
+        The file maps provider names to their limits, e.g. 'openai: {rpm: 500, tpm: 200000}'.
+        It is kept apart from supported_models.yaml, which generate_model_list.py
+        rewrites as a plain list of models. Its limits take precedence over those
+        of a dict-format supported_models.yaml.
+
+        Raises:
+            ValueError: In strict mode, if the file is invalid.
+        """
+        rate_limits_file = self.configs_dir.parent / "rate_limits.yaml"
+        if not rate_limits_file.exists():
+            return
+        try:
+            data = self._read_yaml(rate_limits_file) or {}
+            if not isinstance(data, dict) or not all(isinstance(limits, dict) for limits in data.values()):
+                raise ValueError("rate_limits.yaml must map each provider name to its limits, e.g. 'openai: {rpm: 500}'")
+        except ValueError as e:
+            if self.strict:
+                raise
+            print(f"Warning: {e}")
+            return
+        self.provider_rate_limits = {**self.provider_rate_limits, **data}
+
+    def _load_aliases(self) -> None:
+        """
+        Loads model aliases from routing.yaml in the project root, if present.
+
+        Each alias maps to an ordered list of 'provider/model' entries; entries
+        that name unknown models are skipped with a warning.
+        """
+        routing_file = self.configs_dir.parent / "routing.yaml"
+        if not routing_file.exists():
+            return
+        try:
+            data = self._read_yaml(routing_file) or {}
+        except ValueError as e:
+            print(f"Warning: {e}")
+            return
+
+        for alias, chain in (data.get('aliases') or {}).items():
+            entries = []
+            for entry in chain or []:
+                provider, _, model_name = str(entry).partition('/')
+                if not self.get_model_config(provider, model_name):
+                    print(f"Warning: Alias '{alias}' refers to unknown model '{entry}'")
+                    continue
+                entries.append((provider, model_name))
+            if entries:
+                self.aliases[alias] = entries
+
+    def get_alias_chain(self, alias: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Returns the fallback chain of a model alias.
+
+        Args:
+            alias: The alias name (e.g., 'fast-chat').
+
+        Returns:
+            The ordered (provider, model) pairs, or None if the alias is not defined.
+        """
+        return self.aliases.get(alias)
+
     def _get_endpoint_for_provider(self, provider: str) -> str:
         """Get the API endpoint URL for a given provider."""
         endpoints = {
@@ -185,9 +336,12 @@ class ModelConfigManager:
         user_params: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
-        Merges user-provided parameters with model defaults and validates their types.
+        Merges user-provided parameters with model defaults and validates their types and ranges.
         Unsupported parameters from user_params are ignored.
 
+        Validation uses the model's ParameterValidator, compiled when the configs
+        are loaded or, with lazy=True, on the first request to the model.
+
         Args:
             provider: The name of the model provider.
             model_name: The specific name of the model.
@@ -197,47 +351,15 @@ class ModelConfigManager:
             A dictionary of validated and merged parameters.
 
         Raises:
-            ValueError: If a user-provided parameter has an invalid type.
+            ValueError: If a user-provided parameter has an invalid type, is out of
+                range or is not one of the allowed values.
             KeyError: If the specified model is not found.
         """
-        model_config = self.get_model_config(provider, model_name)
-        if not model_config:
-            raise KeyError(f"Model '{provider}/{model_name}' not found in configurations.")
-
-        # Initialize merged_params with defaults from the model config
-        merged_params: Dict[str, Any] = {}
-        if 'parameters' in model_config and model_config['parameters'] is not None:
-            for param_name, param_info in model_config['parameters'].items():
-                if 'default' in param_info:
-                    merged_params[param_name] = param_info['default']
-
-        if user_params:
-            for param_name, user_value in user_params.items():
-                if param_name in model_config.get('parameters', {}):
-                    param_info = model_config['parameters'][param_name]
-                    expected_type_str = param_info.get('type')
-
-                    # Type validation
-                    type_map = {
-                        "float": (float, int), # Allow int to be cast to float
-                        "integer": int,
-                        "string": str,
-                        "boolean": bool
-                    }
-                    expected_type = type_map.get(expected_type_str)
-
-                    if expected_type and not isinstance(user_value, expected_type):
-                        raise ValueError(
-                            f"Parameter '{param_name}' for '{provider}/{model_name}' "
-                            f"expected type '{expected_type_str}', but got '{type(user_value).__name__}'."
-                        )
-                    # Handle int -> float conversion explicitly for clarity and robustness
-                    if expected_type_str == "float" and isinstance(user_value, int): # If expected is float but user gave int
-                        merged_params[param_name] = float(user_value) # Convert int to float
-                    elif expected_type_str == "integer" and isinstance(user_value, float) and user_value.is_integer(): # If expected is int but user gave float that is an integer
-                        merged_params[param_name] = int(user_value) # Convert float to int
-                    else: # Otherwise, use the value as is (after type check)
-                        merged_params[param_name] = user_value
-                # If param_name is not in model_config.parameters, it's ignored (stripped)
-
-        return merged_params
\ No newline at end of file
+        validator = self._validators.get((provider, model_name))
+        if validator is None:
+            config = self.get_model_config(provider, model_name)
+            if config is None:
+                raise KeyError(f"Model '{provider}/{model_name}' not found in configurations.")
+            # Concurrent first requests may both compile it; either result is the same
+            validator = self._validators[(provider, model_name)] = self._compile_validator(config)
+        return validator.validate(user_params)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""Indexed, read-only queries over model configurations."""
+
+import bisect
+import math
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+
+SORT_ORDERS = ('name', 'price', 'context')
+
+def _names(value: Optional[Union[str, Iterable[str]]]) -> Optional[FrozenSet[str]]:
+    if value is None:
+        return None
+    return frozenset([value] if isinstance(value, str) else value)
+
+def _freeze(value: Any) -> Any:
+    """Returns a read-only copy of a config value, with dicts as MappingProxyType views and lists as tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def mutable_config(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """Returns a plain dict copy of a config returned by the registry, e.g. to modify or serialize it."""
+    def thaw(value: Any) -> Any:
+        if isinstance(value, Mapping):
+            return {key: thaw(item) for key, item in value.items()}
+        if isinstance(value, tuple):
+            return [thaw(item) for item in value]
+        return value
+    return thaw(config)
+
+def model_price(config: Mapping[str, Any]) -> float:
+    """Returns the list price of a model in USD per million input plus output tokens, or infinity without pricing."""
+    pricing = config.get('pricing') or {}
+    input_cost = pricing.get('input_cost_per_1m_tokens')
+    output_cost = pricing.get('output_cost_per_1m_tokens')
+    if input_cost is None or output_cost is None:
+        return math.inf
+    return input_cost + output_cost
+
+def _output_cost(config: Mapping[str, Any]) -> float:
+    output_cost = (config.get('pricing') or {}).get('output_cost_per_1m_tokens')
+    return math.inf if output_cost is None else output_cost
+
+class ModelRegistry:
+    """
+    Answers queries over a fixed set of model configs through secondary indexes.
+
+    The indexes (by provider, by capability, by input price and by context
+    window) are built on the first query. Query results are tuples of the
+    configs, cached per distinct query, so repeated listings and router
+    lookups cost O(result) instead of a scan of all models. The registry keeps
+    read-only copies of the configs (MappingProxyType, with lists as tuples),
+    so that the results it shares between callers cannot be modified; use
+    mutable_config() for a plain dict.
+    """
+
+    def __init__(self, model_configs: Iterable[Dict[str, Any]]):
+        """
+        Initializes the registry.
+
+        Args:
+            model_configs: The model configs, each with at least 'provider' and 'model'.
+        """
+        self._configs: Tuple[Mapping[str, Any], ...] = tuple(sorted(
+            (_freeze(config) for config in model_configs), key=lambda config: f"{config['provider']}/{config['model']}"
+        ))
+        self._indexed = False
+        self._lock = threading.Lock()
+        self._find = lru_cache(maxsize=1024)(self._find_uncached)
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def _build_indexes(self) -> None:
+        with self._lock:
+            if self._indexed:
+                return
+            by_provider: Dict[str, List[int]] = {}
+            by_capability: Dict[str, List[int]] = {}
+            by_input_cost: List[Tuple[float, int]] = []
+            by_context: List[Tuple[int, int]] = []
+            for position, config in enumerate(self._configs):
+                by_provider.setdefault(config['provider'], []).append(position)
+                # Configs that list no capabilities predate the field and describe text models
+                for capability in config.get('capabilities') or ('text',):
+                    by_capability.setdefault(capability, []).append(position)
+                input_cost = (config.get('pricing') or {}).get('input_cost_per_1m_tokens')
+                if input_cost is not None:
+                    by_input_cost.append((input_cost, position))
+                if config.get('context_window'):
+                    by_context.append((config['context_window'], position))
+            by_input_cost.sort()
+            by_context.sort()
+
+            self._by_provider = {provider: frozenset(positions) for provider, positions in by_provider.items()}
+            self._by_capability = {capability: frozenset(positions) for capability, positions in by_capability.items()}
+            self._input_costs = [cost for cost, _ in by_input_cost]
+            self._input_cost_positions = [position for _, position in by_input_cost]
+            self._context_windows = [context for context, _ in by_context]
+            self._context_positions = [position for _, position in by_context]
+            self._price_rank = {
+                position: rank for rank, position in enumerate(sorted(
+                    range(len(self._configs)),
+                    key=lambda position: (model_price(self._configs[position]), position)
+                ))
+            }
+            self._indexed = True
+
+    def all(self) -> Tuple[Mapping[str, Any], ...]:
+        """Returns every model config, read-only and ordered by 'provider/model'."""
+        return self._configs
+
+    def providers(self) -> Tuple[str, ...]:
+        """Returns the providers with at least one model, sorted."""
+        if not self._indexed:
+            self._build_indexes()
+        return tuple(sorted(self._by_provider))
+
+    def find_models(
+        self,
+        capabilities: Optional[Union[str, Iterable[str]]] = None,
+        exclude_capabilities: Optional[Union[str, Iterable[str]]] = None,
+        providers: Optional[Union[str, Iterable[str]]] = None,
+        max_input_cost: Optional[float] = None,
+        max_output_cost: Optional[float] = None,
+        min_context: Optional[int] = None,
+        min_output: Optional[int] = None,
+        sort_by: str = 'name'
+    ) -> Tuple[Mapping[str, Any], ...]:
+        """
+        Returns the model configs that match all given criteria.
+
+        Args:
+            capabilities: Capabilities a model must all have, e.g. {'vision'}.
+            exclude_capabilities: Capabilities a model must not have.
+            providers: Providers a model must belong to.
+            max_input_cost: Maximum USD per million input tokens; models without pricing are excluded.
+            max_output_cost: Maximum USD per million output tokens; models without pricing are excluded.
+            min_context: Minimum context window; models without a known window are excluded.
+            min_output: Minimum output token limit; models without a known limit are excluded.
+            sort_by: 'name' ('provider/model'), 'price' (input plus output price,
+                cheapest first, unpriced last) or 'context' (largest first).
+
+        Returns:
+            A tuple of the matching configs, read-only.
+
+        Raises:
+            ValueError: If sort_by is unknown.
+        """
+        if sort_by not in SORT_ORDERS:
+            raise ValueError(f"sort_by must be one of {SORT_ORDERS}, got '{sort_by}'")
+        return self._find(
+            _names(capabilities), _names(exclude_capabilities), _names(providers),
+            max_input_cost, max_output_cost, min_context, min_output, sort_by
+        )
+
+    def _find_uncached(
+        self,
+        capabilities: Optional[FrozenSet[str]],
+        exclude_capabilities: Optional[FrozenSet[str]],
+        providers: Optional[FrozenSet[str]],
+        max_input_cost: Optional[float],
+        max_output_cost: Optional[float],
+        min_context: Optional[int],
+        min_output: Optional[int],
+        sort_by: str
+    ) -> Tuple[Mapping[str, Any], ...]:
+        if not self._indexed:
+            self._build_indexes()
+        # Intersect the index entries of each criterion, narrowest first
+        selections = []
+        if providers is not None:
+            selections.append(frozenset().union(*(self._by_provider.get(provider, frozenset()) for provider in providers)))
+        for capability in capabilities or ():
+            selections.append(self._by_capability.get(capability, frozenset()))
+        if max_input_cost is not None:
+            end = bisect.bisect_right(self._input_costs, max_input_cost)
+            selections.append(frozenset(self._input_cost_positions[:end]))
+        if min_context is not None:
+            start = bisect.bisect_left(self._context_windows, min_context)
+            selections.append(frozenset(self._context_positions[start:]))
+        if selections:
+            selections.sort(key=len)
+            positions = set(selections[0]).intersection(*selections[1:])
+        else:
+            positions = set(range(len(self._configs)))
+        for capability in exclude_capabilities or ():
+            positions -= self._by_capability.get(capability, frozenset())
+
+        if max_output_cost is not None:
+            positions = {position for position in positions if _output_cost(self._configs[position]) <= max_output_cost}
+        if min_output is not None:
+            positions = {position for position in positions if (self._configs[position].get('max_output') or 0) >= min_output}
+
+        if sort_by == 'price':
+            ordered = sorted(positions, key=self._price_rank.__getitem__)
+        elif sort_by == 'context':
+            ordered = sorted(positions, key=lambda position: (-(self._configs[position].get('context_window') or 0), position))
+        else:
+            ordered = sorted(positions)
+        return tuple(self._configs[position] for position in ordered)
@@ -0,0 +1,146 @@
+"""Per-model parameter validators, compiled once from the parameter schema of a model config."""
+
+import math
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Mapping, Optional, Tuple
+
+# Accepted Python types per schema type; ints are accepted for floats and converted
+_TYPES: Dict[str, Tuple[type, ...]] = {
+    'float': (float, int),
+    'integer': (int,),
+    'string': (str,),
+    'boolean': (bool,)
+}
+
+# Bounds applied when the schema gives none: (minimum, maximum), None for unbounded
+_DEFAULT_BOUNDS: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    'temperature': (0.0, 2.0),
+    'top_p': (0.0, 1.0),
+    'topP': (0.0, 1.0),
+    'top_k': (0, None),
+    'topK': (0, None)
+}
+_PROVIDER_BOUNDS: Dict[str, Dict[str, Tuple[Optional[float], Optional[float]]]] = {
+    'anthropic': {'temperature': (0.0, 1.0)}
+}
+
+# Parameters that limit the output tokens, and so must not exceed the model's max_output
+OUTPUT_TOKEN_PARAMETERS = frozenset({'max_tokens', 'max_completion_tokens', 'max_output_tokens', 'maxOutputTokens'})
+
+Check = Callable[[Any], Any]
+
+def _compile_check(
+    name: str,
+    info: Mapping[str, Any],
+    label: str,
+    bounds: Tuple[Optional[float], Optional[float]],
+    choices: Optional[frozenset]
+) -> Check:
+    """Returns a function that validates and converts one user value of a parameter."""
+    type_name = info.get('type')
+    accepted = _TYPES.get(type_name)
+    if accepted is None and choices is None:
+        return _identity
+
+    def type_error(value: Any) -> ValueError:
+        return ValueError(
+            f"Parameter '{name}' for '{label}' "
+            f"expected type '{type_name}', but got '{type(value).__name__}'."
+        )
+
+    if choices is not None:
+        def check(value: Any) -> Any:
+            if accepted is not None and not isinstance(value, accepted):
+                raise type_error(value)
+            if value not in choices:
+                raise ValueError(f"Parameter '{name}' for '{label}' must be one of {sorted(choices, key=str)}, but got {value!r}.")
+            return float(value) if type_name == 'float' else value
+        return check
+
+    if type_name not in ('float', 'integer'):
+        def check(value: Any) -> Any:
+            if not isinstance(value, accepted):
+                raise type_error(value)
+            return value
+        return check
+
+    # Numbers: one type test, one chained comparison; unbounded sides compare against infinity
+    minimum, maximum = bounds
+    low = -math.inf if minimum is None else minimum
+    high = math.inf if maximum is None else maximum
+    to_float = type_name == 'float'
+
+    def check(value: Any) -> Any:
+        if type(value) is not float or not to_float:
+            if not isinstance(value, accepted):
+                raise type_error(value)
+            if to_float:
+                value = float(value)
+        if not low <= value <= high:
+            raise ValueError(f"Parameter '{name}' for '{label}' must be between {low} and {high}, but got {value}.")
+        return value
+    return check
+
+def _identity(value: Any) -> Any:
+    return value
+
+class ParameterValidator:
+    """
+    Merges and validates the parameters of requests to one model.
+
+    Built once per model from its 'parameters' schema: the defaults are kept
+    as a read-only mapping, and each parameter gets a compiled check for its
+    type, bounds ('minimum'/'maximum', or well-known ranges such as
+    temperature) and allowed values ('enum'). Output token limits are also
+    capped at the model's max_output. A request then costs one copy of the
+    defaults and one check per user parameter.
+    """
+    __slots__ = ('label', 'defaults', '_defaults', '_checks')
+
+    def __init__(self, label: str, parameters: Optional[Mapping[str, Mapping[str, Any]]], provider: str = '', max_output: Optional[int] = None):
+        """
+        Compiles the validator.
+
+        Args:
+            label: The model named in error messages, e.g. 'openai/gpt-4o'.
+            parameters: The parameter schema of the model config.
+            provider: The provider, which selects provider-specific default bounds.
+            max_output: The maximum output tokens of the model, if known.
+        """
+        parameters = parameters or {}
+        provider_bounds = _PROVIDER_BOUNDS.get(provider, {})
+        self.label = label
+        self._defaults = {name: info['default'] for name, info in parameters.items() if info and 'default' in info}
+        self.defaults: Mapping[str, Any] = MappingProxyType(self._defaults)
+        checks: Dict[str, Check] = {}
+        for name, info in parameters.items():
+            info = info or {}
+            minimum, maximum = provider_bounds.get(name) or _DEFAULT_BOUNDS.get(name, (None, None))
+            minimum = info.get('minimum', minimum)
+            maximum = info.get('maximum', maximum)
+            if name in OUTPUT_TOKEN_PARAMETERS:
+                minimum = 1 if minimum is None else minimum
+                if max_output:
+                    maximum = max_output if maximum is None else min(maximum, max_output)
+            choices = frozenset(info['enum']) if info.get('enum') else None
+            checks[name] = _compile_check(name, info, label, (minimum, maximum), choices)
+        self._checks = checks
+
+    def validate(self, user_params: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Returns the defaults merged with the validated user parameters.
+
+        Parameters the model does not support are ignored.
+
+        Raises:
+            ValueError: If a user parameter has the wrong type, is out of range or not an allowed value.
+        """
+        # dict.copy() of the private dict; copying through the read-only proxy is several times slower
+        merged = self._defaults.copy()
+        if user_params:
+            checks = self._checks
+            for name, value in user_params.items():
+                check = checks.get(name)
+                if check is not None:
+                    merged[name] = check(value)
+        return merged
@@ -0,0 +1,237 @@
+"""Token-bucket rate limiting of provider requests (RPM) and tokens (TPM)."""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+# Rate limit keys accepted in configs: requests and tokens per minute
+LIMIT_KEYS = ('rpm', 'tpm')
+
+class RateLimitExceeded(Exception):
+    """Raised when a request cannot be admitted before the caller's deadline."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def estimate_tokens(payload: Dict[str, Any], parameters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Estimates the tokens a request will use, before it is sent.
+
+    The prompt is approximated as one token per four characters of the payload,
+    plus the requested output budget.
+
+    Args:
+        payload: The request payload.
+        parameters: The merged request parameters.
+
+    Returns:
+        The estimated number of input and output tokens.
+    """
+    parameters = parameters or {}
+    prompt_tokens = len(json.dumps(payload, ensure_ascii=False, default=str)) // 4
+    output_tokens = parameters.get('max_tokens') or parameters.get('maxOutputTokens') or 0
+    return prompt_tokens + int(output_tokens)
+
+def usage_tokens(response: Dict[str, Any]) -> Optional[int]:
+    """
+    Returns the total tokens reported in a provider response, if any.
+
+    Understands OpenAI-compatible 'usage', Anthropic 'usage' and Gemini 'usageMetadata'.
+    """
+    usage = response.get('usage')
+    if isinstance(usage, dict):
+        if 'total_tokens' in usage:
+            return usage['total_tokens']
+        if 'input_tokens' in usage or 'output_tokens' in usage:
+            return usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+    metadata = response.get('usageMetadata')
+    if isinstance(metadata, dict) and 'totalTokenCount' in metadata:
+        return metadata['totalTokenCount']
+    return None
+
+class TokenBucket:
+    """
+    A bucket refilled continuously at a per-minute rate.
+
+    The bucket is not thread-safe on its own; RateLimiter serializes access.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, now: Optional[float] = None):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate_per_minute: The refill rate in units per minute.
+            capacity: The burst size; defaults to one minute's worth of units.
+            now: The current monotonic time, for testing.
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_minute / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Returns the seconds until `amount` units can be taken, or 0.0 if they can now.
+
+        A request larger than the capacity waits for a full bucket and then
+        leaves it in debt, so it is delayed rather than rejected forever.
+        """
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) * 60.0 / self.rate_per_minute
+
+    def consume(self, amount: float) -> None:
+        """Takes units from the bucket; call only after wait_time() returned 0.0."""
+        self.tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        """Returns units to the bucket (or takes more, if negative), up to its capacity."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+class RateLimiter:
+    """
+    Admits requests within per-provider and per-model RPM and TPM limits.
+
+    Limits come from a mapping per provider (e.g. {'openai': {'rpm': 500,
+    'tpm': 200000}}) and from the 'rate_limits' key of each model config. A
+    request must fit every bucket that applies to it. Callers that would
+    exceed a limit wait until the buckets refill, up to max_wait seconds, so
+    traffic runs at the highest rate the provider allows. Buckets are shared
+    by all threads and event loops using the limiter.
+    """
+
+    def __init__(self, provider_limits: Optional[Dict[str, Dict[str, float]]] = None, max_wait: Optional[float] = 60.0):
+        """
+        Initializes the limiter.
+
+        Args:
+            provider_limits: Optional limits per provider, with 'rpm' and/or 'tpm' keys.
+            max_wait: The default maximum seconds a request waits for capacity
+                before RateLimitExceeded is raised; None waits indefinitely.
+        """
+        self.provider_limits = dict(provider_limits or {})
+        self.max_wait = max_wait
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.rejections = 0
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: Tuple[str, str], rate: float, now: float) -> TokenBucket:
+        """Returns the bucket for a key, replacing it if its configured rate changed."""
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.rate_per_minute != rate:
+            bucket = self._buckets[key] = TokenBucket(rate, now=now)
+        return bucket
+
+    def _buckets_for(self, provider: str, model_config: Dict[str, Any], now: float) -> List[Tuple[TokenBucket, str]]:
+        """Returns the (bucket, limit key) pairs that apply to a request."""
+        scopes = [
+            (provider, self.provider_limits.get(provider) or {}),
+            (f"{provider}/{model_config['model']}", model_config.get('rate_limits') or {})
+        ]
+        buckets = []
+        for scope, limits in scopes:
+            for limit_key in LIMIT_KEYS:
+                rate = limits.get(limit_key)
+                if rate:
+                    buckets.append((self._bucket((scope, limit_key), rate, now), limit_key))
+        return buckets
+
+    def _try_acquire(self, provider: str, model_config: Dict[str, Any], tokens: int) -> float:
+        """Takes capacity from every bucket if all can serve the request, else returns the wait."""
+        with self._lock:
+            now = time.monotonic()
+            buckets = self._buckets_for(provider, model_config, now)
+            amounts = [1 if limit_key == 'rpm' else tokens for _, limit_key in buckets]
+            wait = max((bucket.wait_time(amount, now) for (bucket, _), amount in zip(buckets, amounts)), default=0.0)
+            if wait == 0.0:
+                for (bucket, _), amount in zip(buckets, amounts):
+                    bucket.consume(amount)
+            return wait
+
+    def _deadline(self, max_wait: Optional[float]) -> Optional[float]:
+        limit = self.max_wait if max_wait is None else max_wait
+        return None if limit is None else time.monotonic() + limit
+
+    def _check_deadline(self, provider: str, model_config: Dict[str, Any], wait: float, deadline: Optional[float]) -> None:
+        """Raises RateLimitExceeded if waiting would run past the deadline."""
+        if deadline is not None and time.monotonic() + wait > deadline:
+            with self._lock:
+                self.rejections += 1
+            raise RateLimitExceeded(
+                f"Rate limit for {provider}/{model_config['model']} exceeded; retry in {wait:.2f}s",
+                retry_after=wait
+            )
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += wait
+
+    def acquire(self, provider: str, model_config: Dict[str, Any], tokens: int = 0, max_wait: Optional[float] = None) -> None:
+        """
+        Blocks until a request fits the provider's and model's limits, then admits it.
+
+        Args:
+            provider: The name of the provider.
+            model_config: The configuration of the model, with optional 'rate_limits'.
+            tokens: The estimated tokens of the request, counted against TPM limits.
+            max_wait: Maximum seconds to wait; defaults to the limiter's max_wait.
+
+        Raises:
+            RateLimitExceeded: If the request cannot be admitted within max_wait.
+        """
+        deadline = self._deadline(max_wait)
+        while True:
+            wait = self._try_acquire(provider, model_config, tokens)
+            if wait == 0.0:
+                return
+            self._check_deadline(provider, model_config, wait, deadline)
+            time.sleep(wait)
+
+    async def aacquire(self, provider: str, model_config: Dict[str, Any], tokens: int = 0, max_wait: Optional[float] = None) -> None:
+        """Async counterpart of acquire() that waits without blocking the event loop."""
+        deadline = self._deadline(max_wait)
+        while True:
+            wait = self._try_acquire(provider, model_config, tokens)
+            if wait == 0.0:
+                return
+            self._check_deadline(provider, model_config, wait, deadline)
+            await asyncio.sleep(wait)
+
+    def record_usage(self, provider: str, model_config: Dict[str, Any], estimated: int, response: Dict[str, Any]) -> None:
+        """
+        Corrects TPM buckets with the tokens a response actually used.
+
+        Args:
+            provider: The name of the provider.
+            model_config: The configuration of the model.
+            estimated: The tokens charged when the request was admitted.
+            response: The provider response, read for its reported usage.
+        """
+        actual = usage_tokens(response)
+        if actual is None or actual == estimated:
+            return
+        with self._lock:
+            for bucket, limit_key in self._buckets_for(provider, model_config, time.monotonic()):
+                if limit_key == 'tpm':
+                    bucket.refund(estimated - actual)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of delayed and rejected requests and the total time spent waiting."""
+        return {
+            'waits': self.waits,
+            'wait_seconds': self.wait_seconds,
+            'rejections': self.rejections
+        }
@@ -0,0 +1,189 @@
+"""Picks a model for a request from its capabilities, size, observed latency and cost."""
+
+import math
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
+
+from .circuit_breaker import CircuitBreakerRegistry
+from .latency import LatencyTracker
+from .model_registry import ModelRegistry
+from .rate_limiter import estimate_tokens
+
+# The model name that asks the router to pick a model
+AUTO_MODEL = 'auto'
+
+PREFERENCES = ('cost', 'latency')
+
+@dataclass(frozen=True)
+class RouteConstraints:
+    """
+    Requirements for a model picked by the router.
+
+    max_cost is the estimated cost of the request in USD, from the model's
+    pricing per million input and output tokens; models without pricing are
+    excluded when it is set. max_latency_ms excludes models whose average
+    observed latency is higher; models not called yet are kept.
+    """
+    capabilities: FrozenSet[str] = frozenset({'text'})
+    exclude_capabilities: FrozenSet[str] = frozenset({'image_generation'})
+    providers: Optional[FrozenSet[str]] = None
+    max_cost: Optional[float] = None
+    max_latency_ms: Optional[float] = None
+    prefer: str = 'cost'
+    output_tokens: int = 256
+    max_candidates: int = 3
+
+    def __post_init__(self):
+        for name in ('capabilities', 'exclude_capabilities', 'providers'):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, frozenset):
+                object.__setattr__(self, name, frozenset([value] if isinstance(value, str) else value))
+        if self.prefer not in PREFERENCES:
+            raise ValueError(f"prefer must be one of {PREFERENCES}, got '{self.prefer}'")
+        if self.max_candidates < 1:
+            raise ValueError("max_candidates must be at least 1")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RouteConstraints":
+        """
+        Builds constraints from a dict, e.g. the 'constraints' of an API request.
+
+        Raises:
+            ValueError: If a key is unknown or a value is invalid.
+        """
+        known = {field.name for field in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown routing constraints: {unknown}")
+        try:
+            return cls(**data)
+        except TypeError as e:
+            raise ValueError(f"Invalid routing constraints: {e}") from e
+
+class _Candidate(NamedTuple):
+    """The routing-relevant fields of one model config."""
+    provider: str
+    model: str
+    capabilities: FrozenSet[str]
+    context_window: Optional[int]
+    max_output: Optional[int]
+    input_cost: Optional[float]
+    output_cost: Optional[float]
+
+    def cost(self, prompt_tokens: int, output_tokens: int) -> float:
+        """Returns the estimated cost of a request in USD, or infinity without pricing."""
+        if self.input_cost is None or self.output_cost is None:
+            return math.inf
+        return (prompt_tokens * self.input_cost + output_tokens * self.output_cost) / 1_000_000
+
+def _candidate(config: Mapping[str, Any]) -> _Candidate:
+    pricing = config.get('pricing') or {}
+    return _Candidate(
+        provider=config['provider'],
+        model=config['model'],
+        # Configs that list no capabilities predate the field and describe text models
+        capabilities=frozenset(config.get('capabilities') or ('text',)),
+        context_window=config.get('context_window'),
+        max_output=config.get('max_output'),
+        input_cost=pricing.get('input_cost_per_1m_tokens'),
+        output_cost=pricing.get('output_cost_per_1m_tokens')
+    )
+
+class ModelRouter:
+    """
+    Routes requests for model 'auto' to the best models that satisfy their constraints.
+
+    The candidate pool of each combination of capabilities and providers
+    comes from the model registry's indexes, cheapest first, and is cached. A
+    decision then only filters that pool by prompt size, cost, circuit state
+    and observed latency.
+    """
+
+    def __init__(self, registry: ModelRegistry, latency: LatencyTracker, circuit_breakers: CircuitBreakerRegistry):
+        """
+        Initializes the router.
+
+        Args:
+            registry: The registry of the models to route between.
+            latency: The tracker of observed model latency.
+            circuit_breakers: The circuit breakers; models with an open circuit are skipped.
+        """
+        self.registry = registry
+        self.latency = latency
+        self.circuit_breakers = circuit_breakers
+        # Keyed by client-supplied constraints, so bounded like ModelRegistry._find
+        self._pools = lru_cache(maxsize=256)(self._pool_uncached)
+
+    def _pool(self, constraints: RouteConstraints) -> Tuple[_Candidate, ...]:
+        """Returns the candidates with the required capabilities and providers, cheapest first."""
+        return self._pools(constraints.capabilities, constraints.exclude_capabilities, constraints.providers)
+
+    def _pool_uncached(
+        self,
+        capabilities: FrozenSet[str],
+        exclude_capabilities: FrozenSet[str],
+        providers: Optional[FrozenSet[str]]
+    ) -> Tuple[_Candidate, ...]:
+        configs = self.registry.find_models(
+            capabilities=capabilities,
+            exclude_capabilities=exclude_capabilities,
+            providers=providers,
+            sort_by='price'
+        )
+        return tuple(_candidate(config) for config in configs)
+
+    def route(
+        self,
+        payload: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]] = None,
+        constraints: Optional[RouteConstraints] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Returns the models that can serve a request, best first.
+
+        Args:
+            payload: The request payload, used to estimate the prompt size.
+            parameters: The request parameters; 'max_tokens' or 'maxOutputTokens'
+                override the constraints' expected output tokens.
+            constraints: The requirements; defaults to RouteConstraints().
+
+        Returns:
+            Up to constraints.max_candidates (provider, model) pairs, to be tried in order.
+
+        Raises:
+            ValueError: If no model satisfies the constraints.
+        """
+        constraints = constraints or RouteConstraints()
+        parameters = parameters or {}
+        prompt_tokens = estimate_tokens(payload)
+        output_tokens = int(parameters.get('max_tokens') or parameters.get('maxOutputTokens') or constraints.output_tokens)
+        max_latency = None if constraints.max_latency_ms is None else constraints.max_latency_ms / 1000
+
+        ranked = []
+        for candidate in self._pool(constraints):
+            if candidate.context_window and prompt_tokens + output_tokens > candidate.context_window:
+                continue
+            if candidate.max_output and output_tokens > candidate.max_output:
+                continue
+            cost = candidate.cost(prompt_tokens, output_tokens)
+            if constraints.max_cost is not None and cost > constraints.max_cost:
+                continue
+            if self.circuit_breakers.is_open(candidate.provider, candidate.model):
+                continue
+            latency = self.latency.average(candidate.provider, candidate.model)
+            if max_latency is not None and latency is not None and latency > max_latency:
+                continue
+            if constraints.prefer == 'cost':
+                rank = (cost, len(ranked))
+            else:
+                # Models without latency data rank after measured ones, cheapest first
+                rank = (latency is None, latency or 0.0, cost, len(ranked))
+            ranked.append((rank, (candidate.provider, candidate.model)))
+
+        ranked.sort()
+        if not ranked:
+            raise ValueError(
+                f"No model satisfies the routing constraints for a request of ~{prompt_tokens + output_tokens} tokens"
+            )
+        return [route for _, route in ranked[:constraints.max_candidates]]
@@ -0,0 +1,261 @@
+"""Priority scheduling and admission control for requests entering the inventory."""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
+
+from .concurrency import Waiter
+
+# Priority classes and their default share of capacity under contention
+PRIORITY_WEIGHTS = {'interactive': 8.0, 'standard': 4.0, 'batch': 1.0}
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is not admitted: its queue is full or it cannot start before its deadline.
+
+    status_code is 429 when the caller's own queue is full, and 503 when the
+    scheduler as a whole is overloaded or the deadline cannot be met.
+    """
+
+    def __init__(self, message: str, retry_after: float, status_code: int = 503):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+class _Entry:
+    """A queued request."""
+    __slots__ = ('finish', 'seq', 'waiter', 'priority', 'tenant', 'removed')
+
+    def __init__(self, finish: float, seq: int, waiter: Waiter, priority: str, tenant: str):
+        self.finish = finish
+        self.seq = seq
+        self.waiter = waiter
+        self.priority = priority
+        self.tenant = tenant
+        self.removed = False
+
+    def __lt__(self, other: "_Entry") -> bool:
+        return (self.finish, self.seq) < (other.finish, other.seq)
+
+class RequestScheduler:
+    """
+    Admits at most max_concurrency requests at once and queues the rest by weighted fair queuing.
+
+    Each (priority class, tenant) pair is a flow whose weight is the product of
+    the class weight and the tenant weight. A queued request gets a virtual
+    finish time one 1/weight step after its flow's previous request (or after
+    the current virtual time), and the queued request with the earliest finish
+    time starts next. Interactive requests therefore overtake a batch backlog
+    while batch work still progresses, and one tenant flooding a class only
+    delays its own requests.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        max_queue: int = 256,
+        max_queue_per_tenant: Optional[int] = None,
+        priority_weights: Optional[Dict[str, float]] = None,
+        tenant_weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initializes the scheduler.
+
+        Args:
+            max_concurrency: The number of requests that may run at once.
+            max_queue: The number of requests that may wait; more are rejected with 503.
+            max_queue_per_tenant: Optional number of requests one tenant may have waiting;
+                more are rejected with 429.
+            priority_weights: Weights per priority class; defaults to PRIORITY_WEIGHTS.
+            tenant_weights: Optional weights per tenant; other tenants weigh 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_per_tenant = max_queue_per_tenant
+        self.priority_weights = dict(priority_weights or PRIORITY_WEIGHTS)
+        self.tenant_weights = dict(tenant_weights or {})
+
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.expired = 0
+        self.service_time: Optional[float] = None
+        self._queue: List[_Entry] = []
+        self._queued = 0
+        self._queued_by_priority: Dict[str, int] = {priority: 0 for priority in self.priority_weights}
+        self._queued_by_tenant: Dict[str, int] = {}
+        self._virtual_time = 0.0
+        self._flow_finish: Dict[Tuple[str, str], float] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _drain_time(self, ahead: int) -> float:
+        """Estimates the seconds until `ahead` queued requests have started."""
+        return (ahead + 1) * (self.service_time or 1.0) / self.max_concurrency
+
+    def _reject(self, message: str, retry_after: float, status_code: int = 503) -> AdmissionRejected:
+        self.rejected += 1
+        return AdmissionRejected(message, retry_after=retry_after, status_code=status_code)
+
+    def _enqueue(self, priority: str, tenant: str, deadline: Optional[float], waiter_factory) -> Optional[_Entry]:
+        """Admits a request immediately (returning None) or queues it; call with the lock held."""
+        if priority not in self.priority_weights:
+            raise ValueError(f"Unknown priority '{priority}'; expected one of {sorted(self.priority_weights)}")
+        if self.running < self.max_concurrency and not self._queued:
+            self.running += 1
+            self.admitted += 1
+            return None
+        if self._queued >= self.max_queue:
+            raise self._reject("Request queue is full", self._drain_time(self._queued))
+        tenant_queued = self._queued_by_tenant.get(tenant, 0)
+        if self.max_queue_per_tenant is not None and tenant_queued >= self.max_queue_per_tenant:
+            raise self._reject(f"Too many queued requests for tenant '{tenant}'", self._drain_time(tenant_queued), 429)
+
+        flow = (priority, tenant)
+        weight = self.priority_weights[priority] * self.tenant_weights.get(tenant, 1.0)
+        finish = max(self._virtual_time, self._flow_finish.get(flow, 0.0)) + 1.0 / weight
+        if deadline is not None and self.service_time is not None:
+            ahead = sum(1 for entry in self._queue if not entry.removed and entry.finish <= finish)
+            wait = self._drain_time(ahead)
+            if wait > deadline:
+                raise self._reject(f"Request cannot start within its {deadline:.2f}s deadline", wait)
+
+        self._flow_finish[flow] = finish
+        entry = _Entry(finish, next(self._seq), waiter_factory(), priority, tenant)
+        heapq.heappush(self._queue, entry)
+        self._queued += 1
+        self._queued_by_priority[priority] += 1
+        self._queued_by_tenant[tenant] = tenant_queued + 1
+        return entry
+
+    def _unqueue(self, entry: _Entry) -> None:
+        """Updates the queue counters for an entry leaving the queue; call with the lock held."""
+        self._queued -= 1
+        self._queued_by_priority[entry.priority] -= 1
+        self._queued_by_tenant[entry.tenant] -= 1
+        if not self._queued_by_tenant[entry.tenant]:
+            del self._queued_by_tenant[entry.tenant]
+
+    def _dispatch(self) -> None:
+        """Starts queued requests while capacity is free; call with the lock held."""
+        while self._queue and self.running < self.max_concurrency:
+            entry = heapq.heappop(self._queue)
+            if entry.removed:
+                continue
+            self._unqueue(entry)
+            self._virtual_time = entry.finish
+            self.running += 1
+            self.admitted += 1
+            entry.waiter.grant()
+        if not self._queue and len(self._flow_finish) > 1024:
+            # Finish times at or before the virtual time no longer affect scheduling
+            self._flow_finish = {flow: finish for flow, finish in self._flow_finish.items() if finish > self._virtual_time}
+
+    def _expire(self, entry: _Entry, deadline: float) -> Optional[AdmissionRejected]:
+        """Drops an entry whose deadline passed, unless it was started meanwhile; call with the lock held."""
+        if entry.waiter.granted:
+            return None
+        entry.removed = True
+        self._unqueue(entry)
+        self.expired += 1
+        return AdmissionRejected(
+            f"Request did not start within its {deadline:.2f}s deadline", retry_after=self._drain_time(self._queued)
+        )
+
+    def acquire(self, priority: str = 'standard', tenant: str = 'default', deadline: Optional[float] = None) -> None:
+        """
+        Blocks until the request may start.
+
+        Args:
+            priority: 'interactive', 'standard' or 'batch'.
+            tenant: The caller the request is accounted to.
+            deadline: Optional maximum seconds to wait before starting.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the request cannot start before its deadline.
+            ValueError: If the priority is unknown.
+        """
+        with self._lock:
+            entry = self._enqueue(priority, tenant, deadline, Waiter)
+        if entry is None or entry.waiter.event.wait(deadline):
+            return
+        with self._lock:
+            error = self._expire(entry, deadline)
+        if error is not None:
+            raise error
+
+    async def aacquire(self, priority: str = 'standard', tenant: str = 'default', deadline: Optional[float] = None) -> None:
+        """Async counterpart of acquire() that waits without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._enqueue(priority, tenant, deadline, lambda: Waiter(loop))
+        if entry is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(entry.waiter.future), deadline)
+        except asyncio.TimeoutError:
+            with self._lock:
+                error = self._expire(entry, deadline)
+            if error is not None:
+                raise error
+        except asyncio.CancelledError:
+            with self._lock:
+                if entry.waiter.granted:
+                    self.running -= 1
+                    self._dispatch()
+                else:
+                    entry.removed = True
+                    self._unqueue(entry)
+            raise
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """
+        Marks a started request as finished and starts the next queued ones.
+
+        Args:
+            service_time: How long the request ran, used to estimate queue wait times.
+        """
+        with self._lock:
+            self.running -= 1
+            if service_time is not None:
+                self.service_time = service_time if self.service_time is None else 0.9 * self.service_time + 0.1 * service_time
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, priority: str = 'standard', tenant: str = 'default', deadline: Optional[float] = None) -> Iterator[None]:
+        """Runs the body of a with-statement as an admitted request."""
+        self.acquire(priority, tenant, deadline)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start_time)
+
+    @asynccontextmanager
+    async def aslot(self, priority: str = 'standard', tenant: str = 'default', deadline: Optional[float] = None) -> AsyncIterator[None]:
+        """Async counterpart of slot()."""
+        await self.aacquire(priority, tenant, deadline)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start_time)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the running and queued requests, per priority, and the admission counters."""
+        with self._lock:
+            return {
+                'running': self.running,
+                'queued': self._queued,
+                'queued_by_priority': dict(self._queued_by_priority),
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'expired': self.expired,
+                'service_time_ms': self.service_time * 1000 if self.service_time is not None else None
+            }
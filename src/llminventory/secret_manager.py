@@ -1,8 +1,10 @@
 """Manages loading and retrieving API secrets from a YAML file."""
 
-import yaml
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
+
+# Per-key settings carried along with an API key
+_CREDENTIAL_FIELDS = ('api_key', 'organization', 'project')
 
 class SecretManager:
     """Loads and provides access to API keys from a specified secrets file."""
@@ -15,6 +17,7 @@ class SecretManager:
             secrets_file: The path to the YAML file containing API secrets.
         """
         self._secrets: Dict[str, Any] = {}
+        self._version = 0
         if secrets_file:
             self.load_secrets(secrets_file)
 
@@ -22,18 +25,42 @@ class SecretManager:
         """
         Loads secrets from the given YAML file.
 
+        The file is parsed and validated before the new secrets replace the old
+        ones in a single assignment, so concurrent readers never block and a
+        broken file leaves the current secrets in place.
+
         Args:
             secrets_file: The path to the YAML secrets file.
 
         Raises:
             FileNotFoundError: If the secrets file does not exist.
             yaml.YAMLError: If the file is not valid YAML.
+            ValueError: If the file does not map provider names to settings.
         """
         if not secrets_file.is_file():
             raise FileNotFoundError(f"Secrets file not found at: {secrets_file}")
 
+        # Imported here, so that importing the package does not pay for it
+        import yaml
         with open(secrets_file, 'r', encoding='utf-8') as f:
-            self._secrets = yaml.safe_load(f)
+            secrets = yaml.safe_load(f) or {}
+        if not isinstance(secrets, dict) or not all(isinstance(settings, dict) for settings in secrets.values()):
+            raise ValueError(f"Secrets file {secrets_file} must map each provider name to its settings")
+        self._secrets = secrets
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """
+        A counter incremented every time secrets are (re)loaded.
+
+        Consumers that cache objects built from secrets compare it to detect a reload.
+        """
+        return self._version
+
+    def providers(self) -> List[str]:
+        """Returns the names of the providers that have settings in the secrets file."""
+        return list(self._secrets)
 
     def get_secret(self, provider_name: str) -> Optional[str]:
         """
@@ -45,4 +72,34 @@ class SecretManager:
         Returns:
             The API key as a string, or None if not found.
         """
-        return self._secrets.get(provider_name, {}).get('api_key')
\ No newline at end of file
+        credentials = self.get_credentials(provider_name)
+        return credentials[0]['api_key'] if credentials else None
+
+    def get_credentials(self, provider_name: str) -> List[Dict[str, str]]:
+        """
+        Retrieves every API key configured for a provider.
+
+        A provider may set a single 'api_key' and/or a list under 'api_keys', whose
+        entries are either keys or mappings with 'api_key' and optionally
+        'organization' and 'project'.
+
+        Args:
+            provider_name: The name of the provider (e.g., 'openai', 'anthropic').
+
+        Returns:
+            One dict per key with 'api_key' and any 'organization'/'project', in file order.
+        """
+        settings = self._secrets.get(provider_name, {})
+        entries = []
+        if settings.get('api_key'):
+            entries.append(settings)
+        for entry in settings.get('api_keys') or []:
+            entries.append(entry if isinstance(entry, dict) else {'api_key': entry})
+        return [
+            {field: str(entry[field]) for field in _CREDENTIAL_FIELDS if entry.get(field)}
+            for entry in entries if entry.get('api_key')
+        ]
+
+    def get_key_selection(self, provider_name: str) -> str:
+        """Returns how requests are spread over a provider's keys: 'least_loaded' (default) or 'round_robin'."""
+        return self._secrets.get(provider_name, {}).get('key_selection', 'least_loaded')
\ No newline at end of file
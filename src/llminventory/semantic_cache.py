@@ -0,0 +1,226 @@
+"""A semantic response cache that matches near-duplicate prompts by embedding similarity."""
+
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+
+from .lazy_imports import LazyModule, ensure_imported
+
+# Imported by the first SemanticCache: numpy is only required when one is used
+np = LazyModule('numpy', "SemanticCache requires numpy. Install it with: pip install numpy")
+
+def prompt_text(payload: Dict[str, Any]) -> str:
+    """
+    Extracts the text to embed from a request payload.
+
+    Supports the 'messages' (OpenAI-style), 'contents' (Gemini) and 'prompt' formats.
+    Each turn is prefixed with its role, so that the same text said by a different
+    role does not match.
+
+    Args:
+        payload: The request payload.
+
+    Returns:
+        The prompt text, or an empty string if the payload carries no text.
+    """
+    turns: List[str] = []
+    for message in payload.get('messages') or []:
+        content = message.get('content', '')
+        if isinstance(content, list):
+            content = ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+        turns.append(f"{message.get('role', 'user')}: {content}")
+    for content in payload.get('contents') or []:
+        text = ' '.join(part.get('text', '') for part in content.get('parts', []))
+        turns.append(f"{content.get('role', 'user')}: {text}")
+    if isinstance(payload.get('prompt'), str):
+        turns.append(payload['prompt'])
+    return '\n'.join(turns)
+
+class SemanticCache:
+    """
+    Returns stored responses for prompts whose embeddings are close to a previous one.
+
+    Entries live in a preallocated float32 matrix of unit vectors, so a lookup is
+    a single matrix-vector product. Entries are partitioned by a namespace (the
+    model and its parameters), and the least recently used entry is evicted once
+    the index is full.
+    """
+
+    def __init__(
+        self,
+        embedding_provider: str = 'google',
+        embedding_model: str = 'text-embedding-004',
+        threshold: float = 0.95,
+        max_entries: int = 10_000,
+        index_dir: Optional[Path] = None
+    ):
+        """
+        Initializes the cache, loading a previously saved index if present.
+
+        Args:
+            embedding_provider: The provider of the embedding model used for prompts.
+            embedding_model: An embedding model from the inventory (e.g. 'text-embedding-004').
+            threshold: The minimum cosine similarity for a stored response to be reused.
+            max_entries: The maximum number of entries in the index.
+            index_dir: Optional directory the index is persisted to by save().
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        ensure_imported(np)
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.embedding_provider = embedding_provider
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.index_dir = Path(index_dir) if index_dir else None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lookup_seconds = 0.0
+        self._embedding_seconds = 0.0
+        self._embeddings = 0
+
+        self._lock = threading.Lock()
+        self._vectors = None  # allocated once the embedding dimension is known
+        self._namespaces: List[Optional[str]] = []
+        self._responses: List[Optional[Dict[str, Any]]] = []
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._size = 0
+
+        if self.index_dir and (self.index_dir / 'vectors.npy').exists():
+            self.load()
+
+    def record_embedding_time(self, seconds: float) -> None:
+        """Records the time spent embedding a prompt for a lookup."""
+        with self._lock:
+            self._embedding_seconds += seconds
+            self._embeddings += 1
+
+    def _normalize(self, vector: Sequence[float]) -> "np.ndarray":
+        """Returns the vector as a float32 unit vector."""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def lookup(self, namespace: str, vector: Sequence[float]) -> Optional[Dict[str, Any]]:
+        """
+        Finds the stored response with the most similar prompt in a namespace.
+
+        Args:
+            namespace: The namespace of the request (its model and parameters).
+            vector: The embedding of the prompt.
+
+        Returns:
+            The stored response if its similarity reaches the threshold, otherwise None.
+        """
+        start_time = time.perf_counter()
+        query = self._normalize(vector)
+        with self._lock:
+            response = None
+            if self._size and self._vectors is not None and self._vectors.shape[1] == query.shape[0]:
+                similarities = self._vectors[:self._size] @ query
+                in_namespace = np.fromiter(
+                    (ns == namespace for ns in self._namespaces[:self._size]), dtype=bool, count=self._size
+                )
+                similarities[~in_namespace] = -np.inf
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    response = self._responses[best]
+                    self._last_used[best] = time.monotonic()
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._lookup_seconds += time.perf_counter() - start_time
+        return json.loads(json.dumps(response)) if response is not None else None
+
+    def add(self, namespace: str, vector: Sequence[float], response: Dict[str, Any]) -> None:
+        """
+        Stores a response under the embedding of its prompt.
+
+        Args:
+            namespace: The namespace of the request (its model and parameters).
+            vector: The embedding of the prompt.
+            response: The provider response; a copy is stored, so that the caller
+                may modify it.
+        """
+        entry = self._normalize(vector)
+        response = copy.deepcopy(response)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != entry.shape[0]:
+                # First entry, or the embedding model changed: start a fresh index
+                self._vectors = np.zeros((self.max_entries, entry.shape[0]), dtype=np.float32)
+                self._namespaces = [None] * self.max_entries
+                self._responses = [None] * self.max_entries
+                self._size = 0
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+            self._vectors[slot] = entry
+            self._namespaces[slot] = namespace
+            self._responses[slot] = response
+            self._last_used[slot] = time.monotonic()
+
+    def save(self) -> None:
+        """
+        Writes the index to index_dir, replacing any previous copy atomically.
+
+        Raises:
+            ValueError: If the cache has no index_dir.
+        """
+        if self.index_dir is None:
+            raise ValueError("SemanticCache.save() requires an index_dir")
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if self._vectors is None:
+                return
+            vectors = self._vectors[:self._size].copy()
+            entries = {
+                'namespaces': self._namespaces[:self._size],
+                'responses': self._responses[:self._size]
+            }
+        vectors_tmp = self.index_dir / 'vectors.tmp.npy'
+        entries_tmp = self.index_dir / 'entries.json.tmp'
+        np.save(vectors_tmp, vectors)
+        entries_tmp.write_text(json.dumps(entries), encoding='utf-8')
+        os.replace(vectors_tmp, self.index_dir / 'vectors.npy')
+        os.replace(entries_tmp, self.index_dir / 'entries.json')
+
+    def load(self) -> None:
+        """Replaces the in-memory index with the copy saved in index_dir."""
+        vectors = np.load(self.index_dir / 'vectors.npy')
+        entries = json.loads((self.index_dir / 'entries.json').read_text(encoding='utf-8'))
+        count = min(len(vectors), len(entries['responses']), self.max_entries)
+        with self._lock:
+            self._vectors = np.zeros((self.max_entries, vectors.shape[1]), dtype=np.float32)
+            self._vectors[:count] = vectors[:count]
+            self._namespaces = entries['namespaces'][:count] + [None] * (self.max_entries - count)
+            self._responses = entries['responses'][:count] + [None] * (self.max_entries - count)
+            self._last_used[:count] = time.monotonic()
+            self._size = count
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit rate, size and average lookup and embedding latency in milliseconds."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': self._size,
+            'evictions': self.evictions,
+            'avg_lookup_ms': self._lookup_seconds / lookups * 1000 if lookups else 0.0,
+            'avg_embedding_ms': self._embedding_seconds / self._embeddings * 1000 if self._embeddings else 0.0
+        }
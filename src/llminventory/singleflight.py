@@ -0,0 +1,133 @@
+"""Coalesces concurrent identical requests into one upstream call (single-flight)."""
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Parameters that fix the sampling of a request, so identical requests may share one answer
+_SEED_PARAMETERS = ('seed', 'randomSeed', 'random_seed')
+
+def is_deterministic(parameters: Optional[Dict[str, Any]]) -> bool:
+    """
+    Returns whether requests with these parameters are expected to get the same answer.
+
+    That is the case with a temperature of 0 or with a sampling seed.
+    """
+    parameters = parameters or {}
+    if any(parameters.get(name) is not None for name in _SEED_PARAMETERS):
+        return True
+    return parameters.get('temperature') == 0
+
+class _Abandoned(Exception):
+    """Set on a flight whose leader was cancelled, so that a waiting caller takes over."""
+
+class SingleFlight:
+    """
+    Lets concurrent callers with the same key share one call.
+
+    The first caller of a key runs the call; callers arriving while it is in
+    flight wait for it and receive a deep copy of its result, or its error.
+    Flights are concurrent.futures.Future objects, so threads and asyncio
+    tasks (of any event loop) share them alike. A flight ends with its call:
+    later callers start a new one. If the caller running a call is cancelled,
+    one of the waiting callers runs it instead.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Returns the flight of a key and whether the caller leads it."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = Future()
+            self.calls += 1
+            return flight, True
+
+    def _land(self, key: str, flight: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            del self._flights[key]
+        if error is None:
+            flight.set_result(result)
+        else:
+            flight.set_exception(error)
+
+    def _count_shared(self) -> None:
+        with self._lock:
+            self.shared += 1
+
+    def do(self, key: str, call: Callable[[], T]) -> T:
+        """
+        Runs call() unless a call with the same key is in flight, and returns its result.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        while True:
+            flight, leader = self._join(key)
+            if leader:
+                try:
+                    result = call()
+                except Exception as e:
+                    self._land(key, flight, error=e)
+                    raise
+                except BaseException:
+                    self._land(key, flight, error=_Abandoned())
+                    raise
+                self._land(key, flight, result)
+                return result
+            try:
+                result = flight.result()
+            except _Abandoned:
+                continue
+            except Exception:
+                self._count_shared()
+                raise
+            self._count_shared()
+            return copy.deepcopy(result)
+
+    async def ado(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Async counterpart of do() that waits without blocking the event loop."""
+        while True:
+            flight, leader = self._join(key)
+            if leader:
+                try:
+                    result = await call()
+                except Exception as e:
+                    self._land(key, flight, error=e)
+                    raise
+                except BaseException:
+                    self._land(key, flight, error=_Abandoned())
+                    raise
+                self._land(key, flight, result)
+                return result
+            try:
+                # Shielded so that a cancelled waiter does not cancel the flight for the others
+                result = await asyncio.shield(asyncio.wrap_future(flight))
+            except _Abandoned:
+                continue
+            except Exception:
+                self._count_shared()
+                raise
+            self._count_shared()
+            return copy.deepcopy(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the upstream calls made, the callers that shared one, and the calls in flight."""
+        with self._lock:
+            total = self.calls + self.shared
+            return {
+                'calls': self.calls,
+                'shared': self.shared,
+                'in_flight': len(self._flights),
+                'shared_rate': self.shared / total if total else 0.0
+            }
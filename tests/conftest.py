@@ -7,4 +7,73 @@ from pathlib import Path
 # to resolve correctly when pytest is run from the project root.
 
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root / "src"))
\ No newline at end of file
+sys.path.insert(0, str(project_root / "src"))
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubProviderServer:
+    """
+    A local HTTP server standing in for a provider API.
+
+    Every POST is recorded in `requests` and answered with the next entry of
+    `responses` (status, body, headers), or with `default_response` once they run out,
+    after `response_delay` seconds.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+        self.default_response = (200, {"choices": [{"message": {"role": "assistant", "content": "pong"}}]}, {})
+        self.response_delay = 0.0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b"null")
+                with stub._lock:
+                    stub.requests.append({"path": self.path, "headers": dict(self.headers), "body": body})
+                    status, response_body, headers = stub.responses.pop(0) if stub.responses else stub.default_response
+                if stub.response_delay:
+                    time.sleep(stub.response_delay)
+                if isinstance(response_body, (bytes, str)):
+                    data = response_body.encode('utf-8') if isinstance(response_body, str) else response_body
+                else:
+                    data = json.dumps(response_body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', headers.get('Content-Type', 'application/json'))
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    if name != 'Content-Type':
+                        self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    """Starts a StubProviderServer for the duration of a test."""
+    server = StubProviderServer()
+    yield server
+    server.close()
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import pytest
+from src.llminventory.adapters import BaseAdapter, OpenAIAdapter, GoogleAdapter, AnthropicAdapter
+from src.llminventory.adapters.retry import ProviderHTTPError
+from src.llminventory.adapters.sse import iter_sse_events, iter_sse_lines
+
+@pytest.fixture(autouse=True)
+def reset_sessions():
+    """Ensures every test starts and ends with an empty session pool."""
+    BaseAdapter.close_sessions()
+    yield
+    BaseAdapter.close_sessions()
+
+def test_sessions_are_shared_per_host():
+    """Test that adapters reuse one keep-alive session per scheme and host."""
+    first = OpenAIAdapter(api_key="key-1")._get_session("https://api.openai.com/v1/chat/completions")
+    second = OpenAIAdapter(api_key="key-2")._get_session("https://api.openai.com/v1/images/generations")
+    other_host = OpenAIAdapter(api_key="key-1")._get_session("https://api.mistral.ai/v1/chat/completions")
+    assert first is second
+    assert first is not other_host
+
+def test_configure_pool_applies_limits_to_new_sessions():
+    """Test that pool limits are applied to sessions created after configure_pool."""
+    original = (BaseAdapter.pool_connections, BaseAdapter.pool_maxsize)
+    try:
+        BaseAdapter.configure_pool(pool_connections=3, pool_maxsize=7)
+        session = OpenAIAdapter(api_key="key")._get_session("https://api.openai.com/v1/chat/completions")
+        http_adapter = session.get_adapter("https://api.openai.com")
+        assert http_adapter._pool_connections == 3
+        assert http_adapter._pool_maxsize == 7
+    finally:
+        BaseAdapter.configure_pool(pool_connections=original[0], pool_maxsize=original[1])
+
+def test_timeout_from_model_config_overrides_adapter_default():
+    """Test that a model's 'timeout' takes precedence over the adapter default."""
+    adapter = GoogleAdapter(api_key="key")
+    assert adapter._get_timeout({}) == 30
+    assert adapter._get_timeout({'timeout': None}) == 30
+    assert adapter._get_timeout({'timeout': 5}) == 5
+    assert OpenAIAdapter(api_key="key")._get_timeout({}) == 60
+
+def test_invoke_posts_through_pooled_session(stub_server):
+    """Test that a sync invoke sends the prepared request and returns the JSON body."""
+    model_config = {'model': 'gpt-4o-mini', 'endpoint': f"{stub_server.url}/v1/chat/completions"}
+    payload = {"messages": [{"role": "user", "content": "ping"}]}
+    response = OpenAIAdapter(api_key="sk-test").invoke(model_config, payload, {"temperature": 0.5})
+
+    assert response["choices"][0]["message"]["content"] == "pong"
+    request = stub_server.requests[0]
+    assert request["headers"]["Authorization"] == "Bearer sk-test"
+    assert request["body"] == {"model": "gpt-4o-mini", **payload, "temperature": 0.5}
+
+def test_ainvoke_matches_invoke(stub_server):
+    """Test that the async path sends the same request as the sync path."""
+    model_config = {'model': 'gpt-4o-mini', 'endpoint': f"{stub_server.url}/v1/chat/completions"}
+    payload = {"messages": [{"role": "user", "content": "ping"}]}
+    adapter = OpenAIAdapter(api_key="sk-test")
+
+    async def run():
+        try:
+            return await adapter.ainvoke(model_config, payload)
+        finally:
+            await BaseAdapter.aclose_sessions()
+
+    response = asyncio.run(run())
+    assert response["choices"][0]["message"]["content"] == "pong"
+    assert stub_server.requests[0]["body"] == {"model": "gpt-4o-mini", **payload}
+
+def test_http_errors_raise_connection_error(stub_server):
+    """Test that fatal HTTP error statuses surface as ConnectionError on both paths without retrying."""
+    model_config = {'model': 'gpt-4o-mini', 'endpoint': f"{stub_server.url}/v1/chat/completions"}
+    payload = {"messages": [{"role": "user", "content": "ping"}]}
+    stub_server.responses = [(400, {"error": "boom"}, {}), (400, {"error": "boom"}, {})]
+    adapter = OpenAIAdapter(api_key="sk-test")
+
+    with pytest.raises(ProviderHTTPError, match="Failed to connect to OpenAI API") as excinfo:
+        adapter.invoke(model_config, payload)
+    assert isinstance(excinfo.value, ConnectionError)
+    assert excinfo.value.status_code == 400
+    with pytest.raises(ConnectionError, match="Failed to connect to OpenAI API"):
+        asyncio.run(adapter.ainvoke(model_config, payload))
+    assert len(stub_server.requests) == 2
+
+def test_transient_statuses_are_retried_honoring_retry_after(stub_server):
+    """Test that 429/503 responses are retried after the provider's requested delay."""
+    model_config = {'model': 'gpt-4o-mini', 'endpoint': f"{stub_server.url}/v1/chat/completions"}
+    payload = {"messages": [{"role": "user", "content": "ping"}]}
+    stub_server.responses = [
+        (429, {"error": "slow down"}, {"Retry-After": "0"}),
+        (503, {"error": "unavailable"}, {"retry-after-ms": "10"}),
+    ]
+    adapter = OpenAIAdapter(api_key="sk-test")
+
+    response = adapter.invoke(model_config, payload)
+
+    assert response["choices"][0]["message"]["content"] == "pong"
+    assert len(stub_server.requests) == 3
+    stats = BaseAdapter.retry_stats()["OpenAI"]
+    assert stats["reasons"]["429"] >= 1 and stats["reasons"]["503"] >= 1
+
+def test_retries_stop_at_max_attempts(stub_server):
+    """Test that a model's retry overrides bound the attempts, on the async path as well."""
+    model_config = {
+        'model': 'gpt-4o-mini',
+        'endpoint': f"{stub_server.url}/v1/chat/completions",
+        'retry': {'max_attempts': 2, 'base_delay': 0.001}
+    }
+    stub_server.responses = [(500, {"error": "boom"}, {})] * 3
+    adapter = OpenAIAdapter(api_key="sk-test")
+
+    with pytest.raises(ProviderHTTPError) as excinfo:
+        asyncio.run(adapter.ainvoke(model_config, {"messages": []}))
+    assert excinfo.value.status_code == 500
+    assert len(stub_server.requests) == 2
+
+def test_google_prepare_request_uses_embed_endpoint_for_embedding_models():
+    """Test that Google embedding models are routed to embedContent."""
+    adapter = GoogleAdapter(api_key="google-key")
+    model_config = {'model': 'text-embedding-004', 'capabilities': ['embeddings']}
+    url, request = adapter._prepare_request(model_config, {"input": "hello"}, {"dimensions": 768})
+    assert url.endswith("/text-embedding-004:embedContent")
+    assert request["params"] == {"key": "google-key"}
+    assert request["json"] == {"content": {"parts": [{"text": "hello"}]}, "outputDimensionality": 768}
+
+def test_google_embed_batch_uses_batch_endpoint():
+    """Test that Google batches are sent to batchEmbedContents with one request per text."""
+    adapter = GoogleAdapter(api_key="google-key")
+    model_config = {'model': 'text-embedding-004', 'capabilities': ['embeddings']}
+    url, request = adapter._prepare_embedding_batch_request(model_config, ["a", "b"], {"dimensions": 8})
+    assert url.endswith("/text-embedding-004:batchEmbedContents")
+    assert request["json"] == {"requests": [
+        {"model": "models/text-embedding-004", "content": {"parts": [{"text": "a"}]}, "outputDimensionality": 8},
+        {"model": "models/text-embedding-004", "content": {"parts": [{"text": "b"}]}, "outputDimensionality": 8},
+    ]}
+    assert adapter._parse_embedding_batch({"embeddings": [{"values": [1.0]}, {"values": [2.0]}]}) == [[1.0], [2.0]]
+
+def test_embed_batch_rejects_oversized_batches():
+    """Test that a batch above the provider limit is rejected before sending."""
+    adapter = GoogleAdapter(api_key="google-key")
+    model_config = {'model': 'text-embedding-004', 'capabilities': ['embeddings']}
+    with pytest.raises(ValueError, match="at most 100 texts"):
+        adapter.embed_batch(model_config, ["text"] * 101)
+
+def test_async_concurrency_is_not_capped_by_keepalive_pool(stub_server):
+    """Test that more concurrent async requests than pool_maxsize run at once instead of waiting for a connection."""
+    original = BaseAdapter.pool_maxsize
+    BaseAdapter.configure_pool(pool_maxsize=2)
+    stub_server.response_delay = 0.3
+    # The timeout also bounds the wait for a pooled connection: queued behind two connections, the last would time out
+    model_config = {'model': 'gpt-4o-mini', 'endpoint': f"{stub_server.url}/v1/chat/completions", 'timeout': 0.9}
+    adapter = OpenAIAdapter(api_key="sk-test")
+    payload = {"messages": [{"role": "user", "content": "hi"}]}
+
+    async def run():
+        try:
+            responses = await asyncio.gather(*(adapter.ainvoke(model_config, payload) for _ in range(8)))
+            limits = BaseAdapter._get_async_client(model_config['endpoint'])._transport._pool
+            return responses, limits._max_connections, limits._max_keepalive_connections
+        finally:
+            await BaseAdapter.aclose_sessions()
+
+    try:
+        responses, max_connections, max_keepalive = asyncio.run(run())
+    finally:
+        BaseAdapter.configure_pool(pool_maxsize=original)
+    assert len(responses) == 8 and len(stub_server.requests) == 8
+    assert max_connections == BaseAdapter.async_max_connections
+    assert max_keepalive == 2
+
+def test_invoke_stream_parses_openai_sse_chunks(stub_server):
+    """Test that OpenAI-compatible SSE chunks are normalized into deltas on both paths, skipping data-less events."""
+    sse_body = (
+        'data: {"choices": [{"delta": {"role": "assistant"}, "finish_reason": null}]}\n\n'
+        'data: {"choices": [{"delta": {"content": "Hel"}, "finish_reason": null}]}\n\n'
+        ': keep-alive\n\n'
+        'event: ping\n\n'
+        'data: {"choices": [{"delta": {"content": "lo"}, "finish_reason": null}]}\n\n'
+        'data: {"choices": [{"delta": {}, "finish_reason": "stop"}]}\n\n'
+        'data: [DONE]\n\n'
+    )
+    stub_server.responses = [(200, sse_body, {"Content-Type": "text/event-stream"})] * 2
+    model_config = {'model': 'gpt-4o-mini', 'endpoint': f"{stub_server.url}/v1/chat/completions"}
+    payload = {"messages": [{"role": "user", "content": "hi"}]}
+    adapter = OpenAIAdapter(api_key="sk-test")
+    expected = [
+        {'delta': 'Hel', 'finish_reason': None},
+        {'delta': 'lo', 'finish_reason': None},
+        {'delta': '', 'finish_reason': 'stop'},
+    ]
+
+    assert list(adapter.invoke_stream(model_config, payload, {"stream": False})) == expected
+    assert stub_server.requests[0]["body"]["stream"] is True
+
+    async def run():
+        try:
+            return [chunk async for chunk in adapter.ainvoke_stream(model_config, payload)]
+        finally:
+            await BaseAdapter.aclose_sessions()
+
+    assert asyncio.run(run()) == expected
+
+def test_invoke_stream_decodes_utf8_without_charset(stub_server):
+    """Test that streamed text is decoded as UTF-8 when the Content-Type names no charset."""
+    # 'Å' is C3 85 in UTF-8: decoded as ISO-8859-1, 0x85 would break the line in two
+    text = "héllo 世界 Å\u2028end"
+    sse_body = (
+        'data: ' + json.dumps({"choices": [{"delta": {"content": text}, "finish_reason": None}]}, ensure_ascii=False) + '\r\n\r\n'
+        'data: [DONE]\n\n'
+    ).encode('utf-8')
+    stub_server.responses = [(200, sse_body, {"Content-Type": "text/event-stream"})] * 2
+    model_config = {'model': 'gpt-4o-mini', 'endpoint': f"{stub_server.url}/v1/chat/completions"}
+    payload = {"messages": [{"role": "user", "content": "hi"}]}
+    adapter = OpenAIAdapter(api_key="sk-test")
+    expected = [{'delta': text, 'finish_reason': None}]
+
+    assert list(adapter.invoke_stream(model_config, payload)) == expected
+
+    async def run():
+        try:
+            return [chunk async for chunk in adapter.ainvoke_stream(model_config, payload)]
+        finally:
+            await BaseAdapter.aclose_sessions()
+
+    assert asyncio.run(run()) == expected
+
+def test_sse_line_decoder_handles_split_chunks():
+    """Test that line terminators and multi-byte characters split across chunks are reassembled."""
+    data = "data: é\r\ndata: 世\rlast".encode('utf-8')
+    chunks = [data[i:i + 1] for i in range(len(data))]
+    assert list(iter_sse_lines(chunks)) == ["data: é", "data: 世", "last"]
+
+def test_anthropic_stream_events_are_normalized():
+    """Test that Anthropic text deltas and stop reasons become normalized chunks."""
+    adapter = AnthropicAdapter(api_key="key")
+    assert adapter._parse_stream_event('message_start', '{"type": "message_start"}') is None
+    assert adapter._parse_stream_event(
+        'content_block_delta', '{"delta": {"type": "text_delta", "text": "Hi"}}'
+    ) == {'delta': 'Hi', 'finish_reason': None}
+    assert adapter._parse_stream_event(
+        'message_delta', '{"delta": {"stop_reason": "end_turn"}}'
+    ) == {'delta': '', 'finish_reason': 'end_turn'}
+    with pytest.raises(ConnectionError):
+        adapter._parse_stream_event('error', '{"type": "overloaded_error"}')
+
+def test_google_stream_request_and_events():
+    """Test that Gemini streams use streamGenerateContent with alt=sse."""
+    adapter = GoogleAdapter(api_key="google-key")
+    url, request = adapter._prepare_stream_request({'model': 'gemini-1.5-flash'}, {"contents": []})
+    assert url.endswith("/gemini-1.5-flash:streamGenerateContent")
+    assert request["params"] == {"key": "google-key", "alt": "sse"}
+    assert adapter._parse_stream_event(
+        'message', '{"candidates": [{"content": {"parts": [{"text": "Hi"}]}, "finishReason": "STOP"}]}'
+    ) == {'delta': 'Hi', 'finish_reason': 'STOP'}
+
+def test_sse_parser_handles_multiline_data():
+    """Test that multi-line data fields are joined and named events are kept."""
+    lines = ["event: update", "data: line one", "data: line two", "", "data: tail"]
+    assert list(iter_sse_events(lines)) == [("update", "line one\nline two"), ("message", "tail")]
+
+def test_sse_parser_discards_events_without_data():
+    """Test that events with no data field, e.g. pings, are not dispatched."""
+    lines = ["event: ping", "", "event: ping", "data:", "", ": comment", "", "data: kept", ""]
+    assert list(iter_sse_events(lines)) == [("message", "kept")]
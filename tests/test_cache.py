@@ -0,0 +1,96 @@
+import threading
+import time
+import pytest
+from src.llminventory.cache import InMemoryResponseCache, SQLiteResponseCache, make_cache_key
+
+def test_make_cache_key_ignores_dict_ordering():
+    """Test that logically identical requests produce the same key."""
+    first = make_cache_key("openai", "gpt-4o", {"messages": [], "user": "a"}, {"temperature": 0.0, "top_p": 1.0})
+    second = make_cache_key("openai", "gpt-4o", {"user": "a", "messages": []}, {"top_p": 1.0, "temperature": 0.0})
+    assert first == second
+    assert first != make_cache_key("openai", "gpt-4o", {"messages": [], "user": "a"}, {"temperature": 0.5})
+    assert first != make_cache_key("openai", "gpt-4o-mini", {"messages": [], "user": "a"}, {"temperature": 0.0})
+
+def test_in_memory_cache_hit_and_miss_counters():
+    """Test that lookups record hits and misses."""
+    cache = InMemoryResponseCache(max_entries=4)
+    assert cache.get("k") is None
+    cache.set("k", {"answer": 42})
+    assert cache.get("k") == {"answer": 42}
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'size': 1, 'evictions': 0}
+
+def test_in_memory_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted first."""
+    cache = InMemoryResponseCache(max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.get("a")
+    cache.set("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+    assert cache.evictions == 1
+
+def test_in_memory_cache_expires_entries():
+    """Test that entries are dropped once their TTL has passed."""
+    cache = InMemoryResponseCache(ttl=0.01)
+    cache.set("k", {"v": 1})
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+def test_in_memory_cache_returns_copies():
+    """Test that mutating a returned response does not corrupt the cache."""
+    cache = InMemoryResponseCache()
+    cache.set("k", {"choices": [{"text": "hi"}]})
+    cache.get("k")["choices"].clear()
+    assert cache.get("k") == {"choices": [{"text": "hi"}]}
+
+def test_in_memory_cache_rejects_invalid_size():
+    """Test that a non-positive max_entries is rejected."""
+    with pytest.raises(ValueError):
+        InMemoryResponseCache(max_entries=0)
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    """Test that a response stored by one cache instance is visible to another."""
+    db_path = tmp_path / "cache" / "responses.sqlite3"
+    SQLiteResponseCache(db_path).set("k", {"choices": [{"text": "hi"}]})
+
+    reopened = SQLiteResponseCache(db_path)
+    assert reopened.get("k") == {"choices": [{"text": "hi"}]}
+    assert reopened.get("missing") is None
+    assert reopened.stats()['hits'] == 1
+
+def test_sqlite_cache_expires_entries(tmp_path):
+    """Test that expired entries are treated as misses and removed."""
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite3", ttl=0.01)
+    cache.set("k", {"v": 1})
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+def test_sqlite_cache_bounds_size(tmp_path):
+    """Test that the least recently used entries are evicted beyond max_entries."""
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite3", max_entries=3)
+    cache.EVICTION_INTERVAL = 1
+    for i in range(5):
+        cache.set(f"k{i}", {"v": i})
+    assert len(cache) == 3
+    assert cache.get("k0") is None
+    assert cache.get("k4") == {"v": 4}
+
+def test_sqlite_cache_is_shared_between_concurrent_writers(tmp_path):
+    """Test that several instances on one file can write concurrently."""
+    db_path = tmp_path / "responses.sqlite3"
+    caches = [SQLiteResponseCache(db_path) for _ in range(4)]
+
+    def write(index):
+        for i in range(25):
+            caches[index].set(f"{index}-{i}", {"v": i})
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(SQLiteResponseCache(db_path)) == 100
@@ -0,0 +1,65 @@
+import time
+import pytest
+from src.llminventory.adapters.retry import ProviderHTTPError
+from src.llminventory.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, is_provider_failure
+
+def fail(breaker, error=None):
+    breaker.before_call()
+    breaker.record(error or ConnectionError("down"))
+
+def test_opens_at_failure_rate_and_fails_fast():
+    """Test that the circuit opens once the failure rate is reached over min_calls."""
+    breaker = CircuitBreaker("openai/gpt-4o-mini", failure_rate=0.5, min_calls=4, open_seconds=30)
+    breaker.before_call()
+    breaker.record(latency=0.1)
+    fail(breaker)
+    breaker.before_call()
+    breaker.record(latency=0.1)
+    assert breaker.state == "closed"
+    fail(breaker)
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert isinstance(excinfo.value, ConnectionError)
+    assert 29 < excinfo.value.retry_after <= 30
+    assert breaker.snapshot()["rejected"] == 1
+
+def test_half_open_probe_closes_or_reopens():
+    """Test that one probe is admitted after open_seconds and decides the next state."""
+    breaker = CircuitBreaker("m", min_calls=1, open_seconds=0.05)
+    fail(breaker)
+    time.sleep(0.06)
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record(ConnectionError("still down"))
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record(latency=0.01)
+    assert breaker.state == "closed"
+
+def test_slow_calls_count_as_failures():
+    """Test that calls above slow_call_seconds open the circuit."""
+    breaker = CircuitBreaker("m", min_calls=2, slow_call_seconds=1.0)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record(latency=2.0)
+    assert breaker.state == "open"
+
+def test_client_errors_do_not_count():
+    """Test that only provider-side errors count as failures."""
+    assert is_provider_failure(ProviderHTTPError("boom", 503))
+    assert is_provider_failure(ProviderHTTPError("slow down", 429))
+    assert not is_provider_failure(ProviderHTTPError("bad request", 400))
+    assert not is_provider_failure(ValueError("invalid parameter"))
+
+def test_registry_keeps_one_breaker_per_model():
+    """Test that breakers are created per provider model with shared settings."""
+    registry = CircuitBreakerRegistry(min_calls=3)
+    assert registry.get("openai", "a") is registry.get("openai", "a")
+    assert registry.get("openai", "b").min_calls == 3
+    assert set(registry.snapshot()) == {"openai/a", "openai/b"}
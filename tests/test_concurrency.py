@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.llminventory.adapters.retry import ProviderHTTPError
+from src.llminventory.concurrency import AdaptiveLimit, ConcurrencyLimiter, is_overload
+from src.llminventory.rate_limiter import RateLimitExceeded
+
+def run_call(limit, error=None, latency=0.1):
+    limit.acquire()
+    limit.release(error, latency)
+
+def test_limit_grows_additively_while_in_use():
+    """Test that successes at the limit add about one slot per round of calls."""
+    limit = AdaptiveLimit("openai", initial_limit=2, max_limit=3)
+    for _ in range(2):
+        limit.acquire()
+    limit.release(latency=0.1)
+    limit.release(latency=0.1)
+    # Only the first release found the limit at least half in use
+    assert limit.limit == pytest.approx(2.5)
+
+    for _ in range(20):
+        run_call(limit)
+    assert limit.limit <= 3
+
+def test_overload_cuts_limit_once_per_round_trip():
+    """Test that a burst of 429s halves the limit once, and again after a round-trip time."""
+    limit = AdaptiveLimit("openai", initial_limit=16)
+    run_call(limit, latency=0.05)
+    for _ in range(3):
+        run_call(limit, ProviderHTTPError("slow down", 429), latency=0.05)
+    assert int(limit.limit) == 8
+    assert limit.decreases == 1
+
+    time.sleep(0.06)
+    run_call(limit, ProviderHTTPError("overloaded", 529), latency=0.05)
+    assert int(limit.limit) == 4
+    run_call(limit, ProviderHTTPError("bad request", 400), latency=0.05)
+    assert limit.decreases == 2
+
+def test_latency_inflation_cuts_limit():
+    """Test that calls much slower than the baseline shrink the limit gently."""
+    limit = AdaptiveLimit("openai", initial_limit=10)
+    run_call(limit, latency=0.01)
+    run_call(limit, latency=0.5)
+    assert limit.limit == pytest.approx(9.0)
+
+def test_waiters_are_served_fifo_and_time_out():
+    """Test that callers over the limit wait for a slot and give up after max_wait."""
+    limit = AdaptiveLimit("openai", initial_limit=1, max_limit=1)
+    limit.acquire()
+    order = []
+
+    def waiter(name):
+        limit.acquire(max_wait=5)
+        order.append(name)
+        limit.release()
+
+    threads = [threading.Thread(target=waiter, args=(name,)) for name in ("first", "second")]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    assert limit.snapshot()["waiting"] == 2
+    limit.release()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order == ["first", "second"]
+
+    limit.acquire()
+    with pytest.raises(RateLimitExceeded, match="Concurrency limit of 1"):
+        limit.acquire(max_wait=0.01)
+    assert limit.snapshot()["rejected"] == 1
+
+def test_async_waiters_share_the_limit():
+    """Test that asyncio tasks wait for slots released by other tasks."""
+    limiter = ConcurrencyLimiter(initial_limit=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        limit = await limiter.aacquire("anthropic")
+        peak = max(peak, limit.in_flight)
+        await asyncio.sleep(0.01)
+        limit.release(latency=0.01)
+
+    async def run():
+        await asyncio.gather(*[call() for _ in range(6)])
+
+    asyncio.run(run())
+    assert peak == 2
+    assert limiter.snapshot()["anthropic"]["in_flight"] == 0
+
+def test_cancelled_async_waiter_leaves_queue():
+    """Test that a cancelled waiting task does not keep or leak a slot."""
+    limit = AdaptiveLimit("openai", initial_limit=1)
+
+    async def run():
+        await limit.aacquire()
+        task = asyncio.ensure_future(limit.aacquire())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        limit.release()
+
+    asyncio.run(run())
+    assert limit.snapshot()["waiting"] == 0
+    assert limit.in_flight == 0
+
+def test_is_overload():
+    """Test that overload statuses and timeouts count, client errors do not."""
+    assert is_overload(ProviderHTTPError("busy", 503))
+    assert is_overload(TimeoutError())
+    assert not is_overload(ProviderHTTPError("bad", 400))
+    assert not is_overload(ConnectionError("refused"))
@@ -0,0 +1,81 @@
+import pytest
+import yaml
+from src.llminventory.config_watcher import ConfigWatcher
+from src.llminventory.inventory import LLMInventory
+
+def model_config(model):
+    return {
+        "provider": "openai",
+        "model": model,
+        "endpoint": "http://127.0.0.1:9/v1/chat/completions",
+        "description": f"OpenAI {model}",
+        "required_fields": ["messages"],
+        "parameters": {"temperature": {"type": "float", "default": 1.0}}
+    }
+
+@pytest.fixture
+def watched(tmp_path):
+    configs_dir = tmp_path / "configs"
+    configs_dir.mkdir()
+    (configs_dir / "openai_gpt-4o-mini.yaml").write_text(yaml.dump(model_config("gpt-4o-mini")))
+    secrets_file = tmp_path / "secrets.yaml"
+    secrets_file.write_text(yaml.dump({"openai": {"api_key": "sk-first"}}))
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file)
+    return inventory, ConfigWatcher(inventory, interval=0.01), tmp_path
+
+def test_changed_files_are_reloaded_and_swapped_in(watched):
+    """Test that a new model and a rotated key are picked up without recreating the inventory."""
+    inventory, watcher, tmp_path = watched
+    assert watcher.check() == []
+    old_manager = inventory.model_config_manager
+    old_adapter = inventory._get_adapter("openai")
+
+    (tmp_path / "configs" / "openai_gpt-4o.yaml").write_text(yaml.dump(model_config("gpt-4o")))
+    (tmp_path / "secrets.yaml").write_text(yaml.dump({"openai": {"api_key": "sk-rotated"}}))
+    assert watcher.check() == ["models", "secrets"]
+
+    assert inventory.model_config_manager is not old_manager
+    assert inventory.model_config_manager.get_model_config("openai", "gpt-4o") is not None
+    assert [config["model"] for config in inventory.get_supported_models()] == ["gpt-4o", "gpt-4o-mini"]
+    assert inventory.router.registry is inventory.model_config_manager.registry
+    assert inventory._get_adapter("openai").api_key == "sk-rotated"
+    # Adapters built before the reload keep working for requests already in flight
+    assert old_adapter.api_key == "sk-first"
+
+    stats = watcher.stats()
+    assert stats["models"]["reloads"] == 1 and stats["models"]["items"] == 2
+    assert stats["secrets"]["reloads"] == 1 and stats["secrets"]["last_reload_ms"] >= 0
+
+def test_invalid_files_keep_the_current_version(watched):
+    """Test that a broken file fails validation, is reported, and leaves the old version in use."""
+    inventory, watcher, tmp_path = watched
+    (tmp_path / "supported_models.yaml").write_text("- provider: openai\n  model: [broken")
+    (tmp_path / "secrets.yaml").write_text(yaml.dump(["not", "a", "mapping"]))
+    manager = inventory.model_config_manager
+
+    assert watcher.check() == []
+    assert inventory.model_config_manager is manager
+    assert inventory.secret_manager.get_secret("openai") == "sk-first"
+    stats = watcher.stats()
+    assert stats["models"]["failures"] == 1 and "parse" in stats["models"]["last_error"]
+    assert stats["secrets"]["failures"] == 1
+    # Failed versions are not retried until the files change again
+    assert watcher.check() == []
+    assert watcher.stats()["models"]["failures"] == 1
+
+    with pytest.raises(ValueError, match="Unknown reload target"):
+        watcher.reload("routing")
+
+def test_watcher_thread_polls_until_stopped(watched):
+    """Test that the background thread picks up changes and stops cleanly."""
+    inventory, watcher, tmp_path = watched
+    watcher.start()
+    try:
+        (tmp_path / "secrets.yaml").write_text(yaml.dump({"openai": {"api_key": "sk-polled"}}))
+        for _ in range(200):
+            if inventory.secret_manager.get_secret("openai") == "sk-polled":
+                break
+            watcher._stop.wait(0.01)
+    finally:
+        watcher.stop()
+    assert inventory.secret_manager.get_secret("openai") == "sk-polled"
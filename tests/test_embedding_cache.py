@@ -0,0 +1,37 @@
+import numpy as np
+from src.llminventory.embedding_cache import EmbeddingCache
+
+def test_lookup_reports_missing_texts(tmp_path):
+    """Test that only uncached texts are reported as missing."""
+    cache = EmbeddingCache(tmp_path)
+    cache.store("ns", ["a", "b"], np.array([[1.0, 0.0], [0.0, 1.0]]))
+
+    found, missing = cache.lookup("ns", ["b", "c", "a"])
+
+    assert missing == [1]
+    assert found[0].tolist() == [0.0, 1.0]
+    assert found[1] is None
+    assert found[2].tolist() == [1.0, 0.0]
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (2, 1)
+
+def test_entries_persist_across_instances(tmp_path):
+    """Test that vectors written by one instance are read by another."""
+    EmbeddingCache(tmp_path).store("ns", ["a"], np.array([[0.5, 0.25, 0.125]]))
+
+    found, missing = EmbeddingCache(tmp_path).lookup("ns", ["a"])
+
+    assert missing == []
+    assert found[0].dtype == np.float32
+    assert found[0].tolist() == [0.5, 0.25, 0.125]
+
+def test_duplicates_are_stored_once_per_namespace(tmp_path):
+    """Test that repeated texts are not appended again and namespaces are separate."""
+    cache = EmbeddingCache(tmp_path)
+    cache.store("ns", ["a", "a"], np.array([[1.0], [1.0]]))
+    cache.store("ns", ["a"], np.array([[2.0]]))
+
+    assert cache.lookup("ns", ["a"])[0][0].tolist() == [1.0]
+    assert cache.lookup("other", ["a"])[1] == [0]
+    keys_files = list(tmp_path.glob("*.keys"))
+    assert len(keys_files) == 1
+    assert keys_files[0].stat().st_size == 16
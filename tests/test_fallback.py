@@ -0,0 +1,31 @@
+from src.llminventory.adapters.retry import ProviderHTTPError
+from src.llminventory.circuit_breaker import CircuitOpenError
+from src.llminventory.fallback import should_fall_back, translate_payload
+
+def test_messages_are_translated_to_contents():
+    """Test that an OpenAI-style payload is converted for a Gemini model."""
+    payload = {"messages": [
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello"}
+    ]}
+    translated = translate_payload(payload, {"required_fields": ["contents"]})
+    assert translated == {"contents": [
+        {"role": "user", "parts": [{"text": "Hi"}]},
+        {"role": "model", "parts": [{"text": "Hello"}]}
+    ]}
+
+def test_contents_are_translated_to_messages():
+    """Test that a Gemini payload is converted for a messages model, keeping other keys."""
+    payload = {"contents": [{"role": "model", "parts": [{"text": "a"}, {"text": "b"}]}], "stop": ["\n"]}
+    translated = translate_payload(payload, {"required_fields": ["messages"]})
+    assert translated == {"messages": [{"role": "assistant", "content": "ab"}], "stop": ["\n"]}
+    assert translate_payload(translated, {"required_fields": ["messages"]}) is translated
+
+def test_only_provider_failures_fall_back():
+    """Test which errors move on to the next model of a chain."""
+    assert should_fall_back(ProviderHTTPError("overloaded", 503))
+    assert should_fall_back(ProviderHTTPError("rate limited", 429))
+    assert should_fall_back(CircuitOpenError("open", retry_after=1.0))
+    assert should_fall_back(ConnectionError("timed out"))
+    assert not should_fall_back(ProviderHTTPError("bad request", 400))
+    assert not should_fall_back(ValueError("invalid parameter"))
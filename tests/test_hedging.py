@@ -0,0 +1,100 @@
+import asyncio
+import time
+import pytest
+from src.llminventory.latency import LatencyTracker
+from src.llminventory.hedging import Hedger, HedgePolicy
+
+def tracker_with(latency, count=20):
+    tracker = LatencyTracker()
+    for _ in range(count):
+        tracker.record("openai", "gpt-4o-mini", latency)
+    return tracker
+
+def test_latency_percentiles():
+    """Test that percentiles need min_samples and are read from the recent window."""
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for i in range(5):
+        tracker.record("openai", "gpt-4o-mini", i / 100)
+    assert tracker.percentile("openai", "gpt-4o-mini", 0.95) is None
+
+    for i in range(200):
+        tracker.record("openai", "gpt-4o-mini", i / 100)
+    assert tracker.percentile("openai", "gpt-4o-mini", 0.5) == pytest.approx(1.5)
+    assert tracker.percentile("openai", "gpt-4o-mini", 0.95) == pytest.approx(1.95)
+    snapshot = tracker.snapshot()["openai/gpt-4o-mini"]
+    assert snapshot["count"] == 100
+    assert snapshot["p99_ms"] == pytest.approx(1990)
+
+def test_no_hedge_without_latency_history():
+    """Test that calls run unhedged until the model has enough latency samples."""
+    hedger = Hedger(LatencyTracker())
+    assert hedger.call("openai", "gpt-4o-mini", lambda: "primary", lambda: "hedge") == "primary"
+    assert hedger.stats()["hedges"] == 0
+
+def test_slow_primary_is_hedged_and_hedge_wins():
+    """Test that a hedge fires after the percentile delay and its faster answer is returned."""
+    hedger = Hedger(tracker_with(0.01), HedgePolicy(min_delay=0.01, max_hedge_rate=1.0))
+
+    def primary():
+        time.sleep(0.5)
+        return "primary"
+
+    assert hedger.call("openai", "gpt-4o-mini", primary, lambda: "hedge") == "hedge"
+    assert hedger.call("openai", "gpt-4o-mini", lambda: "fast", lambda: "hedge") == "fast"
+    stats = hedger.stats()
+    assert stats["requests"] == 2
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+
+def test_failed_hedge_falls_back_to_primary():
+    """Test that a failing hedge does not fail a request whose primary succeeds."""
+    hedger = Hedger(tracker_with(0.01), HedgePolicy(min_delay=0.01, max_hedge_rate=1.0))
+
+    def primary():
+        time.sleep(0.1)
+        return "primary"
+
+    def hedge():
+        raise ConnectionError("down")
+
+    assert hedger.call("openai", "gpt-4o-mini", primary, hedge) == "primary"
+    assert hedger.stats()["hedge_wins"] == 0
+
+def test_hedge_budget_caps_hedge_rate():
+    """Test that hedges beyond max_hedge_rate are denied."""
+    hedger = Hedger(tracker_with(0.001), HedgePolicy(min_delay=0.001, max_hedge_rate=0.25, max_burst=1.0))
+
+    def primary():
+        time.sleep(0.02)
+        return "primary"
+
+    for _ in range(8):
+        hedger.call("openai", "gpt-4o-mini", primary, primary)
+    stats = hedger.stats()
+    assert stats["hedges"] == 2
+    assert stats["budget_denied"] == 6
+
+def test_async_hedge_cancels_loser():
+    """Test that the async primary is cancelled once the hedge answers."""
+    hedger = Hedger(tracker_with(0.01), HedgePolicy(min_delay=0.01, max_hedge_rate=1.0))
+    cancelled = []
+
+    async def primary():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "primary"
+
+    async def hedge():
+        return "hedge"
+
+    async def run():
+        result = await hedger.acall("openai", "gpt-4o-mini", primary, hedge)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == "hedge"
+    assert cancelled == [True]
+    assert hedger.stats()["win_rate"] == 1.0
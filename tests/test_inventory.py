@@ -0,0 +1,369 @@
+import asyncio
+import pytest
+import yaml
+from src.llminventory.embedding_cache import EmbeddingCache
+from src.llminventory.rate_limiter import RateLimiter, RateLimitExceeded
+from src.llminventory.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from src.llminventory.inventory import LLMInventory
+from src.llminventory.cache import InMemoryResponseCache
+from src.llminventory.semantic_cache import SemanticCache
+
+@pytest.fixture
+def inventory_files(tmp_path, stub_server):
+    """
+    Creates a temporary configs directory and secrets file for an LLMInventory.
+    """
+    configs_dir = tmp_path / "configs"
+    configs_dir.mkdir()
+    openai_config = {
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "endpoint": f"{stub_server.url}/v1/chat/completions",
+        "description": "OpenAI GPT-4o mini",
+        "required_fields": ["messages"],
+        "parameters": {
+            "temperature": {"type": "float", "default": 1.0},
+            "max_tokens": {"type": "integer", "default": 256}
+        }
+    }
+    (configs_dir / "openai_gpt-4o-mini.yaml").write_text(yaml.dump(openai_config))
+
+    secrets_file = tmp_path / "secrets.yaml"
+    secrets_file.write_text(yaml.dump({"openai": {"api_key": "sk-first"}}))
+    return configs_dir, secrets_file
+
+@pytest.fixture
+def inventory(inventory_files):
+    configs_dir, secrets_file = inventory_files
+    return LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file)
+
+def test_adapter_is_reused_across_calls(inventory):
+    """Test that the same adapter instance is returned for the same provider and key."""
+    first = inventory._get_adapter("openai")
+    second = inventory._get_adapter("openai")
+    assert first is second
+    assert first.api_key == "sk-first"
+
+def test_adapter_cache_invalidated_on_secrets_reload(inventory, inventory_files):
+    """Test that reloading secrets discards adapters built from the old secrets."""
+    _, secrets_file = inventory_files
+    first = inventory._get_adapter("openai")
+
+    secrets_file.write_text(yaml.dump({"openai": {"api_key": "sk-rotated"}}))
+    inventory.secret_manager.load_secrets(secrets_file)
+
+    rotated = inventory._get_adapter("openai")
+    assert rotated is not first
+    assert rotated.api_key == "sk-rotated"
+    assert list(inventory._adapters) == [("openai", "sk-rotated", None, None)]
+
+def test_get_adapter_missing_key_raises(inventory):
+    """Test that a provider without an API key raises KeyError."""
+    with pytest.raises(KeyError, match="API key for provider 'anthropic' not found"):
+        inventory._get_adapter("anthropic")
+
+def test_invoke_many_returns_results_in_order(inventory, stub_server):
+    """Test that invoke_many yields one result per job in submission order."""
+    jobs = [
+        ("openai", "gpt-4o-mini", {"messages": [{"role": "user", "content": f"q{i}"}]})
+        for i in range(6)
+    ]
+    results = list(inventory.invoke_many(jobs, max_concurrency=3, per_provider_limits={"openai": 2}))
+
+    assert [result.index for result in results] == list(range(6))
+    assert all(result.ok for result in results)
+    assert results[0].response["choices"][0]["message"]["content"] == "pong"
+    assert len(stub_server.requests) == 6
+
+def test_invoke_many_keeps_per_item_errors(inventory):
+    """Test that failing jobs are reported in their result instead of raising."""
+    jobs = [
+        {"provider": "openai", "model": "gpt-4o-mini", "payload": {"messages": []}},
+        {"provider": "openai", "model": "missing-model", "payload": {"messages": []}},
+        {"provider": "openai", "model": "gpt-4o-mini", "payload": {}},
+    ]
+    results = list(inventory.invoke_many(jobs, ordered=False))
+
+    by_index = {result.index: result for result in results}
+    assert by_index[0].ok
+    assert isinstance(by_index[1].error, KeyError)
+    assert isinstance(by_index[2].error, ValueError)
+
+def test_invoke_many_rejects_malformed_jobs(inventory):
+    """Test that malformed job descriptions are rejected up front."""
+    with pytest.raises(ValueError, match="Job 0 must be"):
+        inventory.invoke_many([("openai", "gpt-4o-mini")])
+
+def test_invoke_serves_repeated_requests_from_cache(inventory_files, stub_server):
+    """Test that opted-in identical requests only reach the provider once."""
+    configs_dir, secrets_file = inventory_files
+    cache = InMemoryResponseCache()
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file, response_cache=cache)
+    payload = {"messages": [{"role": "user", "content": "classify"}]}
+
+    first = inventory.invoke("openai", "gpt-4o-mini", payload, {"temperature": 0}, use_cache=True)
+    second = inventory.invoke("openai", "gpt-4o-mini", payload, {"temperature": 0.0}, use_cache=True)
+    inventory.invoke("openai", "gpt-4o-mini", payload, {"temperature": 0})
+
+    assert first == second
+    assert len(stub_server.requests) == 2
+    assert cache.stats()['hits'] == 1
+
+def write_embedding_config(configs_dir, stub_server):
+    embedding_config = {
+        "provider": "openai",
+        "model": "text-embedding-3-small",
+        "endpoint": f"{stub_server.url}/v1/embeddings",
+        "description": "OpenAI embeddings",
+        "required_fields": ["input"],
+        "capabilities": ["embeddings"],
+        "parameters": {}
+    }
+    (configs_dir / "openai_text-embedding-3-small.yaml").write_text(yaml.dump(embedding_config))
+
+def test_invoke_reuses_response_for_similar_prompt(inventory_files, stub_server):
+    """Test that a near-duplicate prompt is answered from the semantic cache."""
+    configs_dir, secrets_file = inventory_files
+    write_embedding_config(configs_dir, stub_server)
+    semantic_cache = SemanticCache(embedding_provider="openai", embedding_model="text-embedding-3-small", threshold=0.9)
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file, semantic_cache=semantic_cache)
+    stub_server.responses = [
+        (200, {"data": [{"embedding": [1.0, 0.0]}]}, {}),
+        (200, {"choices": [{"message": {"content": "Paris"}}]}, {}),
+        (200, {"data": [{"embedding": [0.98, 0.1]}]}, {}),
+    ]
+
+    first = inventory.invoke("openai", "gpt-4o-mini", {"messages": [{"role": "user", "content": "Capital of France?"}]}, use_semantic_cache=True)
+    first["choices"][0]["message"]["content"] = "Lyon"
+    second = inventory.invoke("openai", "gpt-4o-mini", {"messages": [{"role": "user", "content": "Capital of France ?"}]}, use_semantic_cache=True)
+
+    assert second == {"choices": [{"message": {"content": "Paris"}}]}
+    assert [request["path"] for request in stub_server.requests] == ["/v1/embeddings", "/v1/chat/completions", "/v1/embeddings"]
+    assert semantic_cache.stats()['hits'] == 1
+
+def test_embed_only_sends_uncached_texts(inventory_files, stub_server, tmp_path):
+    """Test that embed() returns a matrix in input order and embeds cached texts once."""
+    configs_dir, secrets_file = inventory_files
+    write_embedding_config(configs_dir, stub_server)
+    embedding_cache = EmbeddingCache(tmp_path / "embeddings")
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file, embedding_cache=embedding_cache)
+    stub_server.responses = [
+        (200, {"data": [{"index": 1, "embedding": [0.0, 1.0]}, {"index": 0, "embedding": [1.0, 0.0]}]}, {}),
+        (200, {"data": [{"index": 0, "embedding": [0.5, 0.5]}]}, {}),
+    ]
+
+    first = inventory.embed("openai", "text-embedding-3-small", ["a", "b"])
+    second = inventory.embed("openai", "text-embedding-3-small", ["b", "c", "a"])
+
+    assert first.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+    assert second.tolist() == [[0.0, 1.0], [0.5, 0.5], [1.0, 0.0]]
+    assert [request["body"]["input"] for request in stub_server.requests] == [["a", "b"], ["c"]]
+
+def test_embed_rejects_non_embedding_model(inventory):
+    """Test that embed() only accepts embedding models."""
+    with pytest.raises(ValueError, match="not an embedding model"):
+        inventory.embed("openai", "gpt-4o-mini", ["a"])
+
+def test_embed_chunks_to_provider_batch_limit(inventory_files, stub_server, monkeypatch):
+    """Test that embed() splits large inputs into batch-sized requests and keeps input order."""
+    configs_dir, secrets_file = inventory_files
+    write_embedding_config(configs_dir, stub_server)
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file)
+    monkeypatch.setattr(inventory._get_adapter("openai"), "max_embedding_batch", 2)
+    stub_server.responses = [
+        (200, {"data": [{"index": 0, "embedding": [float(i)]}, {"index": 1, "embedding": [float(i + 1)]}]}, {})
+        for i in (0, 2)
+    ] + [(200, {"data": [{"index": 0, "embedding": [4.0]}]}, {})]
+
+    vectors = inventory.embed("openai", "text-embedding-3-small", ["a", "b", "c", "d", "e"], max_concurrency=1)
+
+    assert vectors.shape == (5, 1)
+    assert vectors.flags['C_CONTIGUOUS']
+    assert vectors[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert [request["body"]["input"] for request in stub_server.requests] == [["a", "b"], ["c", "d"], ["e"]]
+
+def test_invoke_applies_model_rate_limits(inventory_files, stub_server):
+    """Test that a model's configured RPM limit is enforced before the request is sent."""
+    configs_dir, secrets_file = inventory_files
+    config_file = configs_dir / "openai_gpt-4o-mini.yaml"
+    config = yaml.safe_load(config_file.read_text())
+    config["rate_limits"] = {"rpm": 1}
+    config_file.write_text(yaml.dump(config))
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file, rate_limiter=RateLimiter(max_wait=0))
+    payload = {"messages": [{"role": "user", "content": "ping"}]}
+
+    inventory.invoke("openai", "gpt-4o-mini", payload)
+    with pytest.raises(RateLimitExceeded):
+        inventory.invoke("openai", "gpt-4o-mini", payload)
+    assert len(stub_server.requests) == 1
+
+def test_open_circuit_fails_fast_without_calling_provider(inventory_files, stub_server):
+    """Test that provider failures open the model's circuit and later calls fail fast."""
+    configs_dir, secrets_file = inventory_files
+    inventory = LLMInventory(
+        configs_dir=configs_dir,
+        secrets_file=secrets_file,
+        circuit_breakers=CircuitBreakerRegistry(min_calls=2, failure_rate=0.5, open_seconds=60)
+    )
+    stub_server.responses = [(400, {"error": "bad"}, {})] + [(503, {"error": "down"}, {"Retry-After": "0"})] * 3
+    payload = {"messages": [{"role": "user", "content": "ping"}]}
+
+    with pytest.raises(ConnectionError):
+        inventory.invoke("openai", "gpt-4o-mini", payload)
+    assert inventory.health()["circuits"]["openai/gpt-4o-mini"]["state"] == "closed"
+    with pytest.raises(ConnectionError):
+        inventory.invoke("openai", "gpt-4o-mini", payload)
+
+    requests_sent = len(stub_server.requests)
+    with pytest.raises(CircuitOpenError):
+        inventory.invoke("openai", "gpt-4o-mini", payload)
+    assert len(stub_server.requests) == requests_sent == 4
+    assert inventory.health()["circuits"]["openai/gpt-4o-mini"]["state"] == "open"
+
+def test_alias_falls_back_to_next_provider(inventory_files, stub_server):
+    """Test that an alias moves to the next model on a 5xx and reports the route."""
+    configs_dir, secrets_file = inventory_files
+    anthropic_config = {
+        "provider": "anthropic",
+        "model": "claude-3-5-haiku",
+        "endpoint": f"{stub_server.url}/v1/messages",
+        "description": "Anthropic Claude 3.5 Haiku",
+        "required_fields": ["messages"],
+        "parameters": {"max_tokens": {"type": "integer", "default": 256}}
+    }
+    (configs_dir / "anthropic_claude-3-5-haiku.yaml").write_text(yaml.dump(anthropic_config))
+    (configs_dir.parent / "routing.yaml").write_text(yaml.dump({
+        "aliases": {"fast-chat": ["openai/gpt-4o-mini", "anthropic/claude-3-5-haiku", "google/missing-model"]}
+    }))
+    secrets_file.write_text(yaml.dump({"openai": {"api_key": "sk-first"}, "anthropic": {"api_key": "sk-ant"}}))
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file)
+    stub_server.responses = [(503, {"error": "down"}, {"Retry-After": "0"})] * 3 + [(200, {"content": [{"text": "hi"}]}, {})]
+
+    response = inventory.invoke(None, "fast-chat", {"messages": [{"role": "user", "content": "ping"}]})
+
+    assert inventory.model_config_manager.get_alias_chain("fast-chat") == [("openai", "gpt-4o-mini"), ("anthropic", "claude-3-5-haiku")]
+    assert response == {"content": [{"text": "hi"}], "_route": {"provider": "anthropic", "model": "claude-3-5-haiku", "fallbacks": 1}}
+    assert [request["path"] for request in stub_server.requests] == ["/v1/chat/completions"] * 3 + ["/v1/messages"]
+
+def test_alias_streams_fall_back_until_first_chunk(inventory_files, stub_server):
+    """Test that streaming an alias or 'auto' routes like invoke() and falls back before output starts."""
+    configs_dir, secrets_file = inventory_files
+    config = yaml.safe_load((configs_dir / "openai_gpt-4o-mini.yaml").read_text())
+    (configs_dir / "openai_gpt-4o.yaml").write_text(yaml.dump({**config, "model": "gpt-4o"}))
+    (configs_dir.parent / "routing.yaml").write_text(yaml.dump({"aliases": {"chat": ["openai/gpt-4o-mini", "openai/gpt-4o"]}}))
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file)
+    sse_body = (
+        'data: {"choices": [{"delta": {"content": "hi"}, "finish_reason": null}]}\n\n'
+        'data: {"choices": [{"delta": {}, "finish_reason": "stop"}]}\n\n'
+        'data: [DONE]\n\n'
+    )
+    down = (503, {"error": "down"}, {"Retry-After": "0"})
+    ok = (200, sse_body, {"Content-Type": "text/event-stream"})
+    stub_server.responses = [down] * 3 + [ok] + [down] * 3 + [ok]
+    expected = [
+        {"delta": "hi", "finish_reason": None, "_route": {"provider": "openai", "model": "gpt-4o", "fallbacks": 1}},
+        {"delta": "", "finish_reason": "stop"}
+    ]
+
+    assert list(inventory.invoke_stream(None, "chat", {"messages": []})) == expected
+
+    async def stream():
+        return [chunk async for chunk in inventory.ainvoke_stream(None, "chat", {"messages": []})]
+
+    assert asyncio.run(stream()) == expected
+    assert [request["body"]["model"] for request in stub_server.requests] == (["gpt-4o-mini"] * 3 + ["gpt-4o"]) * 2
+    with pytest.raises(KeyError, match="Model alias not found"):
+        inventory.invoke_stream(None, "unknown", {"messages": []})
+
+def test_alias_does_not_fall_back_on_client_errors(inventory_files, stub_server):
+    """Test that a 4xx from the first model is raised instead of trying the next one."""
+    configs_dir, secrets_file = inventory_files
+    (configs_dir.parent / "routing.yaml").write_text(yaml.dump({"aliases": {"chat": ["openai/gpt-4o-mini"]}}))
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file)
+    stub_server.responses = [(400, {"error": "bad"}, {})]
+
+    with pytest.raises(ConnectionError, match="HTTP 400"):
+        inventory.invoke(None, "chat", {"messages": []})
+    with pytest.raises(KeyError, match="Model alias not found"):
+        inventory.invoke(None, "unknown", {"messages": []})
+
+def test_hedged_invoke_records_latency_and_stats(inventory):
+    """Test that hedged calls are counted and their latency is tracked per model."""
+    for _ in range(3):
+        inventory.invoke("openai", "gpt-4o-mini", {"messages": []}, hedge=True)
+    with pytest.raises(KeyError, match="Model not found"):
+        inventory.invoke("openai", "gpt-4o-mini", {"messages": []}, hedge=("google", "missing-model"))
+
+    health = inventory.health()
+    assert health["latency"]["openai/gpt-4o-mini"]["count"] == 3
+    assert health["hedging"]["requests"] == 3
+    assert health["hedging"]["hedges"] == 0
+
+def test_auto_model_routes_to_a_capable_model(inventory, stub_server):
+    """Test that model 'auto' invokes a model picked by the router and reports it."""
+    response = inventory.invoke(None, "auto", {"messages": [{"role": "user", "content": "ping"}]})
+
+    assert response["_route"] == {"provider": "openai", "model": "gpt-4o-mini", "fallbacks": 0}
+    assert stub_server.requests[0]["path"] == "/v1/chat/completions"
+
+def test_requests_spread_over_key_pool(inventory_files, stub_server):
+    """Test that pooled keys are used in turn, a rejected key is quarantined and org headers are sent."""
+    configs_dir, secrets_file = inventory_files
+    secrets_file.write_text(yaml.dump({"openai": {
+        "api_keys": ["sk-one", {"api_key": "sk-two", "organization": "org-2"}],
+        "key_selection": "round_robin"
+    }}))
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file)
+    stub_server.responses = [(200, {"ok": 1}, {}), (401, {"error": "bad key"}, {})]
+
+    inventory.invoke("openai", "gpt-4o-mini", {"messages": []})
+    with pytest.raises(ConnectionError, match="HTTP 401"):
+        inventory.invoke("openai", "gpt-4o-mini", {"messages": []})
+    inventory.invoke("openai", "gpt-4o-mini", {"messages": []})
+
+    authorizations = [request["headers"]["Authorization"] for request in stub_server.requests]
+    assert authorizations == ["Bearer sk-one", "Bearer sk-two", "Bearer sk-one"]
+    assert stub_server.requests[1]["headers"]["OpenAI-Organization"] == "org-2"
+    assert [key["quarantined"] for key in inventory.health()["keys"]["openai"]] == [None, "HTTP 401"]
+
+def test_pooled_keys_sharing_an_api_key_send_their_own_headers(inventory_files, stub_server):
+    """Test that keys with the same api_key but different projects each send their own project."""
+    configs_dir, secrets_file = inventory_files
+    secrets_file.write_text(yaml.dump({"openai": {
+        "api_keys": [{"api_key": "sk-same", "project": "proj-A"}, {"api_key": "sk-same", "project": "proj-B"}],
+        "key_selection": "round_robin"
+    }}))
+    inventory = LLMInventory(configs_dir=configs_dir, secrets_file=secrets_file)
+
+    for _ in range(4):
+        inventory.invoke("openai", "gpt-4o-mini", {"messages": []})
+
+    projects = [request["headers"]["OpenAI-Project"] for request in stub_server.requests]
+    assert projects == ["proj-A", "proj-B", "proj-A", "proj-B"]
+
+def test_provider_calls_hold_concurrency_slots(inventory):
+    """Test that calls take and return a slot of the provider's adaptive limit."""
+    inventory.invoke("openai", "gpt-4o-mini", {"messages": []})
+    chunks = inventory.invoke_stream("openai", "gpt-4o-mini", {"messages": []})
+    next(chunks, None)
+
+    concurrency = inventory.health()["concurrency"]["openai"]
+    assert concurrency["in_flight"] == 0
+    assert concurrency["baseline_latency_ms"] > 0
+
+def test_identical_concurrent_requests_share_one_call(inventory, stub_server):
+    """Test that identical deterministic requests in flight together make one provider call."""
+    async def send_all(parameters, count=4):
+        return await asyncio.gather(*[
+            inventory.ainvoke("openai", "gpt-4o-mini", {"messages": [{"role": "user", "content": "ping"}]}, parameters)
+            for _ in range(count)
+        ])
+
+    responses = asyncio.run(send_all({"temperature": 0}))
+    assert len(stub_server.requests) == 1
+    assert all(response == responses[0] for response in responses)
+    assert inventory.health()["coalescing"]["shared"] == 3
+
+    # Sampled requests are independent unless coalescing is asked for
+    asyncio.run(send_all(None))
+    assert len(stub_server.requests) == 5
@@ -0,0 +1,69 @@
+import pytest
+from src.llminventory.adapters.retry import ProviderHTTPError, rate_limit_state
+from src.llminventory.key_pool import KeyPool
+from src.llminventory.rate_limiter import RateLimitExceeded
+
+def keys(*names):
+    return [{"api_key": name} for name in names]
+
+def test_least_loaded_spreads_concurrent_requests():
+    """Test that in-flight requests go to the key with the fewest requests in flight."""
+    pool = KeyPool("openai", keys("sk-a", "sk-b"))
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first.api_key, second.api_key} == {"sk-a", "sk-b"}
+
+    pool.release(first)
+    assert pool.acquire() is first
+
+def test_round_robin_and_exhausted_keys():
+    """Test round-robin order and that keys reporting no requests left are used last."""
+    pool = KeyPool("openai", keys("sk-a", "sk-b", "sk-c"), strategy="round_robin")
+    order = []
+    for _ in range(3):
+        key = pool.acquire()
+        order.append(key.api_key)
+        pool.release(key)
+    assert order == ["sk-a", "sk-b", "sk-c"]
+
+    pool = KeyPool("openai", keys("sk-a", "sk-b"))
+    key = pool.acquire()
+    pool.release(key, rate_limits={"remaining_requests": 0, "reset_requests": 60})
+    assert [pool.acquire().api_key for _ in range(3)] == ["sk-b", "sk-b", "sk-b"]
+
+def test_failing_keys_are_quarantined():
+    """Test that 401 and 429 answers take a key out of rotation until every key is quarantined."""
+    pool = KeyPool("openai", keys("sk-a", "sk-b"))
+    key = pool.acquire()
+    pool.release(key, ProviderHTTPError("unauthorized", 401))
+    other = pool.acquire()
+    assert other is not key
+    pool.release(other, ProviderHTTPError("slow down", 429, retry_after=12))
+
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        pool.acquire()
+    assert 11 < excinfo.value.retry_after <= 12
+    assert [entry["quarantined"] for entry in pool.snapshot()] == ["HTTP 401", "HTTP 429"]
+    assert pool.snapshot()[0]["key"] == "...sk-a"
+
+def test_single_key_is_never_quarantined():
+    """Test that a provider with one key keeps using it after errors."""
+    pool = KeyPool("openai", keys("sk-only"))
+    key = pool.acquire()
+    pool.release(key, ProviderHTTPError("slow down", 429))
+    assert pool.acquire() is key
+
+def test_pool_requires_keys_and_known_strategy():
+    """Test that an empty pool raises KeyError and an unknown strategy ValueError."""
+    with pytest.raises(KeyError, match="API key for provider 'openai' not found"):
+        KeyPool("openai", [])
+    with pytest.raises(ValueError, match="round_robin"):
+        KeyPool("openai", keys("sk-a"), strategy="random")
+
+def test_rate_limit_state_from_headers():
+    """Test that remaining requests and the reset are read from OpenAI and Anthropic headers."""
+    assert rate_limit_state({"x-ratelimit-remaining-requests": "59", "x-ratelimit-reset-requests": "1s"}) == {
+        "remaining_requests": 59.0, "reset_requests": 1.0
+    }
+    assert rate_limit_state({"anthropic-ratelimit-requests-remaining": "0"}) == {"remaining_requests": 0.0}
+    assert rate_limit_state({}) == {}
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+def run_fresh(code: str) -> str:
+    """Runs code in a fresh interpreter from the project root and returns its output."""
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+def test_importing_the_package_defers_heavy_dependencies():
+    """Test that importing the package and constructing an inventory load no HTTP client or numpy."""
+    output = run_fresh(
+        "import sys\n"
+        "import src.llminventory\n"
+        "eager = [m for m in ('requests', 'httpx', 'numpy', 'yaml') if m in sys.modules]\n"
+        "from pathlib import Path\n"
+        "src.llminventory.LLMInventory(Path('configs'))\n"
+        "later = [m for m in ('requests', 'httpx', 'numpy') if m in sys.modules]\n"
+        "print(eager, later)"
+    )
+    assert output == "[] []"
+
+def test_adapters_are_imported_on_first_use():
+    """Test that get_adapter() and package attributes import an adapter module only when asked for."""
+    output = run_fresh(
+        "import sys\n"
+        "from src.llminventory import get_adapter\n"
+        "before = 'src.llminventory.adapters.openai_adapter' in sys.modules\n"
+        "adapter = get_adapter('OpenAI')\n"
+        "from src.llminventory.adapters import OpenAIAdapter, BaseAdapter\n"
+        "print(before, adapter is OpenAIAdapter, issubclass(adapter, BaseAdapter),"
+        " 'src.llminventory.adapters.mistral_adapter' in sys.modules)"
+    )
+    assert output == "False True True False"
+
+def test_lazy_attributes_behave_like_eager_ones():
+    """Test that public names resolve, are listed by dir(), and unknown names still raise AttributeError."""
+    import src.llminventory as package
+    from src.llminventory import adapters
+    from src.llminventory.inventory import LLMInventory
+
+    assert package.LLMInventory is LLMInventory
+    assert set(package.__all__) <= set(dir(package))
+    assert "GoogleAdapter" in dir(adapters)
+    with pytest.raises(AttributeError):
+        package.NotAThing
+    with pytest.raises(ValueError, match="No adapter found"):
+        adapters.get_adapter("nonexistent")
+
+def test_lazy_module_imports_on_first_use():
+    """Test that a LazyModule imports on first attribute access and reports a missing package with its hint."""
+    from src.llminventory.lazy_imports import LazyModule, ensure_imported
+
+    json_module = LazyModule('json', "unused")
+    assert json_module._module is None
+    assert json_module.dumps([1]) == "[1]"
+    assert ensure_imported(json_module) is sys.modules['json']
+
+    missing = LazyModule('not_an_installed_package', "Install it with: pip install not-an-installed-package")
+    with pytest.raises(ImportError, match="pip install not-an-installed-package"):
+        ensure_imported(missing)
@@ -182,4 +182,58 @@ def test_merge_and_validate_params_raises_key_error_for_missing_model(temp_confi
     """Test that KeyError is raised if the specified model is not found."""
     manager = ModelConfigManager(temp_configs_dir)
     with pytest.raises(KeyError, match="Model 'nonexistent/model' not found in configurations."):
-        manager.merge_and_validate_params("nonexistent", "model", {"temperature": 0.5})
\ No newline at end of file
+        manager.merge_and_validate_params("nonexistent", "model", {"temperature": 0.5})
+
+def test_supported_models_snapshot_is_used_until_yaml_changes(tmp_path, monkeypatch, capsys):
+    """Test that supported_models.yaml is compiled to a snapshot that is reused until the YAML changes."""
+    configs_dir = tmp_path / "configs"
+    configs_dir.mkdir()
+    supported_models = tmp_path / "supported_models.yaml"
+    supported_models.write_text(yaml.dump([{"provider": "openai", "model": "gpt-4o-mini", "default_params": {"temperature": 1.0}}]))
+
+    first = ModelConfigManager(configs_dir)
+    assert (tmp_path / "supported_models.snapshot").is_file()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML parsed although the snapshot is current")
+    monkeypatch.setattr(yaml, "safe_load", fail)
+    second = ModelConfigManager(configs_dir)
+    assert second.get_model_config("openai", "gpt-4o-mini") == first.get_model_config("openai", "gpt-4o-mini")
+    assert "(snapshot)" in capsys.readouterr().out
+    monkeypatch.undo()
+
+    supported_models.write_text(yaml.dump([{"provider": "openai", "model": "gpt-4o", "default_params": {}}]))
+    third = ModelConfigManager(configs_dir)
+    assert third.get_all_model_names() == ["openai/gpt-4o"]
+    assert ModelConfigManager(configs_dir).get_all_model_names() == ["openai/gpt-4o"]
+
+def test_validators_are_compiled_on_first_use_unless_eager(temp_configs_dir):
+    """Test that lazy managers compile a model's validator on its first request and eager ones at load."""
+    lazy_manager = ModelConfigManager(temp_configs_dir)
+    assert lazy_manager._validators == {}
+    assert lazy_manager.merge_and_validate_params("openai", "gpt-4-turbo", {"temperature": 0.5})["temperature"] == 0.5
+    assert list(lazy_manager._validators) == [("openai", "gpt-4-turbo")]
+
+    eager_manager = ModelConfigManager(temp_configs_dir, lazy=False)
+    assert set(eager_manager._validators) == {("openai", "gpt-4-turbo"), ("anthropic", "claude-3-haiku")}
+    assert eager_manager.merge_and_validate_params("openai", "gpt-4-turbo") == lazy_manager.merge_and_validate_params("openai", "gpt-4-turbo")
+
+def test_provider_rate_limits_load_from_rate_limits_yaml(tmp_path):
+    """Test that provider limits apply with the list-format supported_models.yaml the generator writes."""
+    configs_dir = tmp_path / "configs"
+    configs_dir.mkdir()
+    (tmp_path / "supported_models.yaml").write_text(yaml.dump([
+        {"provider": "openai", "model": "gpt-4o-mini", "default_params": {"temperature": 1.0}, "rate_limits": {"rpm": 100}}
+    ]))
+    (tmp_path / "rate_limits.yaml").write_text(yaml.dump({"openai": {"rpm": 500, "tpm": 200000}}))
+
+    manager = ModelConfigManager(configs_dir)
+    assert manager.provider_rate_limits == {"openai": {"rpm": 500, "tpm": 200000}}
+    assert manager.get_model_config("openai", "gpt-4o-mini")["rate_limits"] == {"rpm": 100}
+    # The second load reads the snapshots and gets the same limits
+    assert ModelConfigManager(configs_dir).provider_rate_limits == manager.provider_rate_limits
+
+    (tmp_path / "rate_limits.yaml").write_text(yaml.dump(["openai"]))
+    assert ModelConfigManager(configs_dir, use_snapshot=False).provider_rate_limits == {}
+    with pytest.raises(ValueError, match="must map each provider"):
+        ModelConfigManager(configs_dir, use_snapshot=False, strict=True)
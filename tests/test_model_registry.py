@@ -0,0 +1,74 @@
+import pytest
+from src.llminventory.model_registry import ModelRegistry, mutable_config
+
+MODELS = [
+    {"provider": "openai", "model": "gpt-4o", "capabilities": ["text", "vision"], "context_window": 128000,
+     "max_output": 16384, "pricing": {"input_cost_per_1m_tokens": 2.5, "output_cost_per_1m_tokens": 10.0}},
+    {"provider": "openai", "model": "gpt-4o-mini", "capabilities": ["text", "vision"], "context_window": 128000,
+     "max_output": 16384, "pricing": {"input_cost_per_1m_tokens": 0.15, "output_cost_per_1m_tokens": 0.6}},
+    {"provider": "anthropic", "model": "claude-3-haiku", "capabilities": ["text"], "context_window": 200000,
+     "max_output": 4096, "pricing": {"input_cost_per_1m_tokens": 0.25, "output_cost_per_1m_tokens": 1.25}},
+    {"provider": "google", "model": "gemini-1.5-flash", "capabilities": ["text", "vision"], "context_window": 1000000},
+    {"provider": "openai", "model": "dall-e-3", "capabilities": ["image_generation"]},
+    {"provider": "mistral", "model": "mistral-small"},
+]
+
+def names(configs):
+    return [f"{config['provider']}/{config['model']}" for config in configs]
+
+@pytest.fixture
+def registry():
+    return ModelRegistry(MODELS)
+
+def test_all_models_are_ordered_by_name(registry):
+    """Test that the listing is sorted by 'provider/model' and reused across calls."""
+    assert names(registry.all()) == sorted(names(MODELS))
+    assert registry.all() is registry.all()
+    assert registry.providers() == ("anthropic", "google", "mistral", "openai")
+
+def test_find_models_by_capability_provider_and_exclusion(registry):
+    """Test that capability and provider criteria intersect and configs without capabilities count as text."""
+    assert names(registry.find_models(capabilities={"vision"})) == [
+        "google/gemini-1.5-flash", "openai/gpt-4o", "openai/gpt-4o-mini"
+    ]
+    assert names(registry.find_models(capabilities="text", providers="mistral")) == ["mistral/mistral-small"]
+    assert names(registry.find_models(providers={"openai"}, exclude_capabilities={"image_generation"})) == [
+        "openai/gpt-4o", "openai/gpt-4o-mini"
+    ]
+    assert registry.find_models(capabilities={"vision", "computer_use"}) == ()
+
+def test_find_models_by_price_and_context(registry):
+    """Test that price and size thresholds exclude models without the data and sorting orders results."""
+    assert names(registry.find_models(max_input_cost=0.25)) == ["anthropic/claude-3-haiku", "openai/gpt-4o-mini"]
+    assert names(registry.find_models(max_output_cost=1.0)) == ["openai/gpt-4o-mini"]
+    assert names(registry.find_models(min_context=150000, sort_by="context")) == [
+        "google/gemini-1.5-flash", "anthropic/claude-3-haiku"
+    ]
+    assert names(registry.find_models(min_output=8000)) == ["openai/gpt-4o", "openai/gpt-4o-mini"]
+    assert names(registry.find_models(capabilities={"text"}, sort_by="price"))[:3] == [
+        "openai/gpt-4o-mini", "anthropic/claude-3-haiku", "openai/gpt-4o"
+    ]
+    with pytest.raises(ValueError):
+        registry.find_models(sort_by="speed")
+
+def test_query_results_are_cached(registry):
+    """Test that an identical query returns the same tuple without recomputing it."""
+    first = registry.find_models(capabilities=["text", "vision"], max_input_cost=1.0)
+    assert isinstance(first, tuple)
+    assert registry.find_models(capabilities={"vision", "text"}, max_input_cost=1.0) is first
+
+def test_results_are_read_only(registry):
+    """Test that shared query results cannot be modified, while mutable_config() returns a plain copy."""
+    config = registry.find_models(providers="openai", max_input_cost=1.0)[0]
+    with pytest.raises(TypeError):
+        config["model"] = "changed"
+    with pytest.raises(TypeError):
+        config["pricing"]["input_cost_per_1m_tokens"] = 0
+    assert isinstance(config["capabilities"], tuple)
+
+    copy = mutable_config(config)
+    copy["pricing"]["input_cost_per_1m_tokens"] = 0
+    copy["capabilities"].append("audio")
+    assert copy["model"] == "gpt-4o-mini"
+    assert config["pricing"]["input_cost_per_1m_tokens"] == 0.15
+    assert config["capabilities"] == ("text", "vision")
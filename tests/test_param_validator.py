@@ -0,0 +1,51 @@
+import pytest
+from src.llminventory.param_validator import ParameterValidator
+
+SCHEMA = {
+    "temperature": {"type": "float", "default": 1.0},
+    "max_tokens": {"type": "integer", "default": 1024},
+    "response_format": {"type": "string", "enum": ["text", "json_object"]},
+    "frequency_penalty": {"type": "float", "default": 0.0, "minimum": -2.0, "maximum": 2.0},
+    "stop": {"default": None}
+}
+
+@pytest.fixture
+def validator():
+    return ParameterValidator("openai/gpt-4o-mini", SCHEMA, "openai", max_output=16384)
+
+def test_defaults_are_frozen_and_copied_per_request(validator):
+    """Test that each request gets its own copy of the read-only defaults."""
+    merged = validator.validate()
+    assert merged == {"temperature": 1.0, "max_tokens": 1024, "frequency_penalty": 0.0, "stop": None}
+    merged["temperature"] = 0.0
+    assert validator.defaults["temperature"] == 1.0
+    with pytest.raises(TypeError):
+        validator.defaults["temperature"] = 0.0
+
+def test_user_values_are_checked_and_converted(validator):
+    """Test type checks, int-to-float conversion and untyped or unknown parameters."""
+    merged = validator.validate({"temperature": 0, "max_tokens": 50, "stop": ["\n"], "unknown": 1})
+    assert merged["temperature"] == 0.0 and isinstance(merged["temperature"], float)
+    assert merged["max_tokens"] == 50
+    assert merged["stop"] == ["\n"]
+    assert "unknown" not in merged
+    with pytest.raises(ValueError, match="expected type 'integer', but got 'float'"):
+        validator.validate({"max_tokens": 100.5})
+
+def test_ranges_and_allowed_values(validator):
+    """Test schema bounds, well-known bounds, the max_output cap and enums."""
+    with pytest.raises(ValueError, match="'temperature' .* between 0.0 and 2.0"):
+        validator.validate({"temperature": 2.5})
+    with pytest.raises(ValueError, match="'frequency_penalty' .* between -2.0 and 2.0"):
+        validator.validate({"frequency_penalty": -3})
+    with pytest.raises(ValueError, match="'max_tokens' .* between 1 and 16384"):
+        validator.validate({"max_tokens": 20000})
+    with pytest.raises(ValueError, match="must be one of"):
+        validator.validate({"response_format": "xml"})
+    assert validator.validate({"response_format": "json_object"})["response_format"] == "json_object"
+
+def test_provider_specific_bounds():
+    """Test that Anthropic's narrower temperature range applies to its models."""
+    validator = ParameterValidator("anthropic/claude-3-haiku", {"temperature": {"type": "float", "default": 1.0}}, "anthropic")
+    with pytest.raises(ValueError, match="between 0.0 and 1.0"):
+        validator.validate({"temperature": 1.5})
@@ -0,0 +1,61 @@
+import asyncio
+import time
+import pytest
+from src.llminventory.rate_limiter import RateLimiter, RateLimitExceeded, TokenBucket, estimate_tokens, usage_tokens
+
+MODEL_CONFIG = {'provider': 'openai', 'model': 'gpt-4o-mini'}
+
+def test_token_bucket_refills_at_rate():
+    """Test that a drained bucket reports the time until enough units have refilled."""
+    bucket = TokenBucket(rate_per_minute=60, now=0.0)
+    assert bucket.wait_time(60, now=0.0) == 0.0
+    bucket.consume(60)
+
+    assert bucket.wait_time(1, now=0.0) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now=0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(1, now=1.0) == 0.0
+
+def test_token_bucket_admits_oversized_request_into_debt():
+    """Test that a request above capacity waits for a full bucket instead of never running."""
+    bucket = TokenBucket(rate_per_minute=60, now=0.0)
+    assert bucket.wait_time(100, now=0.0) == 0.0
+    bucket.consume(100)
+    assert bucket.wait_time(1, now=0.0) == pytest.approx(41.0)
+
+def test_acquire_rejects_when_deadline_too_short():
+    """Test that a request which cannot fit within max_wait raises with a retry hint."""
+    limiter = RateLimiter({'openai': {'rpm': 1}}, max_wait=0)
+    limiter.acquire('openai', MODEL_CONFIG)
+
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        limiter.acquire('openai', MODEL_CONFIG)
+    assert excinfo.value.retry_after == pytest.approx(60.0, abs=0.1)
+    assert limiter.stats()['rejections'] == 1
+
+def test_acquire_waits_for_model_token_limit():
+    """Test that callers queue until the model's TPM bucket has refilled."""
+    limiter = RateLimiter(max_wait=5)
+    model_config = {**MODEL_CONFIG, 'rate_limits': {'tpm': 6000}}
+    limiter.acquire('openai', model_config, tokens=6000)
+
+    start = time.monotonic()
+    asyncio.run(limiter.aacquire('openai', model_config, tokens=10))
+    assert time.monotonic() - start == pytest.approx(0.1, abs=0.08)
+    assert limiter.stats()['waits'] == 1
+
+def test_record_usage_refunds_overestimated_tokens():
+    """Test that reported usage corrects the TPM bucket after the response."""
+    limiter = RateLimiter(max_wait=0)
+    model_config = {**MODEL_CONFIG, 'rate_limits': {'tpm': 1000}}
+    limiter.acquire('openai', model_config, tokens=1000)
+    limiter.record_usage('openai', model_config, 1000, {'usage': {'total_tokens': 400}})
+
+    limiter.acquire('openai', model_config, tokens=500)
+
+def test_token_estimates_and_usage():
+    """Test the token estimate and the usage formats of each provider."""
+    assert estimate_tokens({'messages': []}, {'max_tokens': 100}) == len('{"messages": []}') // 4 + 100
+    assert usage_tokens({'usage': {'total_tokens': 12}}) == 12
+    assert usage_tokens({'usage': {'input_tokens': 5, 'output_tokens': 7}}) == 12
+    assert usage_tokens({'usageMetadata': {'totalTokenCount': 12}}) == 12
+    assert usage_tokens({}) is None
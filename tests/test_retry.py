@@ -0,0 +1,50 @@
+import time
+import pytest
+from requests.structures import CaseInsensitiveDict
+from src.llminventory.adapters.retry import RetryPolicy, parse_duration, retry_after_hint
+
+def test_parse_duration_formats():
+    """Test seconds, provider duration strings and dates."""
+    assert parse_duration("2") == 2.0
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("1h2m3.5s") == pytest.approx(3723.5)
+    assert parse_duration("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_duration("not a duration") is None
+
+def test_retry_after_hint_sources():
+    """Test that Retry-After, OpenAI reset headers and Gemini RetryInfo are understood."""
+    assert retry_after_hint(CaseInsensitiveDict({"Retry-After": "3"})) == 3.0
+    assert retry_after_hint(CaseInsensitiveDict({"Retry-After": "3"}), status_code=503) == 3.0
+    assert retry_after_hint(CaseInsensitiveDict({"x-ratelimit-reset-requests": "1.5s"}), status_code=429) == 1.5
+    body = {"error": {"code": 429, "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "13s"}]}}
+    assert retry_after_hint(CaseInsensitiveDict(), body) == 13.0
+    assert retry_after_hint(CaseInsensitiveDict(), {"error": "boom"}) is None
+
+def test_reset_headers_are_ignored_unless_rate_limited():
+    """Test that rate-limit reset headers sent on a server error do not replace exponential backoff."""
+    headers = CaseInsensitiveDict({"x-ratelimit-reset-requests": "2ms", "anthropic-ratelimit-tokens-reset": "2030-01-01T00:00:00Z"})
+    assert retry_after_hint(headers, status_code=503) is None
+    assert retry_after_hint(headers, status_code=500) is None
+    assert retry_after_hint(headers) is None
+    assert retry_after_hint(headers, status_code=429) == pytest.approx(0.002)
+
+def test_backoff_is_jittered_and_capped():
+    """Test that backoff stays within the exponential ceiling and provider hints are capped."""
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    assert all(0 <= policy.backoff(3) <= 4.0 for _ in range(50))
+    assert all(0 <= policy.backoff(1) <= 1.0 for _ in range(50))
+    assert all(4.0 <= policy.backoff(1, retry_after=10.0) <= 4.4 for _ in range(50))
+    # Clients told to retry at once still spread out a little
+    delays = {policy.backoff(1, retry_after=0.0) for _ in range(50)}
+    assert len(delays) > 1 and all(0 <= delay <= policy.hint_jitter for delay in delays)
+
+def test_next_delay_respects_attempts_and_deadline():
+    """Test that retries stop when attempts or the deadline budget run out."""
+    policy = RetryPolicy(max_attempts=3, deadline=1.0)
+    started = time.monotonic()
+    assert 0.5 <= policy.next_delay(1, started, retry_after=0.5) <= 0.6
+    assert policy.next_delay(3, started, retry_after=0.0) is None
+    assert policy.next_delay(1, started, retry_after=2.0) is None
+    assert not policy.is_retryable_status(400)
+    assert policy.is_retryable_status(429)
@@ -0,0 +1,72 @@
+import pytest
+from src.llminventory.circuit_breaker import CircuitBreakerRegistry
+from src.llminventory.latency import LatencyTracker
+from src.llminventory.model_registry import ModelRegistry
+from src.llminventory.router import ModelRouter, RouteConstraints
+
+MODELS = [
+    {"provider": "openai", "model": "gpt-4o", "capabilities": ["text", "vision"], "context_window": 128000,
+     "max_output": 16384, "pricing": {"input_cost_per_1m_tokens": 2.5, "output_cost_per_1m_tokens": 10.0}},
+    {"provider": "openai", "model": "gpt-4o-mini", "capabilities": ["text", "vision"], "context_window": 128000,
+     "max_output": 16384, "pricing": {"input_cost_per_1m_tokens": 0.15, "output_cost_per_1m_tokens": 0.6}},
+    {"provider": "anthropic", "model": "claude-3-haiku", "capabilities": ["text"], "context_window": 1000,
+     "max_output": 4096, "pricing": {"input_cost_per_1m_tokens": 0.25, "output_cost_per_1m_tokens": 1.25}},
+    {"provider": "google", "model": "gemini-1.5-flash", "capabilities": ["text", "vision"], "context_window": 1000000},
+    {"provider": "openai", "model": "dall-e-3", "capabilities": ["image_generation"]},
+    {"provider": "google", "model": "text-embedding-004", "capabilities": ["embeddings"]},
+]
+
+PAYLOAD = {"messages": [{"role": "user", "content": "hi"}]}
+
+@pytest.fixture
+def router():
+    return ModelRouter(ModelRegistry(MODELS), LatencyTracker(), CircuitBreakerRegistry(min_calls=1))
+
+def test_routes_cheapest_capable_models_first(router):
+    """Test that models are ranked by estimated cost, unpriced models last."""
+    assert router.route(PAYLOAD) == [("openai", "gpt-4o-mini"), ("anthropic", "claude-3-haiku"), ("openai", "gpt-4o")]
+    vision = RouteConstraints(capabilities={"text", "vision"}, max_candidates=5)
+    assert router.route(PAYLOAD, constraints=vision) == [
+        ("openai", "gpt-4o-mini"), ("openai", "gpt-4o"), ("google", "gemini-1.5-flash")
+    ]
+
+def test_filters_by_context_window_cost_and_provider(router):
+    """Test that prompt size, the cost ceiling and allowed providers narrow the candidates."""
+    long_payload = {"messages": [{"role": "user", "content": "x" * 4000}]}
+    assert ("anthropic", "claude-3-haiku") not in router.route(long_payload)
+
+    cheap = RouteConstraints(max_cost=0.001)
+    assert router.route(PAYLOAD, {"max_tokens": 1000}, cheap) == [("openai", "gpt-4o-mini")]
+    assert router.route(PAYLOAD, constraints=RouteConstraints(providers="google")) == [("google", "gemini-1.5-flash")]
+    with pytest.raises(ValueError, match="No model satisfies"):
+        router.route(PAYLOAD, constraints=RouteConstraints(capabilities={"text", "computer_use"}))
+
+def test_prefers_low_latency_and_skips_open_circuits(router):
+    """Test that observed latency drives 'latency' routing and open circuits are skipped."""
+    router.latency.record("openai", "gpt-4o-mini", 2.0)
+    router.latency.record("openai", "gpt-4o", 0.5)
+    fast = RouteConstraints(prefer="latency", max_candidates=2)
+    assert router.route(PAYLOAD, constraints=fast) == [("openai", "gpt-4o"), ("openai", "gpt-4o-mini")]
+    assert ("openai", "gpt-4o-mini") not in router.route(PAYLOAD, constraints=RouteConstraints(max_latency_ms=1000))
+
+    breaker = router.circuit_breakers.get("openai", "gpt-4o")
+    breaker.before_call()
+    breaker.record(ConnectionError("down"))
+    assert ("openai", "gpt-4o") not in router.route(PAYLOAD, constraints=fast)
+
+def test_constraints_from_dict_validates_keys():
+    """Test that API constraints are converted to frozensets and unknown keys are rejected."""
+    constraints = RouteConstraints.from_dict({"capabilities": ["vision"], "prefer": "latency"})
+    assert constraints.capabilities == frozenset({"vision"})
+    with pytest.raises(ValueError, match="Unknown routing constraints"):
+        RouteConstraints.from_dict({"budget": 1})
+    with pytest.raises(ValueError, match="prefer"):
+        RouteConstraints.from_dict({"prefer": "quality"})
+
+def test_candidate_pools_cache_is_bounded(router):
+    """Test that distinct client-supplied constraints cannot grow the pool cache without limit."""
+    maxsize = router._pools.cache_info().maxsize
+    for index in range(maxsize + 10):
+        with pytest.raises(ValueError, match="No model satisfies"):
+            router.route(PAYLOAD, constraints=RouteConstraints(capabilities={f"made-up-{index}"}))
+    assert router._pools.cache_info().currsize == maxsize
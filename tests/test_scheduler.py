@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.llminventory.scheduler import AdmissionRejected, RequestScheduler
+
+def queue_in_background(scheduler, order, name, **kwargs):
+    """Starts a thread that waits for a slot, records its name and holds the slot until released."""
+    def run():
+        scheduler.acquire(**kwargs)
+        order.append(name)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+def wait_for_queued(scheduler, count):
+    for _ in range(200):
+        if scheduler.stats()['queued'] == count:
+            return
+        time.sleep(0.005)
+    raise AssertionError(f"expected {count} queued requests")
+
+def test_requests_start_immediately_below_capacity():
+    """Test that requests under max_concurrency are admitted without queueing."""
+    scheduler = RequestScheduler(max_concurrency=2)
+    scheduler.acquire()
+    with scheduler.slot(priority='batch'):
+        assert scheduler.stats()['running'] == 2
+    scheduler.release()
+    stats = scheduler.stats()
+    assert stats['running'] == 0
+    assert stats['admitted'] == 2
+    assert stats['queued'] == 0
+
+def test_interactive_requests_overtake_batch_backlog():
+    """Test that queued requests start by weighted fair queuing across priorities."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire()
+    order = []
+    threads = [queue_in_background(scheduler, order, f"batch-{i}", priority='batch') for i in range(2)]
+    wait_for_queued(scheduler, 2)
+    threads += [queue_in_background(scheduler, order, f"interactive-{i}", priority='interactive') for i in range(2)]
+    wait_for_queued(scheduler, 4)
+    assert scheduler.stats()['queued_by_priority'] == {'interactive': 2, 'standard': 0, 'batch': 2}
+
+    for _ in range(4):
+        scheduler.release(0.01)
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join(1)
+    assert order == ['interactive-0', 'interactive-1', 'batch-0', 'batch-1']
+
+def test_tenants_share_a_priority_class_fairly():
+    """Test that a tenant with a backlog does not delay another tenant's first request."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire()
+    order = []
+    threads = [queue_in_background(scheduler, order, f"a-{i}", tenant='a') for i in range(3)]
+    wait_for_queued(scheduler, 3)
+    threads.append(queue_in_background(scheduler, order, "b-0", tenant='b'))
+    wait_for_queued(scheduler, 4)
+
+    for _ in range(4):
+        scheduler.release()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join(1)
+    assert order.index("b-0") <= 1
+
+def test_full_queues_are_rejected_with_status_and_retry_after():
+    """Test that a full server queue gives 503 and a full tenant queue gives 429."""
+    scheduler = RequestScheduler(max_concurrency=1, max_queue=2, max_queue_per_tenant=1)
+    scheduler.acquire()
+    order = []
+    threads = [queue_in_background(scheduler, order, "a-0", tenant='a')]
+    wait_for_queued(scheduler, 1)
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        scheduler.acquire(tenant='a')
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.retry_after > 0
+
+    threads.append(queue_in_background(scheduler, order, "b-0", tenant='b'))
+    wait_for_queued(scheduler, 2)
+    with pytest.raises(AdmissionRejected) as excinfo:
+        scheduler.acquire(tenant='c')
+    assert excinfo.value.status_code == 503
+    assert scheduler.stats()['rejected'] == 2
+
+    for _ in range(3):
+        scheduler.release()
+    for thread in threads:
+        thread.join(1)
+
+def test_deadline_expires_queued_request():
+    """Test that a request that cannot start before its deadline is rejected and leaves the queue."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire()
+    with pytest.raises(AdmissionRejected) as excinfo:
+        scheduler.acquire(deadline=0.05)
+    assert excinfo.value.status_code == 503
+    stats = scheduler.stats()
+    assert stats['expired'] == 1
+    assert stats['queued'] == 0
+
+    # With a known service time, a deadline that cannot be met is rejected up front
+    scheduler.release(2.0)
+    scheduler.acquire()
+    start = time.monotonic()
+    with pytest.raises(AdmissionRejected):
+        scheduler.acquire(deadline=0.5)
+    assert time.monotonic() - start < 0.1
+
+def test_unknown_priority_is_rejected():
+    """Test that an unknown priority raises ValueError."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire()
+    with pytest.raises(ValueError):
+        scheduler.acquire(priority='urgent')
+
+def test_async_waiters_are_admitted_in_order_and_can_be_cancelled():
+    """Test that tasks wait without blocking the loop and that a cancelled waiter gives up its place."""
+    async def scenario():
+        scheduler = RequestScheduler(max_concurrency=1)
+        order = []
+
+        async def request(name, priority):
+            async with scheduler.aslot(priority=priority):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        async with scheduler.aslot():
+            tasks = [asyncio.create_task(request("batch", 'batch'))]
+            await asyncio.sleep(0)
+            cancelled = asyncio.create_task(request("cancelled", 'interactive'))
+            tasks.append(asyncio.create_task(request("interactive", 'interactive')))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            assert scheduler.stats()['queued'] == 2
+        await asyncio.gather(*tasks)
+        return scheduler, order
+
+    scheduler, order = asyncio.run(scenario())
+    assert order == ["interactive", "batch"]
+    stats = scheduler.stats()
+    assert stats['running'] == 0
+    assert stats['queued'] == 0
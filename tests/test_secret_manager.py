@@ -79,4 +79,33 @@ def test_secret_manager_initialization_without_file():
     assert manager.get_secret("openai") is None
     # Attempting to load later should still work
     manager.load_secrets(Path("secrets.example.yaml")) # Using an existing example file for this test
-    assert manager.get_secret("openai") == "sk-..." # Based on secrets.example.yaml content
\ No newline at end of file
+    assert manager.get_secret("openai") == "sk-..." # Based on secrets.example.yaml content
+
+def test_get_credentials_reads_key_lists(tmp_path):
+    """Test that a provider can list several keys, with optional organization and project."""
+    file_path = tmp_path / "secrets.yaml"
+    file_path.write_text(yaml.dump({
+        "openai": {
+            "api_keys": ["sk-one", {"api_key": "sk-two", "organization": "org-1", "project": "proj-1"}],
+            "key_selection": "round_robin"
+        }
+    }))
+    manager = SecretManager(file_path)
+    assert manager.get_credentials("openai") == [
+        {"api_key": "sk-one"},
+        {"api_key": "sk-two", "organization": "org-1", "project": "proj-1"}
+    ]
+    assert manager.get_secret("openai") == "sk-one"
+    assert manager.get_key_selection("openai") == "round_robin"
+    assert manager.get_credentials("anthropic") == []
+
+def test_load_secrets_rejects_non_mapping_and_keeps_current(temp_secrets_file, tmp_path):
+    """Test that a file that is not a mapping of providers is rejected without replacing the loaded secrets."""
+    manager = SecretManager(temp_secrets_file)
+    version = manager.version
+    file_path = tmp_path / "broken.yaml"
+    file_path.write_text(yaml.dump({"openai": "sk-not-a-mapping"}))
+    with pytest.raises(ValueError, match="must map each provider"):
+        manager.load_secrets(file_path)
+    assert manager.get_secret("openai") == "sk-openai-testkey"
+    assert manager.version == version
@@ -0,0 +1,68 @@
+import pytest
+from src.llminventory.semantic_cache import SemanticCache, prompt_text
+
+def test_prompt_text_supports_payload_formats():
+    """Test that prompt text is extracted from messages, contents and prompt payloads."""
+    assert prompt_text({"messages": [
+        {"role": "system", "content": "Be brief."},
+        {"role": "user", "content": [{"type": "text", "text": "Hi"}]}
+    ]}) == "system: Be brief.\nuser: Hi"
+    assert prompt_text({"contents": [{"role": "user", "parts": [{"text": "Hi"}]}]}) == "user: Hi"
+    assert prompt_text({"prompt": "A cat"}) == "A cat"
+    assert prompt_text({"input": "not a prompt"}) == ""
+
+def test_lookup_returns_response_above_threshold():
+    """Test that near-duplicate vectors hit and dissimilar ones miss."""
+    cache = SemanticCache(threshold=0.9)
+    cache.add("ns", [1.0, 0.0, 0.0], {"answer": "stored"})
+
+    assert cache.lookup("ns", [0.99, 0.05, 0.0]) == {"answer": "stored"}
+    assert cache.lookup("ns", [0.0, 1.0, 0.0]) is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+    assert stats['avg_lookup_ms'] > 0
+
+def test_stored_responses_are_isolated_from_callers():
+    """Test that mutating an added or returned response does not change the stored copy."""
+    cache = SemanticCache(threshold=0.9)
+    response = {"answer": "stored", "usage": {"tokens": 3}}
+    cache.add("ns", [1.0, 0.0], response)
+    response["usage"]["tokens"] = 0
+
+    hit = cache.lookup("ns", [1.0, 0.0])
+    hit["answer"] = "changed"
+    assert cache.lookup("ns", [1.0, 0.0]) == {"answer": "stored", "usage": {"tokens": 3}}
+
+def test_lookup_is_scoped_to_namespace():
+    """Test that responses are not shared across namespaces."""
+    cache = SemanticCache(threshold=0.9)
+    cache.add("model-a", [1.0, 0.0], {"answer": "a"})
+    assert cache.lookup("model-b", [1.0, 0.0]) is None
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that a full index replaces its least recently used entry."""
+    cache = SemanticCache(threshold=0.99, max_entries=2)
+    cache.add("ns", [1.0, 0.0, 0.0], {"answer": "x"})
+    cache.add("ns", [0.0, 1.0, 0.0], {"answer": "y"})
+    cache.lookup("ns", [1.0, 0.0, 0.0])
+    cache.add("ns", [0.0, 0.0, 1.0], {"answer": "z"})
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.lookup("ns", [0.0, 1.0, 0.0]) is None
+    assert cache.lookup("ns", [1.0, 0.0, 0.0]) == {"answer": "x"}
+
+def test_index_persists_to_disk(tmp_path):
+    """Test that a saved index is loaded by a new cache on the same directory."""
+    cache = SemanticCache(threshold=0.9, index_dir=tmp_path / "index")
+    cache.add("ns", [0.6, 0.8], {"answer": "persisted"})
+    cache.save()
+
+    reloaded = SemanticCache(threshold=0.9, index_dir=tmp_path / "index")
+    assert len(reloaded) == 1
+    assert reloaded.lookup("ns", [0.6, 0.8]) == {"answer": "persisted"}
+
+def test_save_requires_index_dir():
+    """Test that saving without an index directory is rejected."""
+    with pytest.raises(ValueError):
+        SemanticCache().save()
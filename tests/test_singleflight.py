@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.llminventory.singleflight import SingleFlight, is_deterministic
+
+def test_concurrent_threads_share_one_call():
+    """Test that threads calling with the same key while a call is in flight get its result."""
+    flight = SingleFlight()
+    started = threading.Event()
+    finish = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        started.set()
+        finish.wait(1)
+        return {"answer": 42}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", call)))
+    leader.start()
+    started.wait(1)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", call))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)
+    finish.set()
+    for thread in [leader] + followers:
+        thread.join(1)
+
+    assert len(calls) == 1
+    assert flight.stats()['shared'] == 3
+    assert results == [{"answer": 42}] * 4
+    # Followers get copies, so mutating one result does not affect the others
+    assert len({id(result) for result in results}) == 4
+
+def test_errors_are_shared_and_flights_end_with_their_call():
+    """Test that waiters get the leader's error and that later calls start a new flight."""
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ConnectionError("HTTP 500")
+
+        results = await asyncio.gather(*[flight.ado("key", failing) for _ in range(3)], return_exceptions=True)
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert len(calls) == 1
+
+        async def ok():
+            calls.append(1)
+            return "ok"
+
+        assert await flight.ado("key", ok) == "ok"
+        assert len(calls) == 2
+        return flight.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats == {'calls': 2, 'shared': 2, 'in_flight': 0, 'shared_rate': 0.5}
+
+def test_waiter_takes_over_when_leader_is_cancelled():
+    """Test that cancelling the caller running a call lets a waiting caller run it."""
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return len(calls)
+
+        leader = asyncio.create_task(flight.ado("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("key", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower, calls
+
+    result, calls = asyncio.run(scenario())
+    assert result == 2
+    assert len(calls) == 2
+
+def test_is_deterministic():
+    """Test that only greedy or seeded sampling counts as deterministic."""
+    assert is_deterministic({"temperature": 0})
+    assert is_deterministic({"temperature": 0.7, "seed": 7})
+    assert not is_deterministic({"temperature": 1.0})
+    assert not is_deterministic(None)